@@ -0,0 +1,175 @@
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import numpy as np
+
+
+class ArrayLinkedList:
+    """
+    A linked list stored as a struct of arrays, for bulk-loaded lists.
+
+    Node ``i`` lives in slot ``i``: its value is ``values[i]`` and its links
+    are ``next[i]`` and ``prev[i]`` (-1 for none), so the slot doubles as the
+    node ID. A million nodes take three numpy arrays instead of a million
+    objects. Loading with ``shuffle`` scatters consecutive nodes over the
+    slots, which is what makes traversal slow on real hardware.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        next_slots: np.ndarray,
+        head: int,
+        cursor: Optional[Tuple[int, int]] = None,
+    ):
+        self.values = values
+        self.next = next_slots
+        self.head = head
+        self.size = len(values)
+
+        # prev and tail follow from next
+        self.prev = np.full(self.size, -1, dtype=np.int32)
+        linked = np.flatnonzero(next_slots >= 0)
+        self.prev[next_slots[linked]] = linked
+        ends = np.flatnonzero(next_slots < 0)
+        self.tail = int(ends[0]) if len(ends) else -1
+
+        # List position and slot where the last traversal stopped
+        self.cursor = cursor if cursor is not None else (0, head)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_values(
+        cls, values: Sequence[int], shuffle: bool = False, seed: Optional[int] = None
+    ) -> "ArrayLinkedList":
+        """
+        Build a list holding ``values`` in order.
+
+        Raises:
+            OverflowError: If a value does not fit in 64 bits
+        """
+        values = np.asarray(values, dtype=np.int64)
+        size = len(values)
+        if shuffle:
+            order = np.random.default_rng(seed).permutation(size).astype(np.int32)
+        else:
+            order = np.arange(size, dtype=np.int32)
+
+        # The node at list position k is stored in slot order[k]
+        slot_values = np.empty(size, dtype=np.int64)
+        slot_values[order] = values
+        next_slots = np.full(size, -1, dtype=np.int32)
+        next_slots[order[:-1]] = order[1:]
+
+        return cls(slot_values, next_slots, int(order[0]) if size else -1)
+
+    def to_bytes(self) -> bytes:
+        """The values and next arrays as raw bytes, for a session store."""
+        return self.values.tobytes() + self.next.tobytes()
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        size: int,
+        head: int,
+        cursor: Optional[Tuple[int, int]] = None,
+    ) -> "ArrayLinkedList":
+        """Rebuild a list of ``size`` nodes from the output of ``to_bytes``."""
+        split = size * np.dtype(np.int64).itemsize
+        return cls(
+            np.frombuffer(data, dtype=np.int64, count=size).copy(),
+            np.frombuffer(data, dtype=np.int32, offset=split).copy(),
+            head,
+            cursor,
+        )
+
+    def walk(self, offset: int, limit: int) -> List[int]:
+        """
+        Return the slots of up to ``limit`` nodes from list position ``offset``.
+
+        Reaching the offset means following links one node at a time, so the
+        walk starts from whichever is closest of the head, the tail and the
+        position where the previous walk ended; paging forward is O(limit).
+        """
+        if offset >= self.size or limit <= 0:
+            return []
+
+        position, slot = 0, self.head
+        if self.size - 1 - offset < offset:
+            position, slot = self.size - 1, self.tail
+        if abs(self.cursor[0] - offset) < abs(position - offset):
+            position, slot = self.cursor
+
+        next_slots, prev_slots = self.next, self.prev
+        while position < offset:
+            slot = int(next_slots[slot])
+            position += 1
+        while position > offset:
+            slot = int(prev_slots[slot])
+            position -= 1
+
+        slots = []
+        while slot >= 0 and len(slots) < limit:
+            slots.append(slot)
+            slot = int(next_slots[slot])
+
+        end = offset + len(slots)
+        self.cursor = (end, slot) if slot >= 0 else (offset, slots[0])
+        return slots
+
+
+class BulkLists:
+    """
+    The bulk-loaded lists of one manager, by name, loaded on first use.
+
+    Behaves like a dict of ``ArrayLinkedList``. A session store that keeps
+    each list apart from the rest of the session passes the sizes of the
+    stored lists and a ``loader``; a list's arrays are then only read when
+    an operation asks for that list, and sizes are known without loading.
+    ``written`` and ``deleted`` tell the store what to save afterwards;
+    lists that were only read may have moved their ``cursor``.
+    """
+
+    def __init__(
+        self,
+        sizes: Optional[Dict[str, int]] = None,
+        loader: Optional[Callable[[str], ArrayLinkedList]] = None,
+    ):
+        self._sizes: Dict[str, int] = dict(sizes or {})
+        self._loader = loader
+        self.loaded: Dict[str, ArrayLinkedList] = {}
+        self.written: Set[str] = set()
+        self.deleted: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sizes)
+
+    def __contains__(self, list_id: object) -> bool:
+        return list_id in self._sizes
+
+    def __getitem__(self, list_id: str) -> ArrayLinkedList:
+        if list_id not in self._sizes:
+            raise KeyError(list_id)
+        if list_id not in self.loaded:
+            self.loaded[list_id] = self._loader(list_id)
+        return self.loaded[list_id]
+
+    def __setitem__(self, list_id: str, nodes: ArrayLinkedList) -> None:
+        self._sizes[list_id] = len(nodes)
+        self.loaded[list_id] = nodes
+        self.written.add(list_id)
+        self.deleted.discard(list_id)
+
+    def __delitem__(self, list_id: str) -> None:
+        del self._sizes[list_id]
+        self.loaded.pop(list_id, None)
+        self.written.discard(list_id)
+        self.deleted.add(list_id)
+
+    def sizes(self) -> Dict[str, int]:
+        """Number of nodes by list name, without loading any list."""
+        return dict(self._sizes)
@@ -1,305 +1,600 @@
 import uuid
-from typing import Literal, List
-from app.models.linkedlist import LinkedListNode, LinkedListVisualizationData
+from collections import OrderedDict
+from typing import Dict, Literal, List, Optional, Sequence, Set, Union
+from app.algorithms.linkedlist_manager.arrays import ArrayLinkedList, BulkLists
+from app.algorithms.linkedlist_manager.nodes import Node, NodeList
+from app.models.linkedlist import (
+    LinkedListBatchResponse,
+    LinkedListDelta,
+    LinkedListInfo,
+    LinkedListOperation,
+    LinkedListNode,
+    LinkedListPage,
+    LinkedListVisualizationData,
+)
+
+LinkedListResult = Union[LinkedListVisualizationData, LinkedListDelta]
+
+# Upper bound on the named lists of one manager
+MAX_LISTS = 256
+# Upper bound on the nodes of all bulk-loaded lists of one manager
+MAX_BULK_NODES = 4_000_000
+
+# Approximate memory per node, see LinkedListManager.footprint: a Node with
+# its ID and index entries, and a bulk node's value, next and prev slots
+NODE_BYTES = 240
+BULK_NODE_BYTES = 16
 
 
 class LinkedListManager:
-    """Manager for linked list operations."""
+    """
+    Manager for linked list operations.
+
+    Lists are real linked structures of ``Node`` objects, kept by name. An
+    ID index covers the nodes of all lists, and a value index per list keeps
+    the nodes of each value in list order, so appending and removing a node
+    by ID or by value (its first occurrence) are O(1). Splicing two lists
+    only merges their value indexes, and reversing works in place. Pydantic
+    models are only built for responses.
+
+    Large lists can be bulk-loaded into ``ArrayLinkedList`` storage instead;
+    they share the list names but are read a page at a time and are not
+    part of the visualization data. They are kept in ``bulk_lists``, which
+    session stores may fill lazily, see ``BulkLists``.
+
+    Operations on unknown lists raise ``KeyError``, invalid requests such
+    as creating an existing list raise ``ValueError``; both are raised
+    before anything is changed.
+
+    Every operation bumps ``version``. Operations take an optional
+    ``base_version``: when it matches the version before the operation, only
+    the nodes it touched are returned as a ``LinkedListDelta``.
+    """
 
     def __init__(self):
         """Initialize the linked list manager."""
-        self.list1 = []
-        self.list2 = []
+        self.lists: Dict[str, NodeList] = {"list1": NodeList(), "list2": NodeList()}
+        self.nodes: Dict[str, Node] = {}  # Node ID -> node, across all lists
+        # List ID -> value -> nodes with that value by ID, in list order
+        self.values: Dict[str, Dict[int, "OrderedDict[str, Node]"]] = {}
+        self.bulk_lists = BulkLists()
         self.list_type = "singly"
+        self.version = 0
+
+        # Changes made by the current operation, see _begin and _result
+        self._base_version = 0
+        self._resync = False
+        self._heads: Dict[str, Optional[Node]] = {}
+        self._touched: Set[Node] = set()
+        self._removed: List[str] = []
+
+    def footprint(self) -> int:
+        """Approximate bytes held by the lists, for session store budgets."""
+        bulk_nodes = sum(self.bulk_lists.sizes().values())
+        return len(self.nodes) * NODE_BYTES + bulk_nodes * BULK_NODE_BYTES
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the lists (node order, IDs and values) for a session store.
+
+        Bulk-loaded lists are left out: they can be millions of nodes, so
+        stores save them on their own and only when they change, see
+        ``BulkLists``. ``_load`` keeps them as they are.
+        """
+        return {
+            "listType": self.list_type,
+            "version": self.version,
+            "lists": {
+                list_id: [[node.id, node.value] for node in nodes]
+                for list_id, nodes in self.lists.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LinkedListManager":
+        """Rebuild a manager from the output of ``to_dict``."""
+        manager = cls()
+        manager._load(data)
+        return manager
+
+    def _load(self, data: dict) -> None:
+        """Replace all lists with the output of ``to_dict``."""
+        self.list_type = data["listType"]
+        self.version = data.get("version", 0)
+        self.lists = {}
+        self.nodes = {}
+        self.values = {}
+        for list_id, nodes in data["lists"].items():
+            target_list = self.lists[list_id] = NodeList()
+            for id, value in nodes:
+                target_list.append(self._index(Node(id, value), list_id))
+
+    def _serialize_node(self, node: Node) -> LinkedListNode:
+        """Build the response model for one node."""
+        return LinkedListNode(
+            id=node.id,
+            value=node.value,
+            next=node.next.id if node.next is not None else None,
+            prev=(
+                node.prev.id
+                if self.list_type == "doubly" and node.prev is not None
+                else None
+            ),
+        )
 
     def _get_visualization_data(self) -> LinkedListVisualizationData:
         """Get the current visualization data."""
         return LinkedListVisualizationData(
-            listType=self.list_type, lists={"list1": self.list1, "list2": self.list2}
+            listType=self.list_type,
+            lists={
+                list_id: [self._serialize_node(node) for node in nodes]
+                for list_id, nodes in self.lists.items()
+            },
+            version=self.version,
+        )
+
+    def _begin(self, list_type: Literal["singly", "doubly"]) -> None:
+        """Start tracking the changes of an operation."""
+        # Switching list type changes every prev pointer that is shown
+        self._resync = list_type != self.list_type
+        self.list_type = list_type
+        self._base_version = self.version
+        self._heads = {list_id: nodes.head for list_id, nodes in self.lists.items()}
+        self._touched = set()
+        self._removed = []
+
+    def _touch(self, *nodes: Optional[Node]) -> None:
+        """Record nodes whose pointers an operation changes."""
+        self._touched.update(node for node in nodes if node is not None)
+
+    def _result(self, base_version: Optional[int]) -> LinkedListResult:
+        """
+        Finish an operation and build its response.
+
+        Returns a delta when ``base_version`` is the version the operation
+        started from, and the full lists otherwise.
+        """
+        self.version += 1
+        if base_version != self._base_version or self._resync:
+            return self._get_visualization_data()
+
+        heads = {}
+        for list_id, nodes in self.lists.items():
+            # New lists are reported too, even when still empty
+            if list_id not in self._heads or self._heads[list_id] is not nodes.head:
+                heads[list_id] = nodes.head.id if nodes.head is not None else None
+
+        return LinkedListDelta(
+            listType=self.list_type,
+            version=self.version,
+            baseVersion=base_version,
+            heads=heads,
+            nodes=[
+                self._serialize_node(node)
+                for node in self._touched
+                if node.id in self.nodes
+            ],
+            removed=self._removed,
         )
 
     def _generate_id(self) -> str:
         """Generate a unique ID for a node."""
         return f"node-{uuid.uuid4().hex[:8]}"
 
-    def _create_node(self, value: int) -> LinkedListNode:
-        """Create a new node with the given value."""
-        if self.list_type == "singly":
-            return LinkedListNode(id=self._generate_id(), value=value, next=None)
+    def _index(self, node: Node, list_id: str) -> Node:
+        """Add a node appended to ``list_id`` to the ID and value indexes."""
+        self.nodes[node.id] = node
+        values = self.values.setdefault(list_id, {})
+        values.setdefault(node.value, OrderedDict())[node.id] = node
+        return node
+
+    def _unindex(self, node: Node, list_id: str) -> None:
+        """Drop a node of ``list_id`` from the ID and value indexes."""
+        del self.nodes[node.id]
+        values = self.values[list_id]
+        same_value = values[node.value]
+        del same_value[node.id]
+        if not same_value:
+            del values[node.value]
+
+    def _reindex_values(self, list_id: str) -> None:
+        """Rebuild the value index of a list whose nodes were reordered."""
+        values: Dict[int, "OrderedDict[str, Node]"] = {}
+        for node in self.lists[list_id]:
+            values.setdefault(node.value, OrderedDict())[node.id] = node
+        self.values[list_id] = values
+
+    @staticmethod
+    def _join_runs(
+        front: "OrderedDict[str, Node]", back: "OrderedDict[str, Node]"
+    ) -> "OrderedDict[str, Node]":
+        """Join two runs of same-value nodes, moving the shorter into the longer."""
+        if len(front) >= len(back):
+            front.update(back)
+            return front
+        # Prepend the front run to keep list order
+        for id, node in reversed(front.items()):
+            back[id] = node
+            back.move_to_end(id, last=False)
+        return back
+
+    def _splice_values(self, target_id: str, source_id: str) -> None:
+        """
+        Move the value index of ``source_id`` behind that of ``target_id``.
+
+        The index with fewer distinct values is merged into the other one,
+        and for every value the shorter run of nodes is moved into the longer
+        one, so splicing never costs more than the smaller list.
+        """
+        target = self.values.pop(target_id, {})
+        source = self.values.pop(source_id, {})
+        if len(target) >= len(source):
+            for value, nodes in source.items():
+                front = target.get(value)
+                target[value] = (
+                    nodes if front is None else self._join_runs(front, nodes)
+                )
+            self.values[target_id] = target
         else:
-            return LinkedListNode(
-                id=self._generate_id(), value=value, next=None, prev=None
-            )
-
-    def _create_linked_list(self, nodes: List[LinkedListNode]) -> List[LinkedListNode]:
-        """Create a properly linked list from a list of nodes."""
-        if not nodes:
-            return []
+            for value, nodes in target.items():
+                back = source.get(value)
+                source[value] = nodes if back is None else self._join_runs(nodes, back)
+            self.values[target_id] = source
+
+    def _create_node(self, value: int, list_id: str) -> Node:
+        """Create a new node, to be appended to ``list_id``, and index it."""
+        return self._index(Node(self._generate_id(), value), list_id)
+
+    def _remove(self, node: Node, list_id: str) -> None:
+        """Unlink a node from its list and drop it from the indexes."""
+        self._touch(node.prev, node.next)
+        self.lists[list_id].remove(node)
+        self._unindex(node, list_id)
+        self._removed.append(node.id)
+
+    def _get_list(self, list_id: str) -> NodeList:
+        """Look up a list by name."""
+        try:
+            return self.lists[list_id]
+        except KeyError:
+            raise KeyError(f"List not found: {list_id}") from None
+
+    def get_lists(self) -> List[LinkedListInfo]:
+        """Enumerate the lists with their sizes."""
+        return [
+            LinkedListInfo(id=list_id, size=len(nodes))
+            for list_id, nodes in self.lists.items()
+        ] + [
+            LinkedListInfo(id=list_id, size=size, bulk=True)
+            for list_id, size in self.bulk_lists.sizes().items()
+        ]
+
+    def create_list(
+        self,
+        list_type: Literal["singly", "doubly"],
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Create a new, empty list."""
+        if list_id in self.lists or list_id in self.bulk_lists:
+            raise ValueError(f"List already exists: {list_id}")
+        if len(self.lists) + len(self.bulk_lists) >= MAX_LISTS:
+            raise ValueError(f"Cannot have more than {MAX_LISTS} lists")
+
+        self._begin(list_type)
+        self.lists[list_id] = NodeList()
+        self.values[list_id] = {}
+        return self._result(base_version)
+
+    def delete_list(
+        self,
+        list_type: Literal["singly", "doubly"],
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Delete a list and all of its nodes."""
+        if list_id in self.bulk_lists:
+            target_list = None
+        else:
+            target_list = self._get_list(list_id)
 
-        linked_list = []
-        for i, node in enumerate(nodes):
-            # Reset next pointer
-            node.next = None if i == len(nodes) - 1 else nodes[i + 1].id
+        self._begin(list_type)
+        # Deleted lists are not expressible as a delta
+        self._resync = True
+        if target_list is None:
+            del self.bulk_lists[list_id]
+        else:
+            for node in target_list:
+                del self.nodes[node.id]
+            del self.lists[list_id]
+            self.values.pop(list_id, None)
+        return self._result(base_version)
 
-            # Reset prev pointer for doubly linked list
-            if self.list_type == "doubly":
-                node.prev = None if i == 0 else nodes[i - 1].id
+    def bulk_load(
+        self,
+        list_id: str,
+        values: Sequence[int],
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+    ) -> LinkedListInfo:
+        """
+        Build (or replace) an array-backed list holding ``values`` in order.
+
+        Node IDs are the slots of the nodes in the arrays, so nothing is
+        created per node.
+        """
+        if list_id in self.lists:
+            raise ValueError(f"List already exists: {list_id}")
+        if (
+            list_id not in self.bulk_lists
+            and len(self.lists) + len(self.bulk_lists) >= MAX_LISTS
+        ):
+            raise ValueError(f"Cannot have more than {MAX_LISTS} lists")
+
+        other_nodes = sum(
+            size for name, size in self.bulk_lists.sizes().items() if name != list_id
+        )
+        if other_nodes + len(values) > MAX_BULK_NODES:
+            raise ValueError(
+                f"Bulk-loaded lists cannot hold more than {MAX_BULK_NODES} nodes"
+            )
 
-            linked_list.append(node)
+        try:
+            nodes = ArrayLinkedList.from_values(values, shuffle, seed)
+        except OverflowError:
+            raise ValueError("Values must fit in 64 bits") from None
+
+        self.bulk_lists[list_id] = nodes
+        return LinkedListInfo(id=list_id, size=len(nodes), bulk=True)
+
+    def get_page(self, list_id: str, offset: int, limit: int) -> LinkedListPage:
+        """Return up to ``limit`` nodes of a bulk-loaded list from ``offset``."""
+        try:
+            nodes = self.bulk_lists[list_id]
+        except KeyError:
+            raise KeyError(f"Bulk list not found: {list_id}") from None
+
+        doubly = self.list_type == "doubly"
+        page = []
+        for slot in nodes.walk(offset, limit):
+            next_slot, prev_slot = int(nodes.next[slot]), int(nodes.prev[slot])
+            page.append(
+                LinkedListNode(
+                    id=str(slot),
+                    value=int(nodes.values[slot]),
+                    next=str(next_slot) if next_slot >= 0 else None,
+                    prev=str(prev_slot) if doubly and prev_slot >= 0 else None,
+                )
+            )
 
-        return linked_list
+        return LinkedListPage(
+            listType=self.list_type,
+            listId=list_id,
+            offset=offset,
+            size=len(nodes),
+            nodes=page,
+        )
 
     def reset(
-        self, list_type: Literal["singly", "doubly"]
-    ) -> LinkedListVisualizationData:
+        self,
+        list_type: Literal["singly", "doubly"],
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
         """Reset the linked lists with default values."""
-        self.list_type = list_type
+        self._begin(list_type)
+        self._resync = True
+        self.lists = {"list1": NodeList(), "list2": NodeList()}
+        self.nodes = {}
+        self.values = {}
 
         # Create default list 1
-        default_values = [1, 2, 3, 4, 5]
-        nodes = [self._create_node(value) for value in default_values]
-        self.list1 = self._create_linked_list(nodes)
+        for value in [1, 2, 3, 4, 5]:
+            self.lists["list1"].append(self._create_node(value, "list1"))
 
         # Create default list 2
-        default_values_2 = [6, 7, 8, 9, 10]
-        nodes = [self._create_node(value) for value in default_values_2]
-        self.list2 = self._create_linked_list(nodes)
+        for value in [6, 7, 8, 9, 10]:
+            self.lists["list2"].append(self._create_node(value, "list2"))
 
-        return self._get_visualization_data()
+        return self._result(base_version)
 
     def add_node(
         self,
         list_type: Literal["singly", "doubly"],
         value: int,
-        list_id: Literal["list1", "list2"],
-    ) -> LinkedListVisualizationData:
-        """Add a node to the specified list."""
-        self.list_type = list_type
-        target_list = self.list1 if list_id == "list1" else self.list2
-
-        node = self._create_node(value)
-
-        if target_list:
-            # Set next pointer of previous node
-            target_list[-1].next = node.id
-
-            # Set prev pointer for doubly linked list
-            if list_type == "doubly":
-                node.prev = target_list[-1].id
-
-        if list_id == "list1":
-            self.list1.append(node)
-        else:
-            self.list2.append(node)
-
-        return self._get_visualization_data()
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Add a node to the end of the specified list."""
+        target_list = self._get_list(list_id)
+        self._begin(list_type)
+        node = self._create_node(value, list_id)
+        self._touch(target_list.tail, node)
+        target_list.append(node)
+        return self._result(base_version)
 
     def remove_last_node(
-        self, list_type: Literal["singly", "doubly"], list_id: Literal["list1", "list2"]
-    ) -> LinkedListVisualizationData:
+        self,
+        list_type: Literal["singly", "doubly"],
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
         """Remove the last node from the specified list."""
-        self.list_type = list_type
-        target_list = self.list1 if list_id == "list1" else self.list2
-
-        if not target_list:
-            # List is already empty
-            return self._get_visualization_data()
-
-        if len(target_list) <= 1:
-            if list_id == "list1":
-                self.list1 = []
-            else:
-                self.list2 = []
-        else:
-            # Update the next pointer of the second-to-last node
-            target_list[-2].next = None
-            if list_id == "list1":
-                self.list1 = target_list[:-1]
-            else:
-                self.list2 = target_list[:-1]
+        target_list = self._get_list(list_id)
+        self._begin(list_type)
 
-        return self._get_visualization_data()
+        if target_list.tail is not None:
+            self._remove(target_list.tail, list_id)
 
-    def reverse_list(
-        self, list_type: Literal["singly", "doubly"], list_id: Literal["list1", "list2"]
-    ) -> LinkedListVisualizationData:
-        """Reverse the specified list."""
-        self.list_type = list_type
-        target_list = self.list1 if list_id == "list1" else self.list2
+        return self._result(base_version)
 
-        if len(target_list) <= 1:
-            return self._get_visualization_data()
-
-        # Reverse the list (we'll rebuild the links)
-        reversed_nodes = [node for node in target_list]
-        reversed_nodes.reverse()
+    def remove_node_by_id(
+        self,
+        list_type: Literal["singly", "doubly"],
+        node_id: str,
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Remove the node with the given ID from the specified list."""
+        target_list = self._get_list(list_id)
+        self._begin(list_type)
+        node = self.nodes.get(node_id)
 
-        # Create properly linked reversed list
-        reversed_list = self._create_linked_list(reversed_nodes)
+        # Ignore unknown IDs and nodes that belong to another list
+        if node is not None and NodeList.owner_of(node) is target_list:
+            self._remove(node, list_id)
 
-        if list_id == "list1":
-            self.list1 = reversed_list
-        else:
-            self.list2 = reversed_list
+        return self._result(base_version)
 
-        return self._get_visualization_data()
+    def reverse_list(
+        self,
+        list_type: Literal["singly", "doubly"],
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Reverse the specified list in place."""
+        target_list = self._get_list(list_id)
+        self._begin(list_type)
+        self._touch(*target_list)
+        target_list.reverse()
+        self._reindex_values(list_id)
+        return self._result(base_version)
 
     def sort_list(
-        self, list_type: Literal["singly", "doubly"], list_id: Literal["list1", "list2"]
-    ) -> LinkedListVisualizationData:
+        self,
+        list_type: Literal["singly", "doubly"],
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
         """Sort a single list by node values."""
-        self.list_type = list_type
-        target_list = self.list1 if list_id == "list1" else self.list2
+        target_list = self._get_list(list_id)
+        self._begin(list_type)
 
         if len(target_list) <= 1:
-            return self._get_visualization_data()
-
-        # Create copies of all nodes to sort
-        nodes_to_sort = []
-
-        # Copy nodes from the target list
-        for node in target_list:
-            new_node = LinkedListNode(
-                id=node.id,
-                value=node.value,
-                next=None,
-                prev=None if self.list_type != "doubly" else None,
-            )
-            nodes_to_sort.append(new_node)
-
-        # Sort nodes by value
-        nodes_to_sort.sort(key=lambda x: x.value)
+            return self._result(base_version)
 
-        # Create properly linked list from sorted nodes
-        sorted_list = self._create_linked_list(nodes_to_sort)
+        # Merge sort rewires the existing nodes, nothing is copied
+        self._touch(*target_list)
+        target_list.sort()
+        self._reindex_values(list_id)
 
-        # Update the appropriate list
-        if list_id == "list1":
-            self.list1 = sorted_list
-        else:
-            self.list2 = sorted_list
-
-        return self._get_visualization_data()
+        return self._result(base_version)
 
     def connect_lists(
-        self, list_type: Literal["singly", "doubly"], sorted: bool
-    ) -> LinkedListVisualizationData:
-        """Connect or merge two lists."""
-        self.list_type = list_type
+        self,
+        list_type: Literal["singly", "doubly"],
+        sorted: bool,
+        base_version: Optional[int] = None,
+        target_id: str = "list1",
+        source_id: str = "list2",
+    ) -> LinkedListResult:
+        """Connect or merge the source list into the target list."""
+        if source_id == target_id:
+            raise ValueError("Cannot connect a list to itself")
+        target, source = self._get_list(target_id), self._get_list(source_id)
+        self._begin(list_type)
 
         # Check if either list is empty
-        if not self.list1 or not self.list2:
-            return self._get_visualization_data()
+        if not target or not source:
+            return self._result(base_version)
 
         if sorted:
-            # Create copies of all nodes
-            all_nodes = []
-
-            # Copy nodes from both lists
-            for node in self.list1:
-                new_node = LinkedListNode(
-                    id=node.id,
-                    value=node.value,
-                    next=None,
-                    prev=None if self.list_type != "doubly" else None,
-                )
-                all_nodes.append(new_node)
-
-            for node in self.list2:
-                new_node = LinkedListNode(
-                    id=node.id,
-                    value=node.value,
-                    next=None,
-                    prev=None if self.list_type != "doubly" else None,
-                )
-                all_nodes.append(new_node)
-
-            # Sort all nodes by value
-            all_nodes.sort(key=lambda x: x.value)
-
-            # Create properly linked list from sorted nodes
-            self.list1 = self._create_linked_list(all_nodes)
-            self.list2 = []
+            # Sort both (a no-op for sorted lists), then merge them linearly
+            self._touch(*target, *source)
+            target.sort()
+            source.sort()
+            target.merge(source)
+            self._reindex_values(target_id)
         else:
-            # Simple concatenation
-            if self.list1 and self.list2:
-                # Connect list1 to list2
-                self.list1[-1].next = self.list2[0].id
+            # Move the source onto the end of the target
+            self._touch(target.tail, source.head)
+            target.splice(source)
+            self._splice_values(target_id, source_id)
 
-                # Update prev pointer in doubly linked list
-                if list_type == "doubly":
-                    self.list2[0].prev = self.list1[-1].id
+        # The source starts over empty
+        self.lists[source_id] = NodeList()
+        self.values[source_id] = {}
 
-                self.list1.extend(self.list2)
-                self.list2 = []
-
-        return self._get_visualization_data()
+        return self._result(base_version)
 
     def remove_node_by_value(
         self,
         list_type: Literal["singly", "doubly"],
         value: int,
-        list_id: Literal["list1", "list2"],
-    ) -> LinkedListVisualizationData:
-        """Remove a node with the specified value from the list."""
-        self.list_type = list_type
-        target_list = self.list1 if list_id == "list1" else self.list2
+        list_id: str,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Remove the first node with the specified value from the list."""
+        self._get_list(list_id)
+        self._begin(list_type)
 
-        if not target_list:
-            # List is already empty
-            return self._get_visualization_data()
+        # Nodes of a value are indexed in list order, the first is the match
+        same_value = self.values.get(list_id, {}).get(value)
+        if same_value:
+            self._remove(next(iter(same_value.values())), list_id)
 
-        # Find the index of the node with the given value
-        node_index = None
-        for i, node in enumerate(target_list):
-            if node.value == value:
-                node_index = i
-                break
-
-        if node_index is None:
-            # Value not found in the list
-            return self._get_visualization_data()
+        return self._result(base_version)
 
-        # Handle removal based on position in the list
-        if node_index == 0:
-            # Removing the first node
-            if len(target_list) > 1:
-                # If there are more nodes, update the second node's prev pointer (for doubly linked list)
-                if self.list_type == "doubly" and len(target_list) > 1:
-                    target_list[1].prev = None
-
-                # Remove the first node
-                if list_id == "list1":
-                    self.list1 = target_list[1:]
-                else:
-                    self.list2 = target_list[1:]
-            else:
-                # If it's the only node, just empty the list
-                if list_id == "list1":
-                    self.list1 = []
-                else:
-                    self.list2 = []
-        elif node_index == len(target_list) - 1:
-            # Removing the last node (similar to remove_last_node)
-            target_list[node_index - 1].next = None
-            if list_id == "list1":
-                self.list1 = target_list[:-1]
-            else:
-                self.list2 = target_list[:-1]
+    def apply_operation(
+        self,
+        list_type: Literal["singly", "doubly"],
+        operation: LinkedListOperation,
+        base_version: Optional[int] = None,
+    ) -> LinkedListResult:
+        """Perform one batch operation with the method of the same endpoint."""
+        if operation.op == "add-node":
+            return self.add_node(
+                list_type, operation.value, operation.listId, base_version
+            )
+        elif operation.op == "remove-node":
+            return self.remove_last_node(list_type, operation.listId, base_version)
+        elif operation.op == "remove-node-by-value":
+            return self.remove_node_by_value(
+                list_type, operation.value, operation.listId, base_version
+            )
+        elif operation.op == "remove-node-by-id":
+            return self.remove_node_by_id(
+                list_type, operation.nodeId, operation.listId, base_version
+            )
+        elif operation.op == "reverse":
+            return self.reverse_list(list_type, operation.listId, base_version)
+        elif operation.op == "sort":
+            return self.sort_list(list_type, operation.listId, base_version)
+        elif operation.op == "connect":
+            return self.connect_lists(
+                list_type,
+                operation.sorted,
+                base_version,
+                operation.targetId,
+                operation.sourceId,
+            )
         else:
-            # Removing a node in the middle
-            # Update next pointer of previous node
-            target_list[node_index - 1].next = target_list[node_index + 1].id
-
-            # Update prev pointer of next node (for doubly linked list)
-            if self.list_type == "doubly":
-                target_list[node_index + 1].prev = target_list[node_index - 1].id
-
-            # Remove the node
-            new_list = target_list[:node_index] + target_list[node_index + 1 :]
-            if list_id == "list1":
-                self.list1 = new_list
-            else:
-                self.list2 = new_list
-
-        return self._get_visualization_data()
+            raise ValueError(f"Unknown linked list operation: {operation.op}")
+
+    def apply_batch(
+        self,
+        list_type: Literal["singly", "doubly"],
+        operations: List[LinkedListOperation],
+        diffs: bool = False,
+    ) -> LinkedListBatchResponse:
+        """
+        Apply operations in order, atomically.
+
+        If any operation fails the lists are restored to their state before
+        the batch and the error is raised.
+        """
+        # Batches never touch bulk-loaded lists
+        snapshot = self.to_dict()
+        steps = []
+        try:
+            for operation in operations:
+                # Diffing against the current version keeps every step cheap
+                step = self.apply_operation(list_type, operation, self.version)
+                if diffs:
+                    steps.append(step)
+        except Exception:
+            self._load(snapshot)
+            raise
+
+        return LinkedListBatchResponse(
+            state=self._get_visualization_data(), steps=steps if diffs else None
+        )
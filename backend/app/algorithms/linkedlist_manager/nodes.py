@@ -0,0 +1,234 @@
+from typing import Iterator, Optional, Tuple
+
+
+class Node:
+    """A linked-list node with direct pointers to its neighbours."""
+
+    __slots__ = ("id", "value", "next", "prev", "owner")
+
+    def __init__(self, id: str, value: int):
+        self.id = id
+        self.value = value
+        self.next: Optional["Node"] = None
+        self.prev: Optional["Node"] = None
+        self.owner: Optional["NodeList"] = None
+
+
+class NodeList:
+    """
+    A doubly linked list of ``Node`` objects.
+
+    Nodes always keep both pointers, even for singly linked lists, so any
+    node can be unlinked in O(1); the list type only affects what is shown.
+
+    Every node records the list that owns it. When a list is spliced onto
+    another, the emptied list forwards to the receiving one instead of
+    re-tagging every moved node, which keeps splicing O(1); ``owner_of``
+    follows (and shortens) the forwarding chain.
+    """
+
+    __slots__ = ("head", "tail", "size", "merged_into")
+
+    def __init__(self):
+        self.head: Optional[Node] = None
+        self.tail: Optional[Node] = None
+        self.size = 0
+        self.merged_into: Optional["NodeList"] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Node]:
+        node = self.head
+        while node is not None:
+            yield node
+            node = node.next
+
+    @staticmethod
+    def owner_of(node: Node) -> Optional["NodeList"]:
+        """Return the list that currently contains ``node``."""
+        owner = node.owner
+        if owner is None:
+            return None
+        while owner.merged_into is not None:
+            owner = owner.merged_into
+        node.owner = owner
+        return owner
+
+    def append(self, node: Node) -> None:
+        """Add a node at the end in O(1)."""
+        node.owner = self
+        node.next = None
+        node.prev = self.tail
+        if self.tail is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+        self.size += 1
+
+    def remove(self, node: Node) -> None:
+        """Unlink a node of this list in O(1)."""
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+
+        node.next = node.prev = node.owner = None
+        self.size -= 1
+
+    def splice(self, other: "NodeList") -> None:
+        """
+        Move all nodes of ``other`` to the end of this list in O(1).
+
+        ``other`` is retired: it forwards to this list from now on and must
+        be replaced by a new ``NodeList`` rather than reused.
+        """
+        if other is self or other.head is None:
+            return
+
+        if self.tail is None:
+            self.head = other.head
+        else:
+            self.tail.next = other.head
+            other.head.prev = self.tail
+        self.tail = other.tail
+        self.size += other.size
+
+        # Nodes of ``other`` keep pointing at it; it forwards to this list
+        other.merged_into = self
+        other.head = other.tail = None
+        other.size = 0
+
+    def reverse(self) -> None:
+        """Reverse the list in place by swapping every node's pointers."""
+        node = self.head
+        while node is not None:
+            node.next, node.prev = node.prev, node.next
+            node = node.prev
+        self.head, self.tail = self.tail, self.head
+
+    def is_sorted(self) -> bool:
+        """Whether node values never decrease along the list."""
+        node = self.head
+        while node is not None and node.next is not None:
+            if node.next.value < node.value:
+                return False
+            node = node.next
+        return True
+
+    def sort(self) -> None:
+        """
+        Sort the nodes by value with a stable bottom-up merge sort.
+
+        Only the ``next`` pointers are rewired while merging runs of doubling
+        width; ``prev`` pointers and the tail are fixed in one final pass.
+        Sorted lists are detected first and left alone.
+        """
+        if self.size < 2 or self.is_sorted():
+            return
+
+        head = self.head
+        width = 1
+        while width < self.size:
+            current, head, tail = head, None, None
+            while current is not None:
+                left = current
+                right = _split(left, width)
+                current = _split(right, width)
+                merged_head, merged_tail = _merge(left, right)
+                if tail is None:
+                    head = merged_head
+                else:
+                    tail.next = merged_head
+                tail = merged_tail
+            width *= 2
+
+        previous = None
+        node = head
+        while node is not None:
+            node.prev = previous
+            previous, node = node, node.next
+        self.head, self.tail = head, previous
+
+    def merge(self, other: "NodeList") -> None:
+        """
+        Merge the sorted ``other`` into this sorted list in O(n + m).
+
+        The merge is stable, nodes of this list come first among equal
+        values. Like ``splice``, ``other`` is retired afterwards.
+        """
+        if other is self or other.head is None:
+            return
+
+        a, b = self.head, other.head
+        head = tail = None
+        while a is not None and b is not None:
+            if b.value < a.value:
+                node, b = b, b.next
+            else:
+                node, a = a, a.next
+            node.prev = tail
+            if tail is None:
+                head = node
+            else:
+                tail.next = node
+            tail = node
+
+        # Whatever is left of either list is already linked in order
+        rest, last = (a, self.tail) if a is not None else (b, other.tail)
+        if rest is not None:
+            rest.prev = tail
+            if tail is None:
+                head = rest
+            else:
+                tail.next = rest
+            tail = last
+
+        self.head, self.tail = head, tail
+        self.size += other.size
+
+        other.merged_into = self
+        other.head = other.tail = None
+        other.size = 0
+
+
+def _split(node: Optional[Node], count: int) -> Optional[Node]:
+    """Cut the chain after ``count`` nodes and return the rest."""
+    for _ in range(count - 1):
+        if node is None:
+            return None
+        node = node.next
+    if node is None:
+        return None
+    rest, node.next = node.next, None
+    return rest
+
+
+def _merge(a: Node, b: Optional[Node]) -> Tuple[Node, Node]:
+    """Stably merge two sorted chains by next pointers; return head and tail."""
+    head = tail = None
+    while a is not None and b is not None:
+        if b.value < a.value:
+            node, b = b, b.next
+        else:
+            node, a = a, a.next
+        if tail is None:
+            head = node
+        else:
+            tail.next = node
+        tail = node
+
+    rest = a if a is not None else b
+    if tail is None:
+        head = tail = rest
+    else:
+        tail.next = rest
+    # The leftover run is never longer than the merge width
+    while tail.next is not None:
+        tail = tail.next
+    return head, tail
@@ -0,0 +1,257 @@
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import ContextManager, Iterator, Optional
+
+from app.algorithms.linkedlist_manager.arrays import ArrayLinkedList, BulkLists
+from app.algorithms.linkedlist_manager.linkedlist import LinkedListManager
+
+
+class ListStore(ABC):
+    """Holds one ``LinkedListManager`` per client session."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def session(self, session_id: str) -> ContextManager[LinkedListManager]:
+        """
+        Yield the manager for ``session_id`` and persist it afterwards.
+
+        A new manager is created for unknown or expired sessions, and
+        concurrent sessions with the same ID are serialized.
+        """
+
+
+class MemoryListStore(ListStore):
+    """
+    In-process store, sharded to keep lock contention low.
+
+    Each shard has its own lock and evicts sessions that have not been used
+    for ``ttl_seconds`` whenever it is accessed. Session IDs are chosen by
+    clients and a session may bulk-load millions of nodes, so each shard
+    also keeps at most its share of ``max_sessions`` and of ``max_bytes``
+    (by ``LinkedListManager.footprint``), dropping the least recently used.
+    State is not shared between worker processes.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        ttl_seconds: float = 3600,
+        max_sessions: int = 10000,
+        max_bytes: int = 2 * 1024**3,
+    ):
+        super().__init__(ttl_seconds)
+        # Per shard: lock, sessions by ID as (manager, last used, footprint)
+        # in last-used order, and the total of their footprints
+        self._shards = [[Lock(), OrderedDict(), 0] for _ in range(shards)]
+        self._max_per_shard = max(1, -(-max_sessions // shards))
+        self._max_bytes_per_shard = max_bytes // shards
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[LinkedListManager]:
+        shard = self._shards[zlib.crc32(session_id.encode()) % len(self._shards)]
+        lock, sessions = shard[0], shard[1]
+
+        with lock:
+            now = time.monotonic()
+
+            # Sessions are kept in last-used order, so expired ones come first
+            while sessions:
+                oldest_id, (_, last_used, footprint) = next(iter(sessions.items()))
+                if now - last_used < self.ttl_seconds:
+                    break
+                del sessions[oldest_id]
+                shard[2] -= footprint
+
+            manager, _, footprint = sessions.pop(session_id, (None, None, 0))
+            if manager is None:
+                manager = LinkedListManager()
+            shard[2] -= footprint
+
+            # Managers are kept live, so changes need no explicit save
+            try:
+                yield manager
+            finally:
+                footprint = manager.footprint()
+                sessions[session_id] = (manager, now, footprint)
+                shard[2] += footprint
+                # Evict others first; a single session is bounded by the manager
+                while len(sessions) > 1 and (
+                    len(sessions) > self._max_per_shard
+                    or shard[2] > self._max_bytes_per_shard
+                ):
+                    _, (_, _, evicted) = sessions.popitem(last=False)
+                    shard[2] -= evicted
+
+
+class SQLiteListStore(ListStore):
+    """
+    Store backed by a local SQLite database shared by all workers on a host.
+
+    Every session runs in an ``IMMEDIATE`` transaction, so read-modify-write
+    cycles from different worker processes never interleave.
+
+    Bulk-loaded lists live in a table of their own, as raw arrays. They are
+    only read when an operation uses them and only rewritten when replaced;
+    otherwise just their traversal cursor is updated.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 3600):
+        super().__init__(ttl_seconds)
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS linked_list_sessions ("
+                "id TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS linked_list_sessions_updated "
+                "ON linked_list_sessions (updated)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS linked_list_bulk_lists ("
+                "session_id TEXT NOT NULL, list_id TEXT NOT NULL, "
+                "size INTEGER NOT NULL, head INTEGER NOT NULL, "
+                "cursor_position INTEGER NOT NULL, cursor_slot INTEGER NOT NULL, "
+                "data BLOB NOT NULL, PRIMARY KEY (session_id, list_id))"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[LinkedListManager]:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            expired = conn.execute(
+                "DELETE FROM linked_list_sessions WHERE updated < ?",
+                (now - self.ttl_seconds,),
+            )
+            if expired.rowcount:
+                conn.execute(
+                    "DELETE FROM linked_list_bulk_lists WHERE session_id NOT IN "
+                    "(SELECT id FROM linked_list_sessions)"
+                )
+
+            row = conn.execute(
+                "SELECT state FROM linked_list_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                manager = LinkedListManager()
+            else:
+                manager = LinkedListManager.from_dict(json.loads(row[0]))
+            sizes = conn.execute(
+                "SELECT list_id, size FROM linked_list_bulk_lists "
+                "WHERE session_id = ?",
+                (session_id,),
+            ).fetchall()
+            manager.bulk_lists = BulkLists(
+                dict(sizes), lambda list_id: self._load_bulk(conn, session_id, list_id)
+            )
+
+            try:
+                yield manager
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            conn.execute(
+                "INSERT OR REPLACE INTO linked_list_sessions (id, state, updated) "
+                "VALUES (?, ?, ?)",
+                (session_id, json.dumps(manager.to_dict()), now),
+            )
+            self._save_bulk(conn, session_id, manager.bulk_lists)
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _load_bulk(
+        conn: sqlite3.Connection, session_id: str, list_id: str
+    ) -> ArrayLinkedList:
+        size, head, position, slot, data = conn.execute(
+            "SELECT size, head, cursor_position, cursor_slot, data "
+            "FROM linked_list_bulk_lists WHERE session_id = ? AND list_id = ?",
+            (session_id, list_id),
+        ).fetchone()
+        return ArrayLinkedList.from_bytes(data, size, head, (position, slot))
+
+    @staticmethod
+    def _save_bulk(
+        conn: sqlite3.Connection, session_id: str, bulk_lists: BulkLists
+    ) -> None:
+        """Write replaced lists, drop deleted ones and keep read ones' cursors."""
+        for list_id in bulk_lists.deleted:
+            conn.execute(
+                "DELETE FROM linked_list_bulk_lists "
+                "WHERE session_id = ? AND list_id = ?",
+                (session_id, list_id),
+            )
+        for list_id, nodes in bulk_lists.loaded.items():
+            if list_id in bulk_lists.written:
+                conn.execute(
+                    "INSERT OR REPLACE INTO linked_list_bulk_lists (session_id, "
+                    "list_id, size, head, cursor_position, cursor_slot, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        session_id,
+                        list_id,
+                        len(nodes),
+                        nodes.head,
+                        *nodes.cursor,
+                        nodes.to_bytes(),
+                    ),
+                )
+            else:
+                conn.execute(
+                    "UPDATE linked_list_bulk_lists "
+                    "SET cursor_position = ?, cursor_slot = ? "
+                    "WHERE session_id = ? AND list_id = ?",
+                    (*nodes.cursor, session_id, list_id),
+                )
+
+
+_store: Optional[ListStore] = None
+
+
+def get_store() -> ListStore:
+    """
+    Return the configured session store.
+
+    ``LINKEDLIST_STORE`` selects ``memory`` (default) or ``sqlite``;
+    ``LINKEDLIST_DB_PATH``, ``LINKEDLIST_SESSION_TTL`` (seconds),
+    ``LINKEDLIST_MAX_SESSIONS`` and ``LINKEDLIST_MAX_BYTES`` (memory store
+    only) tune them.
+    """
+    global _store
+    if _store is None:
+        ttl = float(os.environ.get("LINKEDLIST_SESSION_TTL", 3600))
+        if os.environ.get("LINKEDLIST_STORE", "memory") == "sqlite":
+            path = os.environ.get(
+                "LINKEDLIST_DB_PATH",
+                os.path.join(tempfile.gettempdir(), "lp-visualizer-lists.db"),
+            )
+            _store = SQLiteListStore(path, ttl)
+        else:
+            max_sessions = int(os.environ.get("LINKEDLIST_MAX_SESSIONS", 10000))
+            max_bytes = int(os.environ.get("LINKEDLIST_MAX_BYTES", 2 * 1024**3))
+            _store = MemoryListStore(
+                ttl_seconds=ttl, max_sessions=max_sessions, max_bytes=max_bytes
+            )
+    return _store
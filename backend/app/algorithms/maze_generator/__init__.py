@@ -0,0 +1,52 @@
+from functools import partial
+from typing import NamedTuple
+from app.algorithms.maze_generator import (
+    backtracking,
+    binary_tree,
+    cellular,
+    eller,
+    kruskal,
+    prim,
+    sidewinder,
+    wilson,
+)
+
+# Generator functions by MazeAlgorithm value
+GENERATORS = {
+    "backtracking": backtracking.generate,
+    "prim": prim.generate,
+    "kruskal": kruskal.generate,
+    "eller": eller.generate,
+    "wilson": wilson.generate,
+    "binary_tree": binary_tree.generate,
+    "sidewinder": sidewinder.generate,
+    "ca_maze": partial(cellular.generate, rule="maze"),
+    "ca_mazectric": partial(cellular.generate, rule="mazectric"),
+}
+
+# Generators that can also build the maze straight into a ``uint8`` array,
+# for large mazes. They take odd dimensions and a numpy generator; given
+# ``vectorized.numpy_rng(rng)`` they make the same maze as ``GENERATORS``.
+ARRAY_GENERATORS = {
+    "binary_tree": binary_tree.generate_array,
+    "sidewinder": sidewinder.generate_array,
+    "ca_maze": partial(cellular.generate_array, rule="maze"),
+    "ca_mazectric": partial(cellular.generate_array, rule="mazectric"),
+}
+
+
+class Features(NamedTuple):
+    """What a generator supports besides ``GENERATORS``' step-by-step run."""
+
+    vectorized: bool  # Has an ``ARRAY_GENERATORS`` entry
+    tiled: bool  # Makes perfect mazes, so tiles can be stitched together
+
+
+# Features by MazeAlgorithm value; cellular automata make imperfect mazes
+FEATURES = {
+    name: Features(
+        vectorized=name in ARRAY_GENERATORS,
+        tiled=name not in ("ca_maze", "ca_mazectric"),
+    )
+    for name in GENERATORS
+}
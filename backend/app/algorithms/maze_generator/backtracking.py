@@ -1,21 +1,37 @@
 import random
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
 from app.utils.helpers import ensure_start_end_open
 
 
-def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]]]]:
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
     """
     Generate a maze using recursive backtracking.
 
     Args:
         rows: Number of rows in the maze
         cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
 
     Returns:
         Tuple containing:
         - The generated maze as a 2D grid (0 = passage, 1 = wall)
         - Steps of the generation process for animation
     """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+    if rng is None:
+        rng = random
+
     # Ensure odd dimensions for proper maze
     if rows % 2 == 0:
         rows += 1
@@ -24,7 +40,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Initialize maze with all walls
     maze = [[1 for _ in range(cols)] for _ in range(rows)]
-    steps = []
 
     # Mark cells at odd coordinates as open (these will be our nodes)
     for r in range(1, rows, 2):
@@ -32,11 +47,11 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             maze[r][c] = 0
 
     # Record initial state
-    steps.append([row[:] for row in maze])
+    recorder.start(maze)
 
     # Start at a random cell
-    start_row = random.randrange(1, rows, 2)
-    start_col = random.randrange(1, cols, 2)
+    start_row = rng.randrange(1, rows, 2)
+    start_col = rng.randrange(1, cols, 2)
     stack = [(start_row, start_col)]
     visited = {(start_row, start_col)}
 
@@ -45,6 +60,8 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # DFS with backtracking
     while stack:
+        if cancel is not None:
+            cancel.check()
         current_row, current_col = stack[-1]
 
         # Get unvisited neighbors
@@ -65,17 +82,18 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             continue
 
         # Choose random unvisited neighbor
-        next_row, next_col, dr, dc = random.choice(neighbors)
+        next_row, next_col, dr, dc = rng.choice(neighbors)
 
         # Remove wall between current cell and chosen neighbor
-        maze[current_row + dr // 2][current_col + dc // 2] = 0
+        wall_row, wall_col = current_row + dr // 2, current_col + dc // 2
+        maze[wall_row][wall_col] = 0
 
         # Mark as visited and push to stack
         visited.add((next_row, next_col))
         stack.append((next_row, next_col))
 
         # Record step
-        steps.append([row[:] for row in maze])
+        recorder.step(maze, (wall_row, wall_col))
 
     # Set standard start and end positions
     maze[0][1] = 0  # Start
@@ -85,6 +103,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     final_maze = ensure_start_end_open(maze)
 
     # Record final state
-    steps.append([row[:] for row in final_maze])
+    recorder.finish(final_maze)
 
-    return final_maze, steps
+    return final_maze, recorder.result()
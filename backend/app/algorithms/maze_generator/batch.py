@@ -0,0 +1,89 @@
+import json
+import random
+from typing import List
+import numpy as np
+from app.algorithms.maze_generator import ARRAY_GENERATORS, FEATURES, GENERATORS
+from app.algorithms.maze_generator.vectorized import numpy_rng, odd_size
+from app.utils.frames import NullRecorder, SnapshotRecorder
+from app.utils.grid_json import encode_grid, encode_maze_response
+from app.utils.helpers import add_braids, add_loops
+
+
+def generate_maze(
+    algorithm: str, rows: int, cols: int, maze_type: str, seed: int
+) -> List[List[int]]:
+    """
+    Generate one maze without animation steps.
+
+    Uses the generator and maze type the same way as ``/api/maze/generate``,
+    so a seed produces the same maze through either path.
+    """
+    maze, _ = _generate(algorithm, rows, cols, maze_type, seed, NullRecorder())
+    return maze
+
+
+def generate_array(
+    algorithm: str, rows: int, cols: int, maze_type: str, seed: int
+) -> np.ndarray:
+    """
+    Generate one maze without animation steps as a ``uint8`` array.
+
+    Perfect mazes of the numpy generators are built as an array directly,
+    see ``FEATURES``; anything else goes through ``generate_maze``.
+    Either way a seed gives the same maze as ``generate_maze``.
+    """
+    if maze_type == "perfect" and FEATURES[algorithm].vectorized:
+        rows, cols = odd_size(rows, cols)
+        return ARRAY_GENERATORS[algorithm](rows, cols, numpy_rng(random.Random(seed)))
+    return np.array(
+        generate_maze(algorithm, rows, cols, maze_type, seed), dtype=np.uint8
+    )
+
+
+def _generate(algorithm, rows, cols, maze_type, seed, recorder):
+    rng = random.Random(seed)
+    maze, steps = GENERATORS[algorithm](rows, cols, recorder, rng)
+
+    if maze_type == "loop":
+        maze = add_loops(maze, rng)
+    elif maze_type == "braid":
+        maze = add_braids(maze, rng)
+
+    return maze, steps
+
+
+def generate_item(
+    index: int, algorithm: str, rows: int, cols: int, maze_type: str, seed: int
+) -> bytes:
+    """
+    Generate a maze in a worker process and return it as a JSON object.
+
+    Encoding in the worker spreads that cost over the pool too; the server
+    only concatenates the returned bytes.
+    """
+    maze = generate_array(algorithm, rows, cols, maze_type, seed)
+    header = json.dumps(
+        {
+            "index": index,
+            "rows": len(maze),
+            "cols": len(maze[0]),
+            "algorithm": algorithm,
+            "maze_type": maze_type,
+            "seed": seed,
+        },
+        separators=(",", ":"),
+    )
+    return header[:-1].encode() + b',"maze":' + encode_grid(maze) + b"}"
+
+
+def generate_response(
+    algorithm: str, rows: int, cols: int, maze_type: str, seed: int
+) -> bytes:
+    """
+    Generate a maze with snapshot steps in a worker process.
+
+    Returns the whole ``MazeResponse`` body, ready to be sent as is; used to
+    fill the pool of pre-generated mazes, see ``app.utils.maze_pool``.
+    """
+    maze, steps = _generate(algorithm, rows, cols, maze_type, seed, SnapshotRecorder())
+    return encode_maze_response(maze, steps)
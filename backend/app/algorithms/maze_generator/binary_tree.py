@@ -0,0 +1,80 @@
+import random
+from typing import List, Optional, Tuple
+import numpy as np
+from app.algorithms.maze_generator.vectorized import (
+    bands,
+    cell_grid,
+    numpy_rng,
+    odd_size,
+    open_start_end,
+    record,
+)
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
+
+
+def generate_array(rows: int, cols: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Carve a binary tree maze with whole-array operations.
+
+    Every cell independently opens the wall to its north or to its east.
+    Top-row cells can only go east and last-column cells only north, so the
+    passages form a spanning tree rooted at the top-right cell.
+
+    Args:
+        rows: Number of rows in the maze (odd)
+        cols: Number of columns in the maze (odd)
+        rng: Numpy random generator
+
+    Returns:
+        The maze as a ``uint8`` array (0 = passage, 1 = wall)
+    """
+    maze = cell_grid(rows, cols)
+
+    north = rng.random((rows // 2, cols // 2), dtype=np.float32) < 0.5
+    north[0, :] = False
+    north[1:, -1] = True
+    east = ~north
+    east[:, -1] = False
+
+    # Cell (i, j) sits at (2i + 1, 2j + 1), its walls one step north or east
+    maze[0 : rows - 1 : 2, 1::2][north] = 0
+    maze[1::2, 2::2][east] = 0
+
+    open_start_end(maze)
+    return maze
+
+
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
+    """
+    Generate a maze using the binary tree algorithm.
+
+    All cells are carved at once; for the animation, the result is revealed
+    one row of cells per step.
+
+    Args:
+        rows: Number of rows in the maze
+        cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
+
+    Returns:
+        Tuple containing:
+        - The generated maze as a 2D grid (0 = passage, 1 = wall)
+        - Steps of the generation process for animation
+    """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+
+    rows, cols = odd_size(rows, cols)
+    start = cell_grid(rows, cols)
+    maze = generate_array(rows, cols, numpy_rng(rng))
+
+    return record(recorder, start, bands(start, maze, 2), cancel)
@@ -0,0 +1,138 @@
+import random
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from app.algorithms.maze_generator.vectorized import (
+    numpy_rng,
+    odd_size,
+    open_start_end,
+    record,
+)
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
+
+# Life-like rules by name: walls are born with exactly 3 wall neighbours and
+# survive with 1 up to this many (Maze is B3/S12345, Mazectric B3/S1234)
+RULES = {"maze": 5, "mazectric": 4}
+
+# Share of the interior that starts out as walls
+DENSITY = 0.25
+
+# Corridors settle within a few dozen generations; large grids never fully
+# stop changing at their edges, so the evolution is capped
+GENERATIONS = 32
+
+
+def _soup(rows: int, cols: int, rng: np.random.Generator) -> np.ndarray:
+    """A random initial grid inside a solid border."""
+    maze = np.ones((rows, cols), dtype=np.uint8)
+    maze[1:-1, 1:-1] = rng.random((rows - 2, cols - 2), dtype=np.float32) < DENSITY
+    return maze
+
+
+def _evolve(
+    maze: np.ndarray, survive: int, rng: np.random.Generator, generations: int
+) -> Iterator[np.ndarray]:
+    """
+    Run the automaton on ``maze`` in place, yielding it after every change.
+
+    The border stays solid. After the last generation a corridor is carved
+    from start to end, since the automaton does not guarantee connectivity.
+    """
+    rows, cols = maze.shape
+    inner = maze[1:-1, 1:-1]
+    neighbours = np.empty(inner.shape, dtype=np.uint8)
+
+    for _ in range(generations):
+        # Count wall neighbours by summing the eight shifted views
+        np.add(maze[:-2, :-2], maze[:-2, 1:-1], out=neighbours)
+        neighbours += maze[:-2, 2:]
+        neighbours += maze[1:-1, :-2]
+        neighbours += maze[1:-1, 2:]
+        neighbours += maze[2:, :-2]
+        neighbours += maze[2:, 1:-1]
+        neighbours += maze[2:, 2:]
+
+        born = neighbours == 3
+        survives = (inner == 1) & (neighbours >= 1) & (neighbours <= survive)
+        walls = born | survives
+        if np.array_equal(walls, inner):
+            break
+        inner[...] = walls
+        yield maze
+
+    # A random monotone path of downs and rights from (1, 1) to the end
+    moves = np.zeros(rows + cols - 6, dtype=bool)
+    moves[: rows - 3] = True
+    rng.shuffle(moves)
+    path_rows = 1 + np.concatenate(([0], np.cumsum(moves)))
+    path_cols = 1 + np.concatenate(([0], np.cumsum(~moves)))
+    maze[path_rows, path_cols] = 0
+    open_start_end(maze)
+    yield maze
+
+
+def generate_array(
+    rows: int,
+    cols: int,
+    rng: np.random.Generator,
+    rule: str = "mazectric",
+    generations: int = GENERATIONS,
+) -> np.ndarray:
+    """
+    Grow a maze with a Life-like cellular automaton (Maze or Mazectric).
+
+    Each generation updates the whole grid with array operations.
+
+    Args:
+        rows: Number of rows in the maze (odd)
+        cols: Number of columns in the maze (odd)
+        rng: Numpy random generator
+        rule: ``"maze"`` or ``"mazectric"``, see ``RULES``
+        generations: Maximum number of generations to run
+
+    Returns:
+        The maze as a ``uint8`` array (0 = passage, 1 = wall)
+    """
+    maze = _soup(rows, cols, rng)
+    for _ in _evolve(maze, RULES[rule], rng, generations):
+        pass
+    return maze
+
+
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    rule: str = "mazectric",
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
+    """
+    Generate a maze with a cellular automaton, one step per generation.
+
+    Unlike the other generators the result is not a perfect maze: it has
+    loops and unreachable pockets, but start and end are always connected.
+
+    Args:
+        rows: Number of rows in the maze
+        cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        rule: ``"maze"`` or ``"mazectric"``, see ``RULES``
+        cancel: Checked once per step; generation stops when it is cancelled
+
+    Returns:
+        Tuple containing:
+        - The generated maze as a 2D grid (0 = passage, 1 = wall)
+        - Steps of the generation process for animation
+    """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+
+    rows, cols = odd_size(rows, cols)
+    np_rng = numpy_rng(rng)
+    maze = _soup(rows, cols, np_rng)
+
+    return record(
+        recorder, maze, _evolve(maze, RULES[rule], np_rng, GENERATIONS), cancel
+    )
@@ -1,21 +1,37 @@
 import random
-from typing import List, Tuple, Dict, Set
+from typing import List, Optional, Tuple, Dict, Set
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
 from app.utils.helpers import ensure_start_end_open
 
 
-def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]]]]:
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
     """
     Generate a maze using Eller's algorithm.
 
     Args:
         rows: Number of rows in the maze
         cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
 
     Returns:
         Tuple containing:
         - The generated maze as a 2D grid (0 = passage, 1 = wall)
         - Steps of the generation process for animation
     """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+    if rng is None:
+        rng = random
+
     # Ensure odd dimensions for proper maze
     if rows % 2 == 0:
         rows += 1
@@ -24,14 +40,13 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Initialize maze with all walls
     maze = [[1 for _ in range(cols)] for _ in range(rows)]
-    steps = []
 
     # Create passages at odd-indexed positions
     for r in range(1, rows, 2):
         for c in range(1, cols, 2):
             maze[r][c] = 0
 
-    steps.append([row[:] for row in maze])  # Record initial state
+    recorder.start(maze)  # Record initial state
 
     # Initialize sets for the first row
     # Each cell in a separate set initially
@@ -46,6 +61,8 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Process each row of the maze
     for r in range(1, rows, 2):
+        if cancel is not None:
+            cancel.check()
         last_row = r + 2 >= rows
 
         # Step 1: Randomly connect adjacent cells in the current row
@@ -53,7 +70,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             if cur_set[c] != cur_set[c + 2]:
                 # If cells are in different sets, randomly decide to merge them
                 # Always merge if this is the last row
-                should_merge = True if last_row else (random.random() < 0.5)
+                should_merge = True if last_row else (rng.random() < 0.5)
 
                 if should_merge:
                     # Remove the wall between cells
@@ -75,7 +92,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
                         set_id_to_cols[new_set_id].extend(set_id_to_cols[old_set_id])
                         del set_id_to_cols[old_set_id]
 
-                    steps.append([row[:] for row in maze])  # Record step
+                    recorder.step(maze, (r, c + 1))  # Record step
 
         # Skip vertical connections if this is the last row
         if last_row:
@@ -93,7 +110,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
             # Randomly select columns to connect vertically
             connect_cols = (
-                random.sample(columns, num_connections)
+                rng.sample(columns, num_connections)
                 if len(columns) >= num_connections
                 else columns
             )
@@ -110,7 +127,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
                     new_set_id_to_cols[set_id] = []
                 new_set_id_to_cols[set_id].append(col)
 
-                steps.append([row[:] for row in maze])  # Record step
+                recorder.step(maze, (r + 1, col))  # Record step
 
         # Step 4: Add cells that haven't been connected to their own sets
         for c in range(1, cols, 2):
@@ -132,6 +149,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     final_maze = ensure_start_end_open(maze)
 
     # Record final state
-    steps.append([row[:] for row in final_maze])
+    recorder.finish(final_maze)
 
-    return final_maze, steps
+    return final_maze, recorder.result()
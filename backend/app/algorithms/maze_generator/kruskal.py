@@ -1,8 +1,16 @@
 import random
-from typing import List, Tuple, Dict
-
-
-def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]]]]:
+from typing import List, Optional, Tuple, Dict
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
+
+
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
     """
     Generate a maze using Kruskal's algorithm.
 
@@ -12,12 +20,20 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     Args:
         rows: Number of rows in the maze
         cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
 
     Returns:
         Tuple containing:
         - The generated maze as a 2D grid (0 = passage, 1 = wall)
         - Steps of the generation process for animation
     """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+    if rng is None:
+        rng = random
+
     # Ensure odd dimensions for proper maze
     if rows % 2 == 0:
         rows += 1
@@ -26,7 +42,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Initialize maze with all walls
     maze = [[1 for _ in range(cols)] for _ in range(rows)]
-    steps = []
 
     # Create cells at odd coordinates (for passages)
     cells = []
@@ -35,7 +50,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             maze[r][c] = 0  # Mark as passage
             cells.append((r, c))
 
-    steps.append([row[:] for row in maze])  # Record initial state
+    recorder.start(maze)  # Record initial state
 
     # Disjoint-set data structure implementation
     parent = {cell: cell for cell in cells}
@@ -68,19 +83,25 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Horizontal walls
     for r in range(1, rows, 2):
+        if cancel is not None:
+            cancel.check()
         for c in range(1, cols - 2, 2):
             walls.append(((r, c), (r, c + 2), (r, c + 1)))  # (cell1, cell2, wall)
 
     # Vertical walls
     for r in range(1, rows - 2, 2):
+        if cancel is not None:
+            cancel.check()
         for c in range(1, cols, 2):
             walls.append(((r, c), (r + 2, c), (r + 1, c)))  # (cell1, cell2, wall)
 
     # Shuffle walls for randomness
-    random.shuffle(walls)
+    rng.shuffle(walls)
 
     # Remove walls to create the maze
     for cell1, cell2, wall in walls:
+        if cancel is not None:
+            cancel.check()
         if find(cell1) != find(cell2):
             # Remove the wall
             maze[wall[0]][wall[1]] = 0
@@ -88,11 +109,11 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             # Union the sets
             union(cell1, cell2)
 
-            steps.append([row[:] for row in maze])  # Record step
+            recorder.step(maze, wall)  # Record step
 
     # Ensure start and end are open
     maze[0][1] = 0  # Start
     maze[rows - 1][cols - 2] = 0  # End
-    steps.append([row[:] for row in maze])  # Final state
+    recorder.finish(maze)  # Final state
 
-    return maze, steps
+    return maze, recorder.result()
@@ -1,9 +1,17 @@
 import random
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
 from app.utils.helpers import ensure_start_end_open
 
 
-def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]]]]:
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
     """
     Generate a maze using Prim's algorithm.
 
@@ -12,12 +20,20 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     Args:
         rows: Number of rows in the maze
         cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
 
     Returns:
         Tuple containing:
         - The generated maze as a 2D grid (0 = passage, 1 = wall)
         - Steps of the generation process for animation
     """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+    if rng is None:
+        rng = random
+
     # Ensure odd dimensions for proper maze
     if rows % 2 == 0:
         rows += 1
@@ -26,18 +42,17 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Initialize maze with all walls
     maze = [[1 for _ in range(cols)] for _ in range(rows)]
-    steps = []
 
     # Possible directions to move: right, down, left, up
     FRONTIER_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
     # Choose a random starting cell (at odd coordinates)
-    start_row = random.randrange(1, rows, 2)
-    start_col = random.randrange(1, cols, 2)
+    start_row = rng.randrange(1, rows, 2)
+    start_col = rng.randrange(1, cols, 2)
 
     # Mark starting cell as a passage
     maze[start_row][start_col] = 0
-    steps.append([row[:] for row in maze])  # Record initial state
+    recorder.start(maze)  # Record initial state
 
     # Keep track of visited cells to prevent loops
     visited_cells = {(start_row, start_col)}
@@ -54,8 +69,10 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Process frontiers until none remain
     while frontier_list:
+        if cancel is not None:
+            cancel.check()
         # Choose a random frontier
-        random_index = random.randrange(len(frontier_list))
+        random_index = rng.randrange(len(frontier_list))
         frontier = frontier_list.pop(random_index)
 
         frontier_row = frontier["row"]
@@ -79,7 +96,9 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             maze[frontier_row][frontier_col] = 0
             maze[in_between_row][in_between_col] = 0
 
-            steps.append([row[:] for row in maze])  # Record step
+            recorder.step(
+                maze, (frontier_row, frontier_col), (in_between_row, in_between_col)
+            )  # Record step
 
             # Add new frontiers
             for dr, dc in FRONTIER_DIRECTIONS:
@@ -110,6 +129,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     final_maze = ensure_start_end_open(maze)
 
     # Record final state
-    steps.append([row[:] for row in final_maze])
+    recorder.finish(final_maze)
 
-    return final_maze, steps
+    return final_maze, recorder.result()
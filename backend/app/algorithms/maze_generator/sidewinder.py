@@ -0,0 +1,91 @@
+import random
+from typing import List, Optional, Tuple
+import numpy as np
+from app.algorithms.maze_generator.vectorized import (
+    bands,
+    cell_grid,
+    numpy_rng,
+    odd_size,
+    open_start_end,
+    record,
+)
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
+
+
+def generate_array(rows: int, cols: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Carve a sidewinder maze with whole-array operations.
+
+    The top row is one long corridor. In every other row, cells are joined
+    eastwards into runs that end at random (and at the last column), and
+    each run opens the wall to the north from one random member. Runs never
+    span rows, so all of them are handled at once on the flattened cells.
+
+    Args:
+        rows: Number of rows in the maze (odd)
+        cols: Number of columns in the maze (odd)
+        rng: Numpy random generator
+
+    Returns:
+        The maze as a ``uint8`` array (0 = passage, 1 = wall)
+    """
+    maze = cell_grid(rows, cols)
+    cell_rows, cell_cols = rows // 2, cols // 2
+
+    # Top row: every cell opens east except the last
+    maze[1, 2 : cols - 1 : 2] = 0
+
+    if cell_rows > 1:
+        close = rng.random((cell_rows - 1, cell_cols), dtype=np.float32) < 0.5
+        close[:, -1] = True
+        maze[3::2, 2::2][~close] = 0
+
+        # Number the runs: a run ends at every closing cell
+        ends = close.ravel()
+        run = np.concatenate(([0], np.cumsum(ends)[:-1]))
+        lengths = np.bincount(run)
+        starts = np.cumsum(lengths) - lengths
+        chosen = starts + (rng.random(len(lengths)) * lengths).astype(np.int64)
+
+        north = np.zeros(ends.shape, dtype=bool)
+        north[chosen] = True
+        maze[2 : rows - 1 : 2, 1::2][north.reshape(close.shape)] = 0
+
+    open_start_end(maze)
+    return maze
+
+
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
+    """
+    Generate a maze using the sidewinder algorithm.
+
+    All rows are carved at once; for the animation, the result is revealed
+    one row of cells per step.
+
+    Args:
+        rows: Number of rows in the maze
+        cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
+
+    Returns:
+        Tuple containing:
+        - The generated maze as a 2D grid (0 = passage, 1 = wall)
+        - Steps of the generation process for animation
+    """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+
+    rows, cols = odd_size(rows, cols)
+    start = cell_grid(rows, cols)
+    maze = generate_array(rows, cols, numpy_rng(rng))
+
+    return record(recorder, start, bands(start, maze, 2), cancel)
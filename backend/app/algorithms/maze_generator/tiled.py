@@ -0,0 +1,171 @@
+import random
+from typing import List, Optional, Tuple
+from app.algorithms.maze_generator import FEATURES, GENERATORS
+from app.utils.cancel import CancelToken
+from app.utils.frames import NullRecorder, StepRecorder
+from app.utils.pool import get_process_pool
+
+# Generators whose mazes are perfect, so that joining tiles through one
+# passage per border keeps the whole maze connected
+TILE_GENERATORS = {
+    name: generator for name, generator in GENERATORS.items() if FEATURES[name].tiled
+}
+
+
+def _spans(cells: int, tile_size: int) -> List[Tuple[int, int]]:
+    """Split ``cells`` into contiguous [start, end) ranges of roughly tile_size."""
+    count = max(1, cells // tile_size)
+    base, extra = divmod(cells, count)
+    spans = []
+    start = 0
+    for i in range(count):
+        end = start + base + (1 if i < extra else 0)
+        spans.append((start, end))
+        start = end
+    return spans
+
+
+def _generate_tile(algorithm: str, rows: int, cols: int, seed: int) -> bytes:
+    """Generate one tile in a worker process and return it as packed bytes."""
+    maze, _ = TILE_GENERATORS[algorithm](
+        rows, cols, NullRecorder(), random.Random(seed)
+    )
+    return bytes(value for row in maze for value in row)
+
+
+def generate(
+    rows: int,
+    cols: int,
+    algorithm: str,
+    tile_size: int,
+    seed: Optional[int] = None,
+    recorder: Optional[StepRecorder] = None,
+    out=None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
+    """
+    Generate a large maze by generating tiles in parallel and stitching them.
+
+    The cell grid is split into tiles of about ``tile_size`` x ``tile_size``
+    cells. Each tile is generated in the shared process pool as an
+    independent perfect maze with the chosen algorithm. Tiles are then joined
+    along a random spanning tree of the tile grid, carving exactly one passage
+    through each chosen shared border, so the result is still a perfect maze.
+
+    Args:
+        rows: Number of rows in the maze
+        cols: Number of columns in the maze
+        algorithm: Name of the generator used for every tile, one of
+            ``TILE_GENERATORS``
+        tile_size: Approximate tile side length, in maze cells
+        seed: Seed for tile seeds and stitching (random if omitted)
+        recorder: Collects animation steps (none by default, since a full
+            snapshot per stitch is rarely affordable at tiled sizes)
+        out: Grid to write into instead of a new list, e.g. a ``MazeFile``
+            with odd dimensions whose cells are all walls
+        cancel: Checked once per tile and per stitch; generation stops, and
+            tiles not yet started are dropped, when it is cancelled
+
+    Returns:
+        Tuple containing:
+        - The generated maze as a 2D grid (0 = passage, 1 = wall), or ``out``
+        - Steps of the stitching process for animation
+
+    Raises:
+        ValueError: If ``algorithm`` does not generate perfect mazes
+    """
+    if algorithm not in TILE_GENERATORS:
+        raise ValueError(f"{algorithm} mazes cannot be tiled")
+    if recorder is None:
+        recorder = NullRecorder()
+
+    rng = random.Random(seed)
+
+    # Ensure odd dimensions for proper maze
+    if rows % 2 == 0:
+        rows += 1
+    if cols % 2 == 0:
+        cols += 1
+
+    row_spans = _spans(rows // 2, tile_size)
+    col_spans = _spans(cols // 2, tile_size)
+    tiles = [(ty, tx) for ty in range(len(row_spans)) for tx in range(len(col_spans))]
+
+    # Generate every tile in the process pool
+    jobs = []
+    for ty, tx in tiles:
+        tile_rows = 2 * (row_spans[ty][1] - row_spans[ty][0]) + 1
+        tile_cols = 2 * (col_spans[tx][1] - col_spans[tx][0]) + 1
+        jobs.append((algorithm, tile_rows, tile_cols, rng.getrandbits(64)))
+
+    results = get_process_pool().map(
+        _generate_tile, *zip(*jobs), chunksize=max(1, len(jobs) // 64)
+    )
+
+    # Copy tile interiors into the full maze (tile borders stay walls)
+    if out is None:
+        maze = [[1 for _ in range(cols)] for _ in range(rows)]
+    else:
+        maze = out
+    try:
+        for (ty, tx), (_, tile_rows, tile_cols, _), data in zip(tiles, jobs, results):
+            if cancel is not None:
+                cancel.check()
+            row_offset = 2 * row_spans[ty][0]
+            col_offset = 2 * col_spans[tx][0]
+            for tr in range(1, tile_rows - 1):
+                start = tr * tile_cols
+                maze[row_offset + tr][col_offset + 1 : col_offset + tile_cols - 1] = (
+                    list(data[start + 1 : start + tile_cols - 1])
+                )
+    finally:
+        # Cancels the tiles still queued when stopped early
+        results.close()
+
+    recorder.start(maze)
+
+    # Candidate borders between adjacent tiles
+    borders = []
+    for ty, tx in tiles:
+        if tx + 1 < len(col_spans):
+            borders.append(((ty, tx), (ty, tx + 1)))
+        if ty + 1 < len(row_spans):
+            borders.append(((ty, tx), (ty + 1, tx)))
+    rng.shuffle(borders)
+
+    # Disjoint-set over tiles to pick a random spanning tree of borders
+    parent = {tile: tile for tile in tiles}
+
+    def find(tile):
+        while parent[tile] != tile:
+            parent[tile] = parent[parent[tile]]
+            tile = parent[tile]
+        return tile
+
+    for tile1, tile2 in borders:
+        if cancel is not None:
+            cancel.check()
+        root1, root2 = find(tile1), find(tile2)
+        if root1 == root2:
+            continue
+        parent[root2] = root1
+
+        ty, tx = tile2
+        if tile1[0] == ty:
+            # Side-by-side tiles: open the wall column at a random cell row
+            cell_row = rng.randrange(*row_spans[ty])
+            wall = (2 * cell_row + 1, 2 * col_spans[tx][0])
+        else:
+            # Stacked tiles: open the wall row at a random cell column
+            cell_col = rng.randrange(*col_spans[tx])
+            wall = (2 * row_spans[ty][0], 2 * cell_col + 1)
+
+        maze[wall[0]][wall[1]] = 0
+        recorder.step(maze, wall)
+
+    # Set standard start and end positions
+    maze[0][1] = 0  # Start
+    maze[rows - 1][cols - 2] = 0  # End
+    recorder.finish(maze)
+
+    return maze, recorder.result()
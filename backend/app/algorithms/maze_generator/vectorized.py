@@ -0,0 +1,91 @@
+"""
+Shared pieces of the numpy generators (binary tree, sidewinder, cellular).
+
+These generators build the whole maze with array operations. Their
+``generate_array`` functions return a ``uint8`` array and are meant for
+large mazes; ``generate`` wraps them with the usual list-of-lists result and
+animation steps.
+"""
+
+import random
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from app.utils.cancel import CancelToken
+from app.utils.frames import NullRecorder, StepRecorder
+
+
+def numpy_rng(rng: Optional[random.Random] = None) -> np.random.Generator:
+    """Derive a numpy generator from ``rng`` (the ``random`` module by default)."""
+    if rng is None:
+        rng = random
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def odd_size(rows: int, cols: int) -> Tuple[int, int]:
+    """Round dimensions up to odd numbers, as every generator does."""
+    return rows + 1 if rows % 2 == 0 else rows, cols + 1 if cols % 2 == 0 else cols
+
+
+def cell_grid(rows: int, cols: int) -> np.ndarray:
+    """All walls except the cells at odd positions."""
+    maze = np.ones((rows, cols), dtype=np.uint8)
+    maze[1::2, 1::2] = 0
+    return maze
+
+
+def open_start_end(maze: np.ndarray) -> None:
+    """Open the standard start (top) and end (bottom) positions."""
+    maze[0, 1] = 0
+    maze[-1, -2] = 0
+
+
+def bands(start: np.ndarray, final: np.ndarray, height: int) -> Iterator[np.ndarray]:
+    """
+    Go from ``start`` to ``final`` ``height`` rows at a time.
+
+    Yields the same array after each band, so row-parallel carving can be
+    animated one row of cells per step.
+    """
+    state = start.copy()
+    for top in range(0, len(state), height):
+        state[top : top + height] = final[top : top + height]
+        yield state
+
+
+def record(
+    recorder: StepRecorder,
+    start: np.ndarray,
+    states: Iterable[np.ndarray],
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
+    """
+    Feed the states a generator went through to ``recorder``.
+
+    ``start`` is converted before ``states`` is consumed, so the states may
+    be ``start`` itself modified in place. The last state is the maze.
+    ``cancel`` is checked before every state.
+
+    Returns:
+        The usual generator result: the maze as lists and the recorded steps
+    """
+    # Nothing to diff when steps are discarded
+    recording = not isinstance(recorder, NullRecorder)
+    if recording:
+        maze = start.tolist()
+        previous = start.copy()
+        recorder.start(maze)
+
+    final = start
+    for final in states:
+        if cancel is not None:
+            cancel.check()
+        if recording:
+            changed = np.argwhere(final != previous).tolist()
+            for r, c in changed:
+                maze[r][c] = int(final[r, c])
+            recorder.step(maze, *(tuple(cell) for cell in changed))
+            previous = final.copy()
+
+    result = final.tolist()
+    recorder.finish(result)
+    return result, recorder.result()
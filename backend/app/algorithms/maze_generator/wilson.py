@@ -1,9 +1,17 @@
 import random
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
+from app.utils.cancel import CancelToken
+from app.utils.frames import SnapshotRecorder, StepRecorder
 from app.utils.helpers import ensure_start_end_open
 
 
-def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]]]]:
+def generate(
+    rows: int,
+    cols: int,
+    recorder: Optional[StepRecorder] = None,
+    rng: Optional[random.Random] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[List[List[int]], List]:
     """
     Generate a maze using Wilson's algorithm.
 
@@ -12,12 +20,20 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     Args:
         rows: Number of rows in the maze
         cols: Number of columns in the maze
+        recorder: Collects animation steps (full snapshots by default)
+        rng: Random number generator (the global ``random`` module by default)
+        cancel: Checked once per step; generation stops when it is cancelled
 
     Returns:
         Tuple containing:
         - The generated maze as a 2D grid (0 = passage, 1 = wall)
         - Steps of the generation process for animation
     """
+    if recorder is None:
+        recorder = SnapshotRecorder()
+    if rng is None:
+        rng = random
+
     # Ensure odd dimensions for proper maze
     if rows % 2 == 0:
         rows += 1
@@ -26,7 +42,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
     # Initialize maze with all walls
     maze = [[1 for _ in range(cols)] for _ in range(rows)]
-    steps = []
 
     # Mark cells as potential passage points (at odd coordinates)
     cells = []
@@ -35,7 +50,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             cells.append((r, c))
             maze[r][c] = 0  # Mark as potential passage
 
-    steps.append([row[:] for row in maze])  # Record initial state
+    recorder.start(maze)  # Record initial state
 
     # Possible directions to move: right, down, left, up
     directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
@@ -44,13 +59,15 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     in_maze = set()
 
     # Start with a random cell
-    start_cell = random.choice(cells)
+    start_cell = rng.choice(cells)
     in_maze.add(start_cell)
 
     # Continue until all cells are in the maze
     while len(in_maze) < len(cells):
+        if cancel is not None:
+            cancel.check()
         # Choose a random cell not in the maze to start a new path
-        current = random.choice([cell for cell in cells if cell not in in_maze])
+        current = rng.choice([cell for cell in cells if cell not in in_maze])
 
         # Create a path from current cell to anywhere in the maze
         path = [current]
@@ -60,10 +77,13 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
 
         # Perform a random walk until we hit a cell in the maze
         while path[-1] not in in_maze:
+            # Walks can run long between steps, so they check too
+            if cancel is not None:
+                cancel.check()
             r, c = path[-1]
 
             # Shuffle directions for randomness
-            random_directions = random.sample(directions, len(directions))
+            random_directions = rng.sample(directions, len(directions))
 
             found_next = False
             for dr, dc in random_directions:
@@ -102,7 +122,7 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
             wall_r, wall_c = r + dr // 2, c + dc // 2
             maze[wall_r][wall_c] = 0
 
-            steps.append([row[:] for row in maze])  # Record step
+            recorder.step(maze, (wall_r, wall_c))  # Record step
 
     # Set standard start and end positions
     maze[0][1] = 0  # Start
@@ -112,6 +132,6 @@ def generate(rows: int, cols: int) -> Tuple[List[List[int]], List[List[List[int]
     final_maze = ensure_start_end_open(maze)
 
     # Record final state
-    steps.append([row[:] for row in final_maze])
+    recorder.finish(final_maze)
 
-    return final_maze, steps
+    return final_maze, recorder.result()
@@ -0,0 +1,28 @@
+from app.algorithms.path_finding import (
+    adjacency,
+    astar,
+    bfs,
+    dfs,
+    dijkstra,
+    hpa,
+    landmarks,
+)
+
+# Solver functions by PathAlgorithm value
+SOLVERS = {
+    "bfs": bfs.find_path,
+    "dfs": dfs.find_path,
+    "astar": astar.find_path,
+    "dijkstra": dijkstra.find_path,
+    "hpa": hpa.find_path,
+}
+
+
+def discard_cached(cache_key: str) -> None:
+    """
+    Forget everything cached for a maze in this process: adjacency index,
+    HPA graphs and landmark tables.
+    """
+    adjacency.discard(cache_key)
+    hpa.discard(cache_key)
+    landmarks.discard(cache_key)
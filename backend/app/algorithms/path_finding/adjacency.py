@@ -0,0 +1,95 @@
+from array import array
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from app.models.maze import Cell
+from app.utils.cache import LRUCache
+from app.utils.maze_file import MazeFile
+
+# Adjacency indexes by maze key, see get_adjacency
+_indexes = LRUCache(max_entries=8)
+
+# Neighbour order of every cell: right, down, left, up
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+class Adjacency:
+    """
+    Open neighbours of every cell in compressed sparse row (CSR) form.
+
+    Cells are addressed by flat index ``row * cols + col``. The open
+    neighbours of cell ``i`` are ``neighbors[offsets[i]:offsets[i + 1]]``, in
+    ``DIRECTIONS`` order; walls have no neighbours. Solvers iterate these
+    slices instead of checking bounds and walls in four directions per cell.
+
+    Both arrays are built with whole-grid numpy operations and then kept as
+    ``array('i')``, whose slices iterate faster than numpy's and take four
+    bytes per entry.
+    """
+
+    def __init__(self, maze):
+        if isinstance(maze, MazeFile):
+            grid = maze.read_region(0, 0, maze.rows, maze.cols)
+        else:
+            grid = np.array(maze, dtype=np.uint8)
+        self.rows, self.cols = grid.shape
+        size = self.rows * self.cols
+
+        is_open = grid == 0
+        index = np.arange(size, dtype=np.int32).reshape(grid.shape)
+        # Neighbour index per cell and direction, and whether it is reachable
+        neighbor = np.zeros((self.rows, self.cols, len(DIRECTIONS)), np.int32)
+        linked = np.zeros(neighbor.shape, bool)
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            # Cells that have a neighbour in this direction, and those neighbours
+            here = (
+                slice(max(0, -dr), self.rows - max(0, dr)),
+                slice(max(0, -dc), self.cols - max(0, dc)),
+            )
+            there = (
+                slice(max(0, dr), self.rows + min(0, dr)),
+                slice(max(0, dc), self.cols + min(0, dc)),
+            )
+            neighbor[here + (d,)] = index[there]
+            linked[here + (d,)] = is_open[here] & is_open[there]
+
+        linked = linked.reshape(size, len(DIRECTIONS))
+        offsets = np.zeros(size + 1, np.int32)
+        np.cumsum(linked.sum(axis=1), out=offsets[1:])
+        # Boolean indexing keeps row-major order, so DIRECTIONS order per cell
+        self.offsets = array("i", offsets.tobytes())
+        self.neighbors = array(
+            "i", neighbor.reshape(size, len(DIRECTIONS))[linked].tobytes()
+        )
+
+    def index(self, cell: Cell) -> int:
+        return cell.row * self.cols + cell.col
+
+    def cells(self, indexes: Iterable[int]) -> List[Cell]:
+        cols = self.cols
+        return [Cell(row=index // cols, col=index % cols) for index in indexes]
+
+    def path(self, came_from: Dict[int, int], end: int) -> List[Cell]:
+        """Follow ``came_from`` back from ``end`` and return the path to it."""
+        path = [end]
+        while end in came_from:
+            end = came_from[end]
+            path.append(end)
+        path.reverse()
+        return self.cells(path)
+
+
+def get_adjacency(maze, cache_key: Optional[str] = None) -> Adjacency:
+    """
+    Return the adjacency index of ``maze``, cached under ``cache_key``.
+
+    Without a key the index is built for this search alone, which costs
+    about a tenth of a microsecond per cell.
+    """
+    if cache_key is None:
+        return Adjacency(maze)
+    return _indexes.get_or_create(cache_key, lambda: Adjacency(maze))
+
+
+def discard(cache_key: str) -> None:
+    """Forget the cached index of a maze, e.g. once it was deleted."""
+    _indexes.discard(cache_key)
@@ -1,10 +1,19 @@
-from typing import List, Tuple, Dict
+from typing import Callable, List, Optional, Tuple, Dict
 from app.models.maze import Cell
+from app.algorithms.path_finding.adjacency import Adjacency
+from app.algorithms.path_finding.stats import SearchStats
+from app.utils.cancel import CancelToken
 import heapq
 
 
 def find_path(
-    maze: List[List[int]], start: Cell, end: Cell
+    maze: List[List[int]],
+    start: Cell,
+    end: Cell,
+    stats: Optional[SearchStats] = None,
+    heuristic: Optional[Callable[[Cell, Cell], int]] = None,
+    cancel: Optional[CancelToken] = None,
+    adjacency: Optional[Adjacency] = None,
 ) -> Tuple[List[Cell], List[Cell]]:
     """
     Find a path from start to end in the maze using the A* algorithm.
@@ -13,6 +22,14 @@ def find_path(
         maze: 2D grid representing the maze (0 = passage, 1 = wall)
         start: Starting cell position
         end: Target cell position
+        stats: Collects search counters when given, see ``SearchStats``
+        heuristic: Lower bound on the distance between two cells; must be
+            consistent (Manhattan distance by default, see also
+            ``landmarks.Landmarks.heuristic_to``)
+        cancel: Checked once per expanded cell; the search stops when it
+            is cancelled
+        adjacency: Neighbour index of the maze, built for this search if not
+            given (see ``adjacency.get_adjacency`` for a cached one)
 
     Returns:
         Tuple containing:
@@ -44,94 +61,85 @@ def find_path(
         )
         return [], []  # Start or end is a wall
 
-    # List to track cells visited for animation
+    if adjacency is None:
+        adjacency = Adjacency(maze)
+    offsets, neighbors = adjacency.offsets, adjacency.neighbors
+    start_index, end_index = adjacency.index(start), adjacency.index(end)
+
+    if stats is not None:
+        stats.start()
+
+    # Cells visited for animation, as flat indexes
     visited = []
 
-    # Manhattan distance heuristic
-    def heuristic(a: Cell, b: Cell) -> int:
-        return abs(a.row - b.row) + abs(a.col - b.col)
+    if heuristic is None:
+        # Manhattan distance, straight from the flat index
+        end_row, end_col = end.row, end.col
+
+        def estimate(index: int) -> int:
+            return abs(index // cols - end_row) + abs(index % cols - end_col)
+
+    else:
+
+        def estimate(index: int) -> int:
+            return heuristic(Cell(row=index // cols, col=index % cols), end)
 
     # Priority queue for A*
     open_set = []
     entry_count = 0  # Unique identifier for each entry
 
-    # For each position, which position it can most efficiently be reached from
-    came_from = {}
-
-    # For each position, the cost of getting from the start node to that position
-    g_score = {}
-    g_score[(start.row, start.col)] = 0
+    # For each cell, which cell it can most efficiently be reached from
+    came_from: Dict[int, int] = {}
 
-    # For each position, the estimated total cost from start to goal going through this position
-    f_score = {}
-    f_score[(start.row, start.col)] = heuristic(start, end)
+    # For each cell, the cost of getting from the start node to that cell
+    g_score = {start_index: 0}
 
-    # Add start to open set
-    heapq.heappush(open_set, (f_score[(start.row, start.col)], entry_count, start))
+    # Add start to open set, ordered by the estimated total cost through it
+    heapq.heappush(open_set, (estimate(start_index), entry_count, start_index))
     entry_count += 1
 
-    # Set of positions in the open set (for faster lookup)
-    open_set_hash = {(start.row, start.col)}
+    # Set of cells in the open set (for faster lookup)
+    open_set_hash = {start_index}
 
     while open_set:
-        # Get position with lowest f_score
+        # Get cell with lowest f score
         _, _, current = heapq.heappop(open_set)
-        current_pos = (current.row, current.col)
+        if stats is not None:
+            stats.pop(len(open_set) + 1)
+        if cancel is not None:
+            cancel.check()
 
         # Remove from open set
-        open_set_hash.remove(current_pos)
+        open_set_hash.remove(current)
 
-        # If we reach the end, construct the path
-        if current.row == end.row and current.col == end.col:
-            # Reconstruct path
-            path = []
-            while current_pos in came_from:
-                row, col = current_pos
-                path.append(Cell(row=row, col=col))
-                current_pos = came_from[current_pos]
-            # Add start node
-            path.append(start)
-            # Reverse to get start-to-end path
-            path.reverse()
-            return visited, path
-
-        # Add to visited list for animation
+        # Add to visited list for animation; like the other solvers, the
+        # goal counts as expanded
         visited.append(current)
 
-        # Check all four neighbors
-        for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            neighbor_row, neighbor_col = current.row + dr, current.col + dc
-
-            # Check if valid position and not a wall
-            if (
-                0 <= neighbor_row < rows
-                and 0 <= neighbor_col < cols
-                and maze[neighbor_row][neighbor_col] == 0
-            ):  # Must be a passage
-
-                neighbor_pos = (neighbor_row, neighbor_col)
-
-                # Calculate tentative g score
-                tentative_g = g_score[current_pos] + 1
-
-                # If this is a better path to this neighbor
-                if neighbor_pos not in g_score or tentative_g < g_score[neighbor_pos]:
-
-                    # Update path info
-                    came_from[neighbor_pos] = current_pos
-                    g_score[neighbor_pos] = tentative_g
-                    f = tentative_g + heuristic(
-                        Cell(row=neighbor_row, col=neighbor_col), end
+        # If we reach the end, construct the path
+        if current == end_index:
+            if stats is not None:
+                stats.finish(len(visited), len(g_score), len(open_set), reopens=True)
+            return adjacency.cells(visited), adjacency.path(came_from, current)
+
+        # Calculate tentative g score of the open neighbours
+        tentative_g = g_score[current] + 1
+        for neighbor in neighbors[offsets[current] : offsets[current + 1]]:
+            # If this is a better path to this neighbor
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                # Update path info
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+
+                if neighbor not in open_set_hash:
+                    # Add to open set
+                    entry_count += 1
+                    heapq.heappush(
+                        open_set,
+                        (tentative_g + estimate(neighbor), entry_count, neighbor),
                     )
-                    f_score[neighbor_pos] = f
-
-                    if neighbor_pos not in open_set_hash:
-                        # Add to open set
-                        entry_count += 1
-                        heapq.heappush(
-                            open_set,
-                            (f, entry_count, Cell(row=neighbor_row, col=neighbor_col)),
-                        )
-                        open_set_hash.add(neighbor_pos)
-
-    return visited, []
+                    open_set_hash.add(neighbor)
+
+    if stats is not None:
+        stats.finish(len(visited), len(g_score), 0, reopens=True)
+    return adjacency.cells(visited), []
@@ -1,10 +1,18 @@
-from typing import List, Tuple, Dict, Set, Deque
+from typing import List, Optional, Tuple, Dict, Deque
 from collections import deque
 from app.models.maze import Cell
+from app.algorithms.path_finding.adjacency import Adjacency
+from app.algorithms.path_finding.stats import SearchStats
+from app.utils.cancel import CancelToken
 
 
 def find_path(
-    maze: List[List[int]], start: Cell, end: Cell
+    maze: List[List[int]],
+    start: Cell,
+    end: Cell,
+    stats: Optional[SearchStats] = None,
+    cancel: Optional[CancelToken] = None,
+    adjacency: Optional[Adjacency] = None,
 ) -> Tuple[List[Cell], List[Cell]]:
     """
     Find a path from start to end in the maze using Breadth-First Search.
@@ -15,6 +23,11 @@ def find_path(
         maze: 2D grid representing the maze (0 = passage, 1 = wall)
         start: Starting cell position
         end: Target cell position
+        stats: Collects search counters when given, see ``SearchStats``
+        cancel: Checked once per expanded cell; the search stops when it
+            is cancelled
+        adjacency: Neighbour index of the maze, built for this search if not
+            given (see ``adjacency.get_adjacency`` for a cached one)
 
     Returns:
         Tuple containing:
@@ -38,62 +51,52 @@ def find_path(
     ):
         return [], []
 
-    # List to track cells visited for animation
+    if adjacency is None:
+        adjacency = Adjacency(maze)
+    offsets, neighbors = adjacency.offsets, adjacency.neighbors
+    start_index, end_index = adjacency.index(start), adjacency.index(end)
+
+    if stats is not None:
+        stats.start()
+
+    # Cells visited for animation, as flat indexes
     visited = []
 
     # Queue for BFS
-    queue: Deque[Cell] = deque([start])
-
-    # For each position, which position it can most efficiently be reached from
-    came_from = {}
+    queue: Deque[int] = deque([start_index])
 
-    # Set for faster duplicate checking
-    visited_set = {(start.row, start.col)}
+    # For each cell, which cell it can most efficiently be reached from
+    came_from: Dict[int, int] = {}
 
-    # Directions to explore (right, down, left, up)
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    # One flag per cell for faster duplicate checking
+    seen = bytearray(rows * cols)
+    seen[start_index] = 1
 
     while queue:
         # Get the next cell from the queue
         current = queue.popleft()
+        if stats is not None:
+            stats.pop(len(queue) + 1)
+        if cancel is not None:
+            cancel.check()
 
         visited.append(current)
 
         # If we've reached the end, reconstruct path
-        if current.row == end.row and current.col == end.col:
-            # Reconstruct path
-            path = []
-            current_pos = (current.row, current.col)
-            while current_pos in came_from:
-                row, col = current_pos
-                path.append(Cell(row=row, col=col))
-                current_pos = came_from[current_pos]
-            path.append(start)  # Add start node
-            path.reverse()  # Reverse to get start-to-end path
-            return visited, path
-
-        # Explore all four directions
-        for dr, dc in directions:
-            new_row, new_col = current.row + dr, current.col + dc
-
-            # Skip invalid positions or walls
-            if (
-                new_row < 0
-                or new_row >= rows
-                or new_col < 0
-                or new_col >= cols
-                or maze[new_row][new_col] == 1
-            ):
-                continue
-
-            neighbor_pos = (new_row, new_col)
-
-            if neighbor_pos in visited_set:
+        if current == end_index:
+            if stats is not None:
+                stats.finish(len(visited), len(came_from) + 1, len(queue))
+            return adjacency.cells(visited), adjacency.path(came_from, current)
+
+        # Explore the open neighbours (right, down, left, up)
+        for neighbor in neighbors[offsets[current] : offsets[current + 1]]:
+            if seen[neighbor]:
                 continue
 
-            visited_set.add(neighbor_pos)
-            neighbor = Cell(row=new_row, col=new_col)
+            seen[neighbor] = 1
             queue.append(neighbor)
+            came_from[neighbor] = current
 
-            came_from[neighbor_pos] = (current.row, current.col)
-    return visited, []
+    if stats is not None:
+        stats.finish(len(visited), len(came_from) + 1, 0)
+    return adjacency.cells(visited), []
@@ -0,0 +1,107 @@
+import json
+import time
+from typing import List, Optional, Tuple
+from app.algorithms.path_finding import SOLVERS, astar
+from app.algorithms.path_finding.adjacency import get_adjacency
+from app.algorithms.path_finding.landmarks import get_landmarks
+from app.algorithms.path_finding.stats import SearchStats
+from app.models.maze import Cell
+from app.utils import maze_store
+
+
+def pack_grid(maze: List[List[int]]) -> bytes:
+    """Flatten a grid of small integers to one byte per cell for a worker."""
+    return b"".join(map(bytes, maze))
+
+
+def unpack_grid(data: bytes, cols: int) -> List[List[int]]:
+    """Rebuild the grid from the output of ``pack_grid``."""
+    return [list(data[i : i + cols]) for i in range(0, len(data), cols)]
+
+
+def _cells(cells: List[Cell]) -> List[dict]:
+    return [{"row": cell.row, "col": cell.col} for cell in cells]
+
+
+def solve_item(
+    algorithm: str,
+    grid: Optional[bytes],
+    cols: int,
+    maze_id: Optional[str],
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    cluster_size: int,
+    cache_key: Optional[str],
+    collect_stats: bool = False,
+    landmarks: Optional[int] = None,
+) -> bytes:
+    """
+    Run one solver in a worker process and return its result as JSON.
+
+    The maze arrives either packed by ``pack_grid`` or as the ID of a stored
+    maze, which the worker maps itself. Only the search is timed; adjacency
+    indexes and landmark tables for ALT are cached per worker process.
+    """
+    # HPA searches an abstract graph and has no comparable counters
+    stats = SearchStats() if collect_stats and algorithm != "hpa" else None
+    start_cell = Cell(row=start[0], col=start[1])
+    end_cell = Cell(row=end[0], col=end[1])
+
+    if maze_id is not None:
+        with maze_store.open_maze(maze_id) as maze:
+            visited, path, elapsed = _solve(
+                algorithm,
+                maze,
+                start_cell,
+                end_cell,
+                cluster_size,
+                cache_key,
+                stats,
+                landmarks,
+            )
+    else:
+        visited, path, elapsed = _solve(
+            algorithm,
+            unpack_grid(grid, cols),
+            start_cell,
+            end_cell,
+            cluster_size,
+            cache_key,
+            stats,
+            landmarks,
+        )
+
+    return json.dumps(
+        {
+            "algorithm": algorithm,
+            "visited": _cells(visited),
+            "path": _cells(path),
+            "visited_count": len(visited),
+            "path_length": len(path),
+            "time_ms": elapsed * 1000,
+            "stats": stats.to_dict() if stats is not None else None,
+        },
+        separators=(",", ":"),
+    ).encode()
+
+
+def _solve(algorithm, maze, start, end, cluster_size, cache_key, stats, landmarks):
+    if algorithm == "hpa":
+        began = time.perf_counter()
+        visited, path = SOLVERS[algorithm](maze, start, end, cluster_size, cache_key)
+        return visited, path, time.perf_counter() - began
+
+    # Building the adjacency index and landmark tables is a one-off per maze,
+    # not part of the search
+    adjacency = get_adjacency(maze, cache_key)
+    if algorithm == "astar" and landmarks is not None:
+        heuristic = get_landmarks(maze, landmarks, cache_key).heuristic_to(end)
+        began = time.perf_counter()
+        visited, path = astar.find_path(
+            maze, start, end, stats, heuristic, adjacency=adjacency
+        )
+        return visited, path, time.perf_counter() - began
+
+    began = time.perf_counter()
+    visited, path = SOLVERS[algorithm](maze, start, end, stats, adjacency=adjacency)
+    return visited, path, time.perf_counter() - began
@@ -1,9 +1,17 @@
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from app.models.maze import Cell
+from app.algorithms.path_finding.adjacency import Adjacency
+from app.algorithms.path_finding.stats import SearchStats
+from app.utils.cancel import CancelToken
 
 
 def find_path(
-    maze: List[List[int]], start: Cell, end: Cell
+    maze: List[List[int]],
+    start: Cell,
+    end: Cell,
+    stats: Optional[SearchStats] = None,
+    cancel: Optional[CancelToken] = None,
+    adjacency: Optional[Adjacency] = None,
 ) -> Tuple[List[Cell], List[Cell]]:
     """
     Find a path from start to end in the maze using Depth-First Search.
@@ -12,6 +20,11 @@ def find_path(
         maze: 2D grid representing the maze (0 = passage, 1 = wall)
         start: Starting cell position
         end: Target cell position
+        stats: Collects search counters when given, see ``SearchStats``
+        cancel: Checked once per expanded cell; the search stops when it
+            is cancelled
+        adjacency: Neighbour index of the maze, built for this search if not
+            given (see ``adjacency.get_adjacency`` for a cached one)
 
     Returns:
         Tuple containing:
@@ -43,61 +56,57 @@ def find_path(
         )
         return [], []  # Start or end is a wall
 
-    # List to track cells visited for animation
+    if adjacency is None:
+        adjacency = Adjacency(maze)
+    offsets, neighbors = adjacency.offsets, adjacency.neighbors
+    start_index, end_index = adjacency.index(start), adjacency.index(end)
+
+    if stats is not None:
+        stats.start()
+
+    # Cells visited for animation, as flat indexes
     visited = []
 
     # Stack for DFS
-    stack = [start]
+    stack = [start_index]
 
-    # For each position, which position it can be reached from
-    came_from = {}
+    # For each cell, which cell it can be reached from
+    came_from: Dict[int, int] = {}
 
-    # Set for faster lookup of visited cells
-    visited_set = set()
+    # One flag per cell for faster lookup of visited cells
+    done = bytearray(rows * cols)
 
     while stack:
         # Get the top cell from the stack
         current = stack.pop()
-        current_pos = (current.row, current.col)
+        if stats is not None:
+            stats.pop(len(stack) + 1)
+        if cancel is not None:
+            cancel.check()
 
         # Skip if already visited
-        if current_pos in visited_set:
+        if done[current]:
             continue
 
         # Mark as visited
-        visited_set.add(current_pos)
+        done[current] = 1
         visited.append(current)
 
         # If we've reached the end, reconstruct path
-        if current.row == end.row and current.col == end.col:
-            path = []
-            while current_pos in came_from:
-                row, col = current_pos
-                path.append(Cell(row=row, col=col))
-                current_pos = came_from[current_pos]
-            path.append(start)  # Add start node
-            path.reverse()  # Reverse to get start-to-end path
-            return visited, path
-
-        # Explore all four directions (in reverse order for natural DFS behavior)
-        for dr, dc in [(-1, 0), (0, -1), (1, 0), (0, 1)]:  # Up, Left, Down, Right
-            new_row, new_col = current.row + dr, current.col + dc
-
-            # Check if valid (in bounds, not a wall, not visited)
-            if (
-                0 <= new_row < rows
-                and 0 <= new_col < cols
-                and maze[new_row][new_col] == 0  # Must be a passage
-                and (new_row, new_col) not in visited_set
-            ):
-
-                # Create new cell
-                neighbor = Cell(row=new_row, col=new_col)
-
-                # Add to stack
+        if current == end_index:
+            if stats is not None:
+                stats.finish(len(visited), len(came_from) + 1, len(stack))
+            return adjacency.cells(visited), adjacency.path(came_from, current)
+
+        # Push the open neighbours in reverse order (up, left, down, right),
+        # so that right is explored first
+        for neighbor in reversed(neighbors[offsets[current] : offsets[current + 1]]):
+            if not done[neighbor]:
                 stack.append(neighbor)
 
                 # Record how we got here (for path reconstruction)
-                came_from[(new_row, new_col)] = current_pos
+                came_from[neighbor] = current
 
-    return visited, []
+    if stats is not None:
+        stats.finish(len(visited), len(came_from) + 1, 0)
+    return adjacency.cells(visited), []
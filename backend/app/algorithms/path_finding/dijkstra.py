@@ -1,10 +1,18 @@
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 import heapq
 from app.models.maze import Cell
+from app.algorithms.path_finding.adjacency import Adjacency
+from app.algorithms.path_finding.stats import SearchStats
+from app.utils.cancel import CancelToken
 
 
 def find_path(
-    maze: List[List[int]], start: Cell, end: Cell
+    maze: List[List[int]],
+    start: Cell,
+    end: Cell,
+    stats: Optional[SearchStats] = None,
+    cancel: Optional[CancelToken] = None,
+    adjacency: Optional[Adjacency] = None,
 ) -> Tuple[List[Cell], List[Cell]]:
     """
     Find a path from start to end in the maze using Dijkstra's algorithm.
@@ -17,6 +25,11 @@ def find_path(
         maze: 2D grid representing the maze (0 = passage, 1 = wall)
         start: Starting cell position
         end: Target cell position
+        stats: Collects search counters when given, see ``SearchStats``
+        cancel: Checked once per expanded cell; the search stops when it
+            is cancelled
+        adjacency: Neighbour index of the maze, built for this search if not
+            given (see ``adjacency.get_adjacency`` for a cached one)
 
     Returns:
         Tuple containing:
@@ -40,7 +53,15 @@ def find_path(
     ):
         return [], []
 
-    # List to track cells visited for animation
+    if adjacency is None:
+        adjacency = Adjacency(maze)
+    offsets, neighbors = adjacency.offsets, adjacency.neighbors
+    start_index, end_index = adjacency.index(start), adjacency.index(end)
+
+    if stats is not None:
+        stats.start()
+
+    # Cells visited for animation, as flat indexes
     visited = []
 
     # Priority queue for Dijkstra
@@ -49,90 +70,65 @@ def find_path(
     entry_count = 0  # Unique identifier for entries with equal distance
 
     # Add start node to priority queue
-    heapq.heappush(pq, (0, entry_count, start))
+    heapq.heappush(pq, (0, entry_count, start_index))
     entry_count += 1
 
-    # For each position, the cost of getting from the start node to that position
-    distance = {}
-    distance[(start.row, start.col)] = 0
+    # For each cell, the cost of getting from the start node to that cell
+    distance = {start_index: 0}
 
-    # For each position, which position it can most efficiently be reached from
-    came_from = {}
+    # For each cell, which cell it can most efficiently be reached from
+    came_from: Dict[int, int] = {}
 
     # Set for faster duplicate checking
-    in_queue = {(start.row, start.col)}
+    in_queue = {start_index}
 
-    # Set of finalized nodes (where we know the shortest path)
-    finalized = set()
+    # One flag per finalized cell (where we know the shortest path)
+    finalized = bytearray(rows * cols)
 
     while pq:
         # Get the node with the smallest distance
         current_distance, _, current = heapq.heappop(pq)
-        current_pos = (current.row, current.col)
+        if stats is not None:
+            stats.pop(len(pq) + 1)
+        if cancel is not None:
+            cancel.check()
 
-        # Remove from queue lookup
-        in_queue.remove(current_pos)
+        in_queue.remove(current)
 
         # Skip if already processed
-        if current_pos in finalized:
+        if finalized[current]:
             continue
 
         # Mark as finalized
-        finalized.add(current_pos)
+        finalized[current] = 1
         visited.append(current)
 
         # If we've reached the end, reconstruct the path
-        if current.row == end.row and current.col == end.col:
-            path = []
-            while current_pos in came_from:
-                row, col = current_pos
-                path.append(Cell(row=row, col=col))
-                current_pos = came_from[current_pos]
-            path.append(start)  # Add start node
-            path.reverse()  # Reverse to get start-to-end path
-            return visited, path
-
-        # Check all four neighbors
-        for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            neighbor_row, neighbor_col = current.row + dr, current.col + dc
-
-            # Skip invalid positions or walls
-            if (
-                neighbor_row < 0
-                or neighbor_row >= rows
-                or neighbor_col < 0
-                or neighbor_col >= cols
-                or maze[neighbor_row][neighbor_col] == 1
-            ):
-                continue
-
-            neighbor_pos = (neighbor_row, neighbor_col)
-
+        if current == end_index:
+            if stats is not None:
+                stats.finish(len(visited), len(distance), len(pq), reopens=True)
+            return adjacency.cells(visited), adjacency.path(came_from, current)
+
+        # Calculate new distance (in unweighted graph, edge weight is always 1)
+        new_distance = current_distance + 1
+        for neighbor in neighbors[offsets[current] : offsets[current + 1]]:
             # Skip if already finalized
-            if neighbor_pos in finalized:
+            if finalized[neighbor]:
                 continue
 
-            # Calculate new distance (in unweighted graph, edge weight is always 1)
-            new_distance = current_distance + 1
-
             # If we found a shorter path to this neighbor
-            if neighbor_pos not in distance or new_distance < distance[neighbor_pos]:
+            if neighbor not in distance or new_distance < distance[neighbor]:
                 # Update distance and came_from
-                distance[neighbor_pos] = new_distance
-                came_from[neighbor_pos] = current_pos
+                distance[neighbor] = new_distance
+                came_from[neighbor] = current
 
                 # Add to priority queue if not already there
-                if neighbor_pos not in in_queue:
-                    heapq.heappush(
-                        pq,
-                        (
-                            new_distance,
-                            entry_count,
-                            Cell(row=neighbor_row, col=neighbor_col),
-                        ),
-                    )
+                if neighbor not in in_queue:
+                    heapq.heappush(pq, (new_distance, entry_count, neighbor))
                     entry_count += 1
-                    in_queue.add(neighbor_pos)
+                    in_queue.add(neighbor)
 
     # No path found
-    return visited, []
+    if stats is not None:
+        stats.finish(len(visited), len(distance), 0, reopens=True)
+    return adjacency.cells(visited), []
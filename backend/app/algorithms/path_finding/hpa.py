@@ -0,0 +1,296 @@
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+import heapq
+from app.models.maze import Cell
+from app.utils.cache import LRUCache
+
+Position = Tuple[int, int]
+
+# Abstract graphs by (maze key, cluster size), see find_path
+_graphs = LRUCache(max_entries=8)
+
+
+class AbstractGraph:
+    """
+    The abstract graph used by hierarchical pathfinding (HPA*).
+
+    The maze is partitioned into square clusters. Wherever two neighbouring
+    clusters share a run of open cells along their border, an entrance is
+    placed in the middle of the run: a pair of abstract nodes, one on each
+    side, joined by an edge of cost 1. Inside every cluster the entrances are
+    connected by edges weighted with their true distance within the cluster.
+
+    The graph does not keep the maze: it may be cached and shared by
+    concurrent queries, each of which passes in its own (possibly freshly
+    opened) copy of the same maze.
+    """
+
+    def __init__(self, maze: List[List[int]], cluster_size: int):
+        self.rows, self.cols = len(maze), len(maze[0])
+        self.cluster_size = cluster_size
+
+        # Abstract node -> list of (neighbour, cost)
+        self.edges: Dict[Position, List[Tuple[Position, int]]] = {}
+        # Cluster -> abstract nodes inside it
+        self.entrances: Dict[Position, List[Position]] = {}
+
+        self._build_entrances(maze)
+        # Connect the entrances of every cluster by their in-cluster distances
+        for nodes in self.entrances.values():
+            for node in nodes:
+                distances, _ = self._cluster_bfs(maze, node, set(nodes))
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.edges[node].append((other, distances[other]))
+
+    def cluster_of(self, pos: Position) -> Position:
+        return pos[0] // self.cluster_size, pos[1] // self.cluster_size
+
+    def _add_entrance(self, a: Position, b: Position) -> None:
+        for node, other in ((a, b), (b, a)):
+            if node not in self.edges:
+                self.edges[node] = []
+                self.entrances.setdefault(self.cluster_of(node), []).append(node)
+            self.edges[node].append((other, 1))
+
+    def _build_entrances(self, maze: List[List[int]]) -> None:
+        size = self.cluster_size
+
+        # Borders between horizontally adjacent clusters, one cluster row at a time
+        for c in range(size - 1, self.cols - 1, size):
+            for top in range(0, self.rows, size):
+                rows = range(top, min(top + size, self.rows))
+                self._scan_border(maze, [(r, c) for r in rows], (0, 1))
+
+        # Borders between vertically adjacent clusters
+        for r in range(size - 1, self.rows - 1, size):
+            for left in range(0, self.cols, size):
+                cols = range(left, min(left + size, self.cols))
+                self._scan_border(maze, [(r, c) for c in cols], (1, 0))
+
+    def _scan_border(
+        self, maze: List[List[int]], cells: List[Position], offset: Position
+    ) -> None:
+        """Place an entrance in the middle of every open run along a border."""
+        dr, dc = offset
+        run: List[Position] = []
+        for cell in cells + [None]:
+            if cell is not None and maze[cell[0]][cell[1]] == 0:
+                if maze[cell[0] + dr][cell[1] + dc] == 0:
+                    run.append(cell)
+                    continue
+            if run:
+                r, c = run[len(run) // 2]
+                self._add_entrance((r, c), (r + dr, c + dc))
+                run = []
+
+    def _cluster_bfs(
+        self, maze: List[List[int]], source: Position, targets: Optional[set] = None
+    ) -> Tuple[Dict[Position, int], Dict[Position, Position]]:
+        """
+        Breadth-first search restricted to the cluster containing ``source``.
+
+        Stops early once every position in ``targets`` has been reached.
+
+        Returns:
+            Tuple of (distance by position, predecessor by position)
+        """
+        size = self.cluster_size
+        top = source[0] // size * size
+        left = source[1] // size * size
+        bottom = min(top + size, self.rows)
+        right = min(left + size, self.cols)
+
+        distances = {source: 0}
+        came_from: Dict[Position, Position] = {}
+        remaining = len(targets) if targets else 0
+        queue = deque([source])
+
+        while queue:
+            r, c = queue.popleft()
+            if targets and (r, c) in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+
+            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                nr, nc = r + dr, c + dc
+                if (
+                    top <= nr < bottom
+                    and left <= nc < right
+                    and maze[nr][nc] == 0
+                    and (nr, nc) not in distances
+                ):
+                    distances[(nr, nc)] = distances[(r, c)] + 1
+                    came_from[(nr, nc)] = (r, c)
+                    queue.append((nr, nc))
+
+        return distances, came_from
+
+    def _local_path(
+        self, maze: List[List[int]], source: Position, target: Position
+    ) -> List[Position]:
+        """Shortest path from source to target without leaving their cluster."""
+        distances, came_from = self._cluster_bfs(maze, source, {target})
+        if target not in distances:
+            return []
+
+        path = [target]
+        while path[-1] != source:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
+
+    def find_path(
+        self, maze: List[List[int]], start: Cell, end: Cell
+    ) -> Tuple[List[Cell], List[Cell]]:
+        """
+        Find a path by searching the abstract graph and refining it.
+
+        Start and end are linked to the entrances of their clusters, A* runs
+        over the abstract graph, and only the chosen abstract edges are
+        expanded back into cells. Paths are near-optimal, not always shortest.
+        ``maze`` must have the contents the graph was built from.
+
+        Returns:
+            Tuple containing:
+            - Abstract nodes expanded during the search (for animation)
+            - List of cells forming the path from start to end (empty if no path)
+        """
+        source, target = (start.row, start.col), (end.row, end.col)
+
+        # Same cluster: a local search is enough when it succeeds
+        if self.cluster_of(source) == self.cluster_of(target):
+            local = self._local_path(maze, source, target)
+            if local:
+                return [start], [Cell(row=r, col=c) for r, c in local]
+
+        # Temporary edges from start, and into end, through their cluster entrances
+        extra: Dict[Position, List[Tuple[Position, int]]] = {source: []}
+        for pos in (source, target):
+            cluster_nodes = self.entrances.get(self.cluster_of(pos), [])
+            distances, _ = self._cluster_bfs(maze, pos, set(cluster_nodes))
+            for node in cluster_nodes:
+                if node not in distances:
+                    continue
+                if pos == source:
+                    extra[source].append((node, distances[node]))
+                else:
+                    extra.setdefault(node, []).append((target, distances[node]))
+
+        def neighbours(node: Position):
+            yield from self.edges.get(node, [])
+            yield from extra.get(node, [])
+
+        def heuristic(node: Position) -> int:
+            return abs(node[0] - target[0]) + abs(node[1] - target[1])
+
+        # A* over the abstract graph
+        g_score = {source: 0}
+        came_from: Dict[Position, Position] = {}
+        open_set = [(heuristic(source), 0, source)]
+        closed = set()
+        visited = []
+        entry_count = 1
+
+        while open_set:
+            _, _, node = heapq.heappop(open_set)
+            if node in closed:
+                continue
+            closed.add(node)
+            visited.append(Cell(row=node[0], col=node[1]))
+
+            if node == target:
+                break
+
+            for neighbour, cost in neighbours(node):
+                tentative_g = g_score[node] + cost
+                if tentative_g < g_score.get(neighbour, float("inf")):
+                    g_score[neighbour] = tentative_g
+                    came_from[neighbour] = node
+                    heapq.heappush(
+                        open_set,
+                        (tentative_g + heuristic(neighbour), entry_count, neighbour),
+                    )
+                    entry_count += 1
+
+        if target not in closed:
+            return visited, []
+
+        abstract_path = [target]
+        while abstract_path[-1] != source:
+            abstract_path.append(came_from[abstract_path[-1]])
+        abstract_path.reverse()
+
+        # Refine: intra-cluster edges become local paths, entrance edges are adjacent
+        path = [source]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            if self.cluster_of(a) == self.cluster_of(b):
+                path.extend(self._local_path(maze, a, b)[1:])
+            else:
+                path.append(b)
+
+        return visited, [Cell(row=r, col=c) for r, c in path]
+
+
+def find_path(
+    maze: List[List[int]],
+    start: Cell,
+    end: Cell,
+    cluster_size: int = 16,
+    cache_key: Optional[str] = None,
+) -> Tuple[List[Cell], List[Cell]]:
+    """
+    Find a path from start to end using hierarchical pathfinding (HPA*).
+
+    Building the abstract graph costs about one pass over the maze. With a
+    ``cache_key`` the graph is kept and reused by later queries on the same
+    maze, which then only search the small abstract graph.
+
+    Args:
+        maze: 2D grid representing the maze (0 = passage, 1 = wall)
+        start: Starting cell position
+        end: Target cell position
+        cluster_size: Side length of a cluster, in grid cells
+        cache_key: Identifies the maze contents for caching the abstract graph
+
+    Returns:
+        Tuple containing:
+        - Abstract nodes expanded during the search (for animation)
+        - List of cells forming the path from start to end (empty if no path)
+    """
+    rows, cols = len(maze), len(maze[0])
+
+    # Check if start or end are invalid or in walls
+    if (
+        start.row < 0
+        or start.row >= rows
+        or start.col < 0
+        or start.col >= cols
+        or end.row < 0
+        or end.row >= rows
+        or end.col < 0
+        or end.col >= cols
+        or maze[start.row][start.col] == 1
+        or maze[end.row][end.col] == 1
+    ):
+        return [], []
+
+    if cache_key is None:
+        graph = AbstractGraph(maze, cluster_size)
+    else:
+        graph = _graphs.get_or_create(
+            (cache_key, cluster_size), lambda: AbstractGraph(maze, cluster_size)
+        )
+
+    return graph.find_path(maze, start, end)
+
+
+def is_cached(cache_key: str, cluster_size: int = 16) -> bool:
+    """Whether queries on this maze would reuse a cached abstract graph."""
+    return (cache_key, cluster_size) in _graphs
+
+
+def discard(cache_key: str) -> None:
+    """Forget the cached graphs of a maze, for every cluster size."""
+    _graphs.discard_where(lambda key: key[0] == cache_key)
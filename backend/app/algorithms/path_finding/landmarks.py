@@ -0,0 +1,118 @@
+from array import array
+from collections import deque
+from typing import Callable, List, Optional
+import numpy as np
+from app.models.maze import Cell
+from app.utils.cache import LRUCache
+
+# Landmark tables by (maze key, landmark count), see get_landmarks
+_tables = LRUCache(max_entries=8)
+
+UNREACHABLE = -1
+
+
+class Landmarks:
+    """
+    BFS distance tables from a few landmark cells, for ALT heuristics.
+
+    For any landmark L the triangle inequality gives
+    ``dist(a, b) >= |dist(L, b) - dist(L, a)|``, a lower bound that knows
+    about the walls. Landmarks are spread out by farthest-point selection:
+    each new one is the open cell farthest from those already chosen, so the
+    bounds are tight for queries heading towards or away from the edges.
+    """
+
+    def __init__(self, maze: List[List[int]], count: int):
+        self.rows, self.cols = len(maze), len(maze[0])
+        # One byte per cell, 1 = open, read once so later passes avoid the grid
+        self._open = bytes(cell == 0 for row in maze for cell in row)
+        self.landmarks: List[int] = []
+        self.tables: List[array] = []
+
+        first = self._open.find(1)
+        if first < 0:
+            return
+
+        # Distance from every cell to the nearest landmark so far. Landmarks
+        # all lie in the component of the first open cell, so cells outside
+        # it stay unreachable (-1) and are never chosen.
+        min_distance = np.frombuffer(self._bfs(first), dtype=np.int32)
+        for _ in range(count):
+            landmark = int(min_distance.argmax())
+            if landmark in self.landmarks:
+                break
+            table = self._bfs(landmark)
+            self.landmarks.append(landmark)
+            self.tables.append(table)
+            min_distance = np.minimum(min_distance, np.frombuffer(table, np.int32))
+
+    def _bfs(self, source: int) -> array:
+        """Distances from flat index ``source`` to every cell (-1 if unreachable)."""
+        cols, is_open = self.cols, self._open
+        size = len(is_open)
+        distance = array("i", [UNREACHABLE]) * size
+        distance[source] = 0
+        queue = deque([source])
+        while queue:
+            index = queue.popleft()
+            next_distance = distance[index] + 1
+            col = index % cols
+            for neighbor in (
+                index + 1 if col + 1 < cols else -1,
+                index + cols,
+                index - 1 if col > 0 else -1,
+                index - cols,
+            ):
+                if (
+                    0 <= neighbor < size
+                    and is_open[neighbor]
+                    and distance[neighbor] == UNREACHABLE
+                ):
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
+        return distance
+
+    def heuristic_to(self, end: Cell) -> Callable[[Cell, Cell], int]:
+        """
+        Build an A* heuristic for queries ending at ``end``.
+
+        The result is the larger of the Manhattan distance and the landmark
+        bounds; both are consistent, so A* still finds shortest paths.
+        """
+        cols = self.cols
+        goal = end.row * cols + end.col
+        # Landmarks that cannot reach the goal give no bound
+        pairs = [
+            (table, table[goal]) for table in self.tables if table[goal] != UNREACHABLE
+        ]
+
+        def heuristic(a: Cell, b: Cell) -> int:
+            bound = abs(a.row - b.row) + abs(a.col - b.col)
+            index = a.row * cols + a.col
+            for table, goal_distance in pairs:
+                distance = table[index]
+                if distance != UNREACHABLE:
+                    bound = max(bound, abs(goal_distance - distance))
+            return bound
+
+        return heuristic
+
+
+def get_landmarks(
+    maze: List[List[int]], count: int, cache_key: Optional[str] = None
+) -> Landmarks:
+    """
+    Return the landmark tables of ``maze``, cached under ``cache_key``.
+
+    Building them costs ``count + 1`` breadth-first searches over the maze;
+    with a ``cache_key`` that cost is paid once per maze, and every later
+    query only does table lookups.
+    """
+    if cache_key is None:
+        return Landmarks(maze, count)
+    return _tables.get_or_create((cache_key, count), lambda: Landmarks(maze, count))
+
+
+def discard(cache_key: str) -> None:
+    """Forget the cached tables of a maze, for every landmark count."""
+    _tables.discard_where(lambda key: key[0] == cache_key)
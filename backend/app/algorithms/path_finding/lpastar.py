@@ -0,0 +1,148 @@
+import heapq
+from typing import Iterable, List, Optional, Tuple
+from app.models.maze import Cell
+from app.utils.cancel import CancelToken
+
+INF = float("inf")
+
+
+class LPAStar:
+    """
+    Lifelong Planning A* on a grid whose walls change between searches.
+
+    Every cell keeps ``g``, its distance found so far, and ``rhs``, the
+    one-step lookahead ``min(g(neighbour) + 1)``. A cell is consistent when
+    both agree; only inconsistent cells are queued. Flipping a wall makes
+    just that cell and its neighbours inconsistent, and the next search
+    repairs the distances that depend on them instead of starting over, so
+    replanning cost follows the size of the change rather than of the maze.
+
+    Cells are addressed by flat index ``row * cols + col``.
+    """
+
+    def __init__(self, maze: List[List[int]], start: Cell, end: Cell):
+        self.rows, self.cols = len(maze), len(maze[0])
+        # Private copy of the grid, one byte per cell (1 = wall)
+        self.walls = bytearray(cell != 0 for row in maze for cell in row)
+        self.start = start.row * self.cols + start.col
+        self.end = end.row * self.cols + end.col
+
+        size = self.rows * self.cols
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.rhs[self.start] = 0
+        # Entries are (key, cell); outdated entries are skipped when popped
+        self.queue = [(self._key(self.start), self.start)]
+
+    def _heuristic(self, index: int) -> int:
+        row, col = divmod(index, self.cols)
+        end_row, end_col = divmod(self.end, self.cols)
+        return abs(row - end_row) + abs(col - end_col)
+
+    def _key(self, index: int) -> Tuple[float, float]:
+        best = min(self.g[index], self.rhs[index])
+        return (best + self._heuristic(index), best)
+
+    def _neighbors(self, index: int) -> Iterable[int]:
+        """Open cells next to ``index``."""
+        row, col = divmod(index, self.cols)
+        walls = self.walls
+        if col + 1 < self.cols and not walls[index + 1]:
+            yield index + 1
+        if row + 1 < self.rows and not walls[index + self.cols]:
+            yield index + self.cols
+        if col > 0 and not walls[index - 1]:
+            yield index - 1
+        if row > 0 and not walls[index - self.cols]:
+            yield index - self.cols
+
+    def _adjacent(self, index: int) -> Iterable[int]:
+        """All cells next to ``index``, walls included."""
+        row, col = divmod(index, self.cols)
+        if col + 1 < self.cols:
+            yield index + 1
+        if row + 1 < self.rows:
+            yield index + self.cols
+        if col > 0:
+            yield index - 1
+        if row > 0:
+            yield index - self.cols
+
+    def _update(self, index: int) -> None:
+        """Recompute ``rhs`` of a cell and queue it if it became inconsistent."""
+        if index != self.start:
+            if self.walls[index]:
+                self.rhs[index] = INF
+            else:
+                g = self.g
+                self.rhs[index] = min(
+                    (g[n] + 1 for n in self._neighbors(index)), default=INF
+                )
+        if self.g[index] != self.rhs[index]:
+            heapq.heappush(self.queue, (self._key(index), index))
+
+    def toggle(self, row: int, col: int) -> None:
+        """Flip a cell between wall and passage."""
+        index = row * self.cols + col
+        self.walls[index] ^= 1
+        self._update(index)
+        # Neighbours may have been reached through the cell, or now can be
+        for neighbor in self._adjacent(index):
+            self._update(neighbor)
+
+    def find_path(
+        self, cancel: Optional[CancelToken] = None
+    ) -> Tuple[List[Cell], List[Cell]]:
+        """
+        Bring the distances up to date and return the shortest path.
+
+        Args:
+            cancel: Checked once per expanded cell. A cancelled search leaves
+                the planner valid, and the next call carries on from there.
+
+        Returns:
+            Tuple containing:
+            - Cells expanded by this search only (for animation)
+            - List of cells forming the path from start to end (empty if no path)
+        """
+        g, rhs, queue, end = self.g, self.rhs, self.queue, self.end
+        expanded = []
+
+        while queue and (queue[0][0] < self._key(end) or rhs[end] != g[end]):
+            if cancel is not None:
+                cancel.check()
+            key, index = heapq.heappop(queue)
+            # Skip entries for cells that were fixed or requeued since
+            if g[index] == rhs[index] or key != self._key(index):
+                continue
+
+            expanded.append(index)
+            if g[index] > rhs[index]:
+                # Overconsistent: the cell got closer, settle it
+                g[index] = rhs[index]
+            else:
+                # Underconsistent: a route through it was cut, re-derive it
+                g[index] = INF
+                self._update(index)
+            for neighbor in self._neighbors(index):
+                self._update(neighbor)
+
+        return [self._cell(index) for index in expanded], self._path()
+
+    def _path(self) -> List[Cell]:
+        """Follow decreasing ``g`` from the end back to the start."""
+        g = self.g
+        if g[self.end] == INF:
+            return []
+
+        path = [self.end]
+        index = self.end
+        while index != self.start:
+            index = min(self._neighbors(index), key=g.__getitem__)
+            path.append(index)
+        path.reverse()
+        return [self._cell(index) for index in path]
+
+    def _cell(self, index: int) -> Cell:
+        row, col = divmod(index, self.cols)
+        return Cell(row=row, col=col)
@@ -0,0 +1,102 @@
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator, Optional
+from app.algorithms.path_finding.lpastar import LPAStar
+from app.utils import cost
+
+
+class EditSessions:
+    """
+    The LPA* planners of editing sessions, held in this worker process.
+
+    A planner takes about ``cost.EDIT_SESSION_BYTES_PER_CELL`` per maze cell,
+    so sessions are bounded by their total size rather than their number:
+    adding one drops the least recently used until all fit in ``max_bytes``.
+    Sessions not used for ``ttl_seconds`` are dropped whenever the store is
+    accessed. Replanning mutates a planner, so each has its own lock.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.bytes = 0
+        # Session ID -> (planner, lock, size, last used), in last-used order
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def size_of(rows: int, cols: int) -> int:
+        """Bytes held by the planner of a ``rows`` x ``cols`` maze."""
+        return rows * cols * cost.EDIT_SESSION_BYTES_PER_CELL
+
+    def _drop_oldest(self) -> None:
+        _, (_, _, size, _) = self._sessions.popitem(last=False)
+        self.bytes -= size
+
+    def _expire(self, now: float) -> None:
+        # Sessions are kept in last-used order, so expired ones come first
+        while self._sessions:
+            _, (_, _, _, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.ttl_seconds:
+                break
+            self._drop_oldest()
+
+    def add(self, session_id: str, planner: LPAStar) -> None:
+        """Keep ``planner``, dropping old sessions to make room for it."""
+        size = self.size_of(planner.rows, planner.cols)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            while self._sessions and self.bytes + size > self.max_bytes:
+                self._drop_oldest()
+            self._sessions[session_id] = (planner, Lock(), size, now)
+            self.bytes += size
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[Optional[LPAStar]]:
+        """
+        Yield the planner of ``session_id`` while holding its lock.
+
+        Yields None for unknown or expired sessions.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                planner, lock, size, _ = entry
+                self._sessions[session_id] = (planner, lock, size, now)
+
+        if entry is None:
+            yield None
+            return
+        with lock:
+            yield planner
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self.bytes -= entry[2]
+
+
+_sessions: Optional[EditSessions] = None
+
+
+def get_edit_sessions() -> EditSessions:
+    """
+    Return this process's editing sessions.
+
+    ``EDIT_SESSIONS_MAX_BYTES`` (1 GiB by default) bounds their total size
+    and ``EDIT_SESSION_TTL`` (seconds, 1800 by default) their idle time.
+    """
+    global _sessions
+    if _sessions is None:
+        _sessions = EditSessions(
+            max_bytes=int(os.environ.get("EDIT_SESSIONS_MAX_BYTES", 2**30)),
+            ttl_seconds=float(os.environ.get("EDIT_SESSION_TTL", 1800)),
+        )
+    return _sessions
@@ -0,0 +1,77 @@
+import time
+
+
+class SearchStats:
+    """
+    Counters filled in by a solver when one is passed as ``stats``.
+
+    Solvers only touch the counters behind ``if stats is not None``, once per
+    entry taken off the frontier (``pop``); totals that follow from the
+    search's own bookkeeping are derived when it finishes. Without ``stats``
+    a search does no extra work beyond that check.
+
+    Attributes:
+        expanded: Nodes taken off the frontier and processed
+        generated: Distinct cells added to the frontier
+        reopened: Cells pushed again after their cost improved
+        peak_frontier: Largest frontier size (queue, stack or heap)
+        pushes: Frontier insertions (heap pushes for A* and Dijkstra)
+        pops: Frontier removals, including stale entries that were skipped
+        elapsed_ms: Wall time of the search
+    """
+
+    __slots__ = (
+        "expanded",
+        "generated",
+        "reopened",
+        "peak_frontier",
+        "pushes",
+        "pops",
+        "elapsed_ms",
+        "_started",
+    )
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.reopened = 0
+        self.peak_frontier = 0
+        self.pushes = 0
+        self.pops = 0
+        self.elapsed_ms = 0.0
+        self._started = time.perf_counter()
+
+    def start(self) -> None:
+        """Reset the clock at the start of the search."""
+        self._started = time.perf_counter()
+
+    def pop(self, frontier: int) -> None:
+        """Count a frontier removal; ``frontier`` is the size before it."""
+        self.pops += 1
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+
+    def finish(
+        self, expanded: int, generated: int, frontier: int, reopens: bool = False
+    ) -> None:
+        """
+        Record the totals of a finished search.
+
+        Every entry pushed was either popped or is still on the frontier, so
+        pushes follow from the pops and the final ``frontier`` size. With
+        ``reopens`` the solver pushes a cell again only when its cost
+        improves, so every push beyond the first per cell is a reopening.
+        """
+        self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self.expanded = expanded
+        self.generated = generated
+        self.pushes = self.pops + frontier
+        if reopens:
+            self.reopened = self.pushes - generated
+
+    def to_dict(self) -> dict:
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if not name.startswith("_")
+        }
@@ -1,59 +1,190 @@
-from fastapi import APIRouter, HTTPException
+from contextlib import contextmanager
+from typing import Annotated, Iterator, List, Optional, Union
+from fastapi import APIRouter, Header, HTTPException, Query
 from app.models.linkedlist import (
+    BulkLoadRequest,
     LinkedListOperationRequest,
     AddNodeRequest,
     RemoveNodeRequest,
     RemoveNodeByValueRequest,
+    RemoveNodeByIdRequest,
     ReverseListRequest,
     ConnectListsRequest,
+    LinkedListBatchRequest,
+    LinkedListBatchResponse,
+    LinkedListDelta,
+    LinkedListInfo,
+    LinkedListPage,
     LinkedListVisualizationData,
+    ListRequest,
     SortListRequest,
 )
 from app.algorithms.linkedlist_manager.linkedlist import LinkedListManager
+from app.algorithms.linkedlist_manager.store import get_store
 
 router = APIRouter()
-list_manager = LinkedListManager()
 
+# Every client keeps its own lists, addressed by this header. It has no
+# default: a shared fallback would let clients change each other's lists.
+SessionId = Annotated[Optional[str], Header(alias="X-Session-Id", max_length=128)]
 
-@router.post("/reset", response_model=LinkedListVisualizationData)
-async def reset_linked_list(request: LinkedListOperationRequest):
+# Full lists, or only the changes when the client asks for a diff
+LinkedListResponse = Union[LinkedListVisualizationData, LinkedListDelta]
+
+
+def _base_version(request: LinkedListOperationRequest) -> Optional[int]:
+    """The version a diff is computed against, or None for full lists."""
+    return request.baseVersion if request.diff else None
+
+
+@contextmanager
+def _session(session_id: str) -> Iterator[LinkedListManager]:
+    """
+    Open the session's lists, turning manager errors into HTTP errors.
+
+    Store access blocks (SQLite waits on file locks, the memory store on its
+    shard locks), so the endpoints are plain functions that FastAPI runs in
+    its threadpool.
+    """
+    if not session_id:
+        raise HTTPException(status_code=400, detail="X-Session-Id header is required")
+    with get_store().session(session_id) as list_manager:
+        try:
+            yield list_manager
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=e.args[0])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/reset", response_model=LinkedListResponse)
+def reset_linked_list(
+    request: LinkedListOperationRequest, session_id: SessionId = None
+):
     """Reset the linked list to default values."""
-    return list_manager.reset(request.listType)
+    with _session(session_id) as list_manager:
+        return list_manager.reset(request.listType, _base_version(request))
 
 
-@router.post("/add-node", response_model=LinkedListVisualizationData)
-async def add_node(request: AddNodeRequest):
+@router.post("/add-node", response_model=LinkedListResponse)
+def add_node(request: AddNodeRequest, session_id: SessionId = None):
     """Add a node to the linked list."""
-    return list_manager.add_node(request.listType, request.value, request.listId)
+    with _session(session_id) as list_manager:
+        return list_manager.add_node(
+            request.listType, request.value, request.listId, _base_version(request)
+        )
 
 
-@router.post("/remove-node", response_model=LinkedListVisualizationData)
-async def remove_node(request: RemoveNodeRequest):
+@router.post("/remove-node", response_model=LinkedListResponse)
+def remove_node(request: RemoveNodeRequest, session_id: SessionId = None):
     """Remove the last node from the linked list."""
-    return list_manager.remove_last_node(request.listType, request.listId)
+    with _session(session_id) as list_manager:
+        return list_manager.remove_last_node(
+            request.listType, request.listId, _base_version(request)
+        )
 
 
-@router.post("/remove-node-by-value", response_model=LinkedListVisualizationData)
-async def remove_node_by_value(request: RemoveNodeByValueRequest):
+@router.post("/remove-node-by-value", response_model=LinkedListResponse)
+def remove_node_by_value(
+    request: RemoveNodeByValueRequest, session_id: SessionId = None
+):
     """Remove a node with the specified value from the linked list."""
-    return list_manager.remove_node_by_value(
-        request.listType, request.value, request.listId
-    )
+    with _session(session_id) as list_manager:
+        return list_manager.remove_node_by_value(
+            request.listType, request.value, request.listId, _base_version(request)
+        )
+
+
+@router.post("/remove-node-by-id", response_model=LinkedListResponse)
+def remove_node_by_id(request: RemoveNodeByIdRequest, session_id: SessionId = None):
+    """Remove the node with the specified ID from the linked list."""
+    with _session(session_id) as list_manager:
+        return list_manager.remove_node_by_id(
+            request.listType, request.nodeId, request.listId, _base_version(request)
+        )
 
 
-@router.post("/reverse", response_model=LinkedListVisualizationData)
-async def reverse_list(request: ReverseListRequest):
+@router.post("/reverse", response_model=LinkedListResponse)
+def reverse_list(request: ReverseListRequest, session_id: SessionId = None):
     """Reverse the linked list."""
-    return list_manager.reverse_list(request.listType, request.listId)
+    with _session(session_id) as list_manager:
+        return list_manager.reverse_list(
+            request.listType, request.listId, _base_version(request)
+        )
 
 
-@router.post("/connect", response_model=LinkedListVisualizationData)
-async def connect_lists(request: ConnectListsRequest):
+@router.post("/connect", response_model=LinkedListResponse)
+def connect_lists(request: ConnectListsRequest, session_id: SessionId = None):
     """Connect or merge two linked lists."""
-    return list_manager.connect_lists(request.listType, request.sorted)
+    with _session(session_id) as list_manager:
+        return list_manager.connect_lists(
+            request.listType,
+            request.sorted,
+            _base_version(request),
+            request.targetId,
+            request.sourceId,
+        )
 
 
-@router.post("/sort", response_model=LinkedListVisualizationData)
-async def sort_list(request: SortListRequest):
+@router.post("/sort", response_model=LinkedListResponse)
+def sort_list(request: SortListRequest, session_id: SessionId = None):
     """Sort a single linked list by node values."""
-    return list_manager.sort_list(request.listType, request.listId)
+    with _session(session_id) as list_manager:
+        return list_manager.sort_list(
+            request.listType, request.listId, _base_version(request)
+        )
+
+
+@router.post("/batch", response_model=LinkedListBatchResponse)
+def apply_batch(request: LinkedListBatchRequest, session_id: SessionId = None):
+    """Apply a sequence of operations atomically and return the final state."""
+    with _session(session_id) as list_manager:
+        return list_manager.apply_batch(
+            request.listType, request.operations, request.diffs
+        )
+
+
+@router.get("/lists", response_model=List[LinkedListInfo])
+def get_lists(session_id: SessionId = None):
+    """List the names and sizes of all lists."""
+    with _session(session_id) as list_manager:
+        return list_manager.get_lists()
+
+
+@router.post("/create-list", response_model=LinkedListResponse)
+def create_list(request: ListRequest, session_id: SessionId = None):
+    """Create a new, empty named list."""
+    with _session(session_id) as list_manager:
+        return list_manager.create_list(
+            request.listType, request.listId, _base_version(request)
+        )
+
+
+@router.post("/delete-list", response_model=LinkedListResponse)
+def delete_list(request: ListRequest, session_id: SessionId = None):
+    """Delete a named list and its nodes."""
+    with _session(session_id) as list_manager:
+        return list_manager.delete_list(
+            request.listType, request.listId, _base_version(request)
+        )
+
+
+@router.post("/bulk-load", response_model=LinkedListInfo)
+def bulk_load(request: BulkLoadRequest, session_id: SessionId = None):
+    """Build a large array-backed list from values, replacing one of that name."""
+    with _session(session_id) as list_manager:
+        return list_manager.bulk_load(
+            request.listId, request.values, request.shuffle, request.seed
+        )
+
+
+@router.get("/bulk/{list_id}", response_model=LinkedListPage)
+def get_bulk_page(
+    list_id: str,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    session_id: SessionId = None,
+):
+    """Traverse a page of a bulk-loaded list."""
+    with _session(session_id) as list_manager:
+        return list_manager.get_page(list_id, offset, limit)
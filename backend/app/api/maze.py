@@ -1,31 +1,230 @@
-from fastapi import APIRouter, HTTPException
-from app.models.maze import MazeGenerationRequest, MazeResponse
-from app.algorithms.maze_generator import (
-    backtracking,
-    prim,
-    kruskal,
-    eller,
-    wilson,
+import asyncio
+import hashlib
+import json
+import random
+from typing import Annotated, Awaitable, Dict, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from app.models.maze import (
+    BatchGenerationRequest,
+    BatchGenerationResponse,
+    MazeGenerationRequest,
+    MazePoolStats,
+    MazeResponse,
+    StoredMazeInfo,
+    StoredMazeRequest,
+    Cell,
 )
+from app.models.viewport import MazeViewport, ViewportRequest
+from app.algorithms.maze_generator import FEATURES, GENERATORS, tiled, batch
+from app.algorithms.path_finding import SOLVERS, discard_cached, hpa
+from app.algorithms.path_finding.adjacency import get_adjacency
+from app.utils import cost, maze_store
+from app.utils.cache import LRUCache
+from app.utils.cancel import CancelToken, run_cancellable
+from app.utils.frames import FrameBudgetRecorder, NullRecorder, SnapshotRecorder
+from app.utils.grid_json import maze_response
+from app.utils.maze_file import BITS, MazeFile
+from app.utils.maze_pool import get_maze_pool
+from app.utils.pool import get_process_pool, worker_count
+from app.utils.viewport import clip_overlay, read_viewport
 
 router = APIRouter()
 
+# Largest downsampled window a viewport request may return
+MAX_VIEWPORT_CELLS = 512 * 512
+
+# Upper bound on the cells of all mazes in one batch
+MAX_BATCH_CELLS = 16_000_000
+
+# Bump when a generator changes its output for a given seed, so that cached
+# GET responses are not revalidated against the old ETags
+GENERATION_VERSION = 1
+
+# Seconds browsers and proxies may reuse a seeded GET response
+CACHE_MAX_AGE = 24 * 60 * 60
+
+# Search results on stored mazes, keyed by (maze_id, algorithm, start, end)
+_overlays = LRUCache(max_entries=16)
+
 
 @router.post("/generate", response_model=MazeResponse)
-async def generate_maze(request: MazeGenerationRequest):
-    """Generate a maze using the specified algorithm."""
-
-    # Select algorithm based on request
-    if request.algorithm.value == "backtracking":
-        maze, steps = backtracking.generate(request.rows, request.cols)
-    elif request.algorithm.value == "prim":
-        maze, steps = prim.generate(request.rows, request.cols)
-    elif request.algorithm.value == "kruskal":
-        maze, steps = kruskal.generate(request.rows, request.cols)
-    elif request.algorithm.value == "eller":
-        maze, steps = eller.generate(request.rows, request.cols)
-    elif request.algorithm.value == "wilson":
-        maze, steps = wilson.generate(request.rows, request.cols)
+async def generate_maze(request: MazeGenerationRequest, http_request: Request):
+    """
+    Generate a maze using the specified algorithm.
+
+    The request is priced before any work starts, see ``app.utils.cost``.
+    Over budget, snapshots are downgraded to delta frames and frames to no
+    steps (unless ``allow_downgrade`` is false); the ``X-Maze-Steps`` header
+    names the output that was sent.
+
+    Unseeded requests for a preset configuration are served from the pool
+    of pre-generated mazes when it has one ready, see ``app.utils.maze_pool``.
+    """
+    if (
+        request.seed is None
+        and request.tile_size is None
+        and request.max_frames is None
+        and request.steps in (None, cost.SNAPSHOTS)
+    ):
+        body = get_maze_pool().take(
+            (
+                request.rows,
+                request.cols,
+                request.algorithm.value,
+                request.maze_type.value,
+            )
+        )
+        if body is not None:
+            return Response(
+                body,
+                media_type="application/json",
+                headers={"X-Maze-Steps": cost.SNAPSHOTS, "X-Maze-Pool": "hit"},
+            )
+
+    output = _plan(request)
+    return await _respond(request, output, http_request, {"X-Maze-Steps": output})
+
+
+@router.get("/generate", response_model=MazeResponse)
+async def get_generated_maze(
+    request: Annotated[MazeGenerationRequest, Query()],
+    http_request: Request,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    """
+    Generate a seeded maze, cacheable by browsers and proxies.
+
+    The maze is fully determined by the parameters, so the response gets a
+    strong ETag and ``Cache-Control``. A matching ``If-None-Match`` is
+    answered with 304 before anything is generated.
+    """
+    if request.seed is None:
+        raise HTTPException(
+            status_code=400,
+            detail="GET generation needs a seed, use POST for random mazes",
+        )
+
+    output = _plan(request)
+    headers = {
+        "ETag": _etag(request, output),
+        "Cache-Control": f"public, max-age={CACHE_MAX_AGE}",
+        "X-Maze-Steps": output,
+    }
+    if if_none_match is not None and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    return await _respond(request, output, http_request, headers)
+
+
+def _plan(request: MazeGenerationRequest) -> str:
+    """
+    Pick the output mode within budget, see ``cost.plan_generation``.
+
+    Without an explicit ``steps``, requests with ``max_frames`` ask for delta
+    frames, and tiled ones for no steps: a full grid per stitch is rarely
+    affordable at the sizes tiling is for.
+    """
+    if request.steps is not None:
+        requested = request.steps
+    elif request.max_frames is not None:
+        requested = cost.FRAMES
+    elif request.tile_size is not None:
+        requested = cost.NO_STEPS
+    else:
+        requested = cost.SNAPSHOTS
+    try:
+        output, _ = cost.plan_generation(
+            request.rows,
+            request.cols,
+            request.algorithm.value,
+            request.maze_type.value,
+            requested,
+            request.tile_size,
+            request.max_frames,
+            request.keyframe_interval,
+            request.allow_downgrade,
+        )
+    except cost.OverBudget as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    return output
+
+
+async def _respond(
+    request: MazeGenerationRequest,
+    output: str,
+    http_request: Request,
+    headers: Dict[str, str],
+):
+    # Runs off the event loop and stops early if the client goes away
+    maze, steps = await run_cancellable(
+        http_request, lambda cancel: _generate(request, output, cancel)
+    )
+
+    # Grids are encoded straight to bytes, see app.utils.grid_json
+    if output == cost.FRAMES:
+        return maze_response(maze, [], frames=steps, headers=headers)
+
+    return maze_response(maze, steps, headers=headers)
+
+
+def _etag(request: MazeGenerationRequest, output: str) -> str:
+    """
+    Strong ETag of a seeded maze: a hash of everything that shapes the body.
+
+    ``output`` is included because it depends on the server's budgets, and
+    ``GENERATION_VERSION`` so that changed generators invalidate old copies.
+    """
+    parameters = request.model_dump(mode="json")
+    parameters.update(output=output, version=GENERATION_VERSION)
+    digest = hashlib.blake2b(
+        json.dumps(parameters, sort_keys=True).encode(), digest_size=16
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """``If-None-Match`` uses the weak comparison, so ``W/`` is ignored."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def _generate(request: MazeGenerationRequest, output: str, cancel: CancelToken):
+    """Run the requested generator; called in the threadpool."""
+
+    # Budgeted requests get delta frames instead of full snapshots
+    if output == cost.FRAMES:
+        recorder = FrameBudgetRecorder(
+            request.max_frames or cost.DEFAULT_MAX_FRAMES, request.keyframe_interval
+        )
+    elif output == cost.NO_STEPS:
+        recorder = NullRecorder()
+    else:
+        recorder = SnapshotRecorder()
+
+    # A per-request generator keeps seeded requests reproducible
+    rng = random.Random(request.seed)
+
+    # Tiles are generated in parallel, see FEATURES for the algorithms that can
+    if request.tile_size is not None:
+        maze, steps = tiled.generate(
+            request.rows,
+            request.cols,
+            request.algorithm.value,
+            request.tile_size,
+            seed=rng.getrandbits(64),
+            recorder=recorder,
+            cancel=cancel,
+        )
+    elif request.algorithm.value in GENERATORS:
+        maze, steps = GENERATORS[request.algorithm.value](
+            request.rows, request.cols, recorder, rng, cancel=cancel
+        )
     else:
         raise HTTPException(
             status_code=400,
@@ -36,10 +235,375 @@ async def generate_maze(request: MazeGenerationRequest):
     if request.maze_type.value == "loop":
         from app.utils.helpers import add_loops
 
-        maze = add_loops(maze)
+        maze = add_loops(maze, rng)
+    elif request.maze_type.value == "braid":
+        from app.utils.helpers import add_braids
+
+        maze = add_braids(maze, rng)
+
+    return maze, steps
+
+
+@router.get("/pool", response_model=MazePoolStats)
+async def get_pool_stats():
+    """Hit rate, refill lag and contents of the pre-generated maze pools."""
+    return get_maze_pool().stats()
+
+
+@router.post("/batch", response_model=BatchGenerationResponse)
+async def generate_batch(request: BatchGenerationRequest):
+    """Generate many mazes in parallel over the process pool, without steps."""
+
+    if request.specs is not None and request.count is None:
+        specs = request.specs
+    elif request.count is not None and request.template is not None:
+        # Each maze gets its own seed, drawn from the template's seed
+        rng = random.Random(request.template.seed)
+        specs = [
+            request.template.model_copy(update={"seed": rng.getrandbits(63)})
+            for _ in range(request.count)
+        ]
+    else:
+        raise HTTPException(
+            status_code=400, detail="Provide either specs, or count and template"
+        )
+
+    if sum(spec.rows * spec.cols for spec in specs) > MAX_BATCH_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch cannot have more than {MAX_BATCH_CELLS} cells",
+        )
+
+    # Mazes are spread over the pool, so the batch takes about its share of
+    # the time; each worker holds one maze at a time, the server all of them
+    # encoded
+    estimates = [
+        cost.estimate_generation(
+            spec.rows,
+            spec.cols,
+            spec.algorithm.value,
+            spec.maze_type.value,
+            cost.NO_STEPS,
+        )
+        for spec in specs
+    ]
+    try:
+        cost.check(
+            cost.Estimate(
+                sum(e.seconds for e in estimates) / worker_count(),
+                max(e.bytes for e in estimates) * worker_count()
+                + sum(spec.rows * spec.cols for spec in specs)
+                * cost.GRID_JSON_BYTES_PER_CELL,
+            ),
+            f"This batch of {len(specs)} mazes",
+        )
+    except cost.OverBudget as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    # Always record a seed so every maze can be regenerated on its own
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    futures = [
+        loop.run_in_executor(
+            pool,
+            batch.generate_item,
+            index,
+            spec.algorithm.value,
+            spec.rows,
+            spec.cols,
+            spec.maze_type.value,
+            spec.seed if spec.seed is not None else random.getrandbits(63),
+        )
+        for index, spec in enumerate(specs)
+    ]
+
+    # Workers return encoded mazes, so bodies are joined without re-encoding
+    if request.stream:
+        return StreamingResponse(
+            _stream_batch(futures), media_type="application/x-ndjson"
+        )
+
+    items = await asyncio.gather(*futures)
+    return Response(
+        b'{"mazes":[' + b",".join(items) + b"]}", media_type="application/json"
+    )
+
+
+async def _stream_batch(futures: List[Awaitable[bytes]]):
+    """Yield one NDJSON line per maze as soon as it is generated."""
+    try:
+        for future in asyncio.as_completed(futures):
+            yield await future + b"\n"
+    finally:
+        # Drop queued work when the client disconnects
+        for future in futures:
+            future.cancel()
+
+
+def _stored_maze_info(maze_id: str, maze_file: MazeFile) -> StoredMazeInfo:
+    return StoredMazeInfo(
+        id=maze_id,
+        rows=maze_file.rows,
+        cols=maze_file.cols,
+        algorithm=maze_file.algorithm,
+        maze_type=maze_file.maze_type,
+        seed=maze_file.seed,
+        encoding="bits" if maze_file.encoding == BITS else "uint8",
+        size_bytes=maze_file.size_bytes,
+    )
+
+
+@router.post("/stored", response_model=StoredMazeInfo)
+async def create_stored_maze(request: StoredMazeRequest, http_request: Request):
+    """Generate a maze into a memory-mapped file on the server."""
+
+    if request.tile_size is not None and request.maze_type.value != "perfect":
+        raise HTTPException(
+            status_code=400,
+            detail="Tiled stored mazes only support the perfect maze type",
+        )
+
+    try:
+        cost.check(
+            cost.estimate_generation(
+                request.rows,
+                request.cols,
+                request.algorithm.value,
+                request.maze_type.value,
+                cost.NO_STEPS,
+                request.tile_size,
+                in_memory=request.tile_size is None,
+            ),
+            f"Storing this {request.rows}x{request.cols} maze",
+            seconds=cost.max_stored_seconds(),
+        )
+    except cost.OverBudget as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    # Generation can take minutes, so it runs off the event loop and stops
+    # early if the client goes away
+    maze_id = maze_store.new_maze_id()
+    return await run_cancellable(
+        http_request, lambda cancel: _store_maze(request, maze_id, cancel)
+    )
+
+
+def _store_maze(
+    request: StoredMazeRequest, maze_id: str, cancel: CancelToken
+) -> StoredMazeInfo:
+    """Generate and write a stored maze; called in the threadpool."""
+    # Always record a seed so the maze can be regenerated from its header
+    seed = request.seed if request.seed is not None else random.getrandbits(63)
+    header = {
+        "algorithm": request.algorithm.value,
+        "maze_type": request.maze_type.value,
+        "seed": seed,
+        "packed": request.packed,
+    }
+
+    if request.tile_size is not None:
+        # Tiles are written straight into the file, never held in memory
+        # as a whole
+        rows = request.rows + 1 if request.rows % 2 == 0 else request.rows
+        cols = request.cols + 1 if request.cols % 2 == 0 else request.cols
+        with maze_store.create_maze(maze_id, rows, cols, **header) as maze_file:
+            tiled.generate(
+                rows,
+                cols,
+                request.algorithm.value,
+                request.tile_size,
+                seed=seed,
+                recorder=NullRecorder(),
+                out=maze_file,
+                cancel=cancel,
+            )
+            return _stored_maze_info(maze_id, maze_file)
+
+    if (
+        request.maze_type.value == "perfect"
+        and FEATURES[request.algorithm.value].vectorized
+    ):
+        # Numpy generators build the grid as one array, written at once
+        grid = batch.generate_array(
+            request.algorithm.value, request.rows, request.cols, "perfect", seed
+        )
+        cancel.check()
+        with maze_store.create_maze(maze_id, *grid.shape, **header) as maze_file:
+            maze_file.write_rows(0, grid)
+            return _stored_maze_info(maze_id, maze_file)
+
+    rng = random.Random(seed)
+    maze, _ = GENERATORS[request.algorithm.value](
+        request.rows, request.cols, NullRecorder(), rng, cancel=cancel
+    )
+
+    if request.maze_type.value == "loop":
+        from app.utils.helpers import add_loops
+
+        maze = add_loops(maze, rng)
     elif request.maze_type.value == "braid":
         from app.utils.helpers import add_braids
 
-        maze = add_braids(maze)
+        maze = add_braids(maze, rng)
+
+    with maze_store.create_maze(
+        maze_id, len(maze), len(maze[0]), **header
+    ) as maze_file:
+        for r, row in enumerate(maze):
+            cancel.check()
+            maze_file.write_row(r, row)
+        return _stored_maze_info(maze_id, maze_file)
+
+
+@router.get("/stored", response_model=List[StoredMazeInfo])
+async def list_stored_mazes():
+    """List the mazes stored on the server."""
+    infos = []
+    for maze_id in maze_store.list_mazes():
+        with maze_store.open_maze(maze_id) as maze_file:
+            infos.append(_stored_maze_info(maze_id, maze_file))
+    return infos
+
+
+@router.get("/stored/{maze_id}", response_model=StoredMazeInfo)
+async def get_stored_maze(maze_id: str):
+    """Get the header of a stored maze."""
+    try:
+        maze_file = maze_store.open_maze(maze_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Maze not found")
+
+    with maze_file:
+        return _stored_maze_info(maze_id, maze_file)
+
+
+@router.delete("/stored/{maze_id}")
+async def delete_stored_maze(maze_id: str):
+    """
+    Delete a stored maze and forget what this process cached for it.
+
+    Process pool workers cache per maze too (see ``compare.solve_item``);
+    IDs are never reused, so their entries are never read again and age out.
+    """
+    try:
+        maze_store.open_maze(maze_id).close()
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Maze not found")
+
+    maze_store.delete_maze(maze_id)
+    discard_cached(maze_id)
+    _overlays.discard_where(lambda key: key[0] == maze_id)
+    return {"deleted": maze_id}
+
+
+def _search_overlay(
+    maze_id: str, maze_file: MazeFile, request: ViewportRequest, cancel: CancelToken
+):
+    """
+    Run (or reuse) the requested search and return (visited, path) arrays.
 
-    return MazeResponse(maze=maze, steps=steps)
+    Called in the threadpool; ``cancel`` stops the search.
+    """
+    start = Cell(row=request.start_row, col=request.start_col)
+    end = Cell(row=request.end_row, col=request.end_col)
+    key = (maze_id, request.algorithm.value, start.row, start.col, end.row, end.col)
+
+    def solve():
+        hpa_cached = hpa.is_cached(maze_id)
+        try:
+            cost.check(
+                cost.estimate_search(
+                    maze_file.rows,
+                    maze_file.cols,
+                    request.algorithm.value,
+                    hpa_cached=hpa_cached,
+                ),
+                f"Searching this maze with {request.algorithm.value}",
+                cost.stored_search_seconds(request.algorithm.value, hpa_cached),
+            )
+        except cost.OverBudget as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+        if request.algorithm.value == "hpa":
+            # The abstract graph is kept for later overlays on this maze
+            visited, path = hpa.find_path(maze_file, start, end, cache_key=maze_id)
+        else:
+            visited, path = SOLVERS[request.algorithm.value](
+                maze_file,
+                start,
+                end,
+                cancel=cancel,
+                adjacency=get_adjacency(maze_file, maze_id),
+            )
+        return (
+            np.array([(c.row, c.col) for c in visited], dtype=np.int64).reshape(-1, 2),
+            np.array([(c.row, c.col) for c in path], dtype=np.int64).reshape(-1, 2),
+        )
+
+    return _overlays.get_or_create(key, solve)
+
+
+@router.get("/stored/{maze_id}/viewport", response_model=MazeViewport)
+async def get_viewport(
+    maze_id: str, request: Annotated[ViewportRequest, Query()], http_request: Request
+):
+    """
+    Get a rectangular, optionally downsampled, window of a stored maze.
+
+    Overlay searches run off the event loop like ``/api/path/find``.
+    """
+    try:
+        maze_file = maze_store.open_maze(maze_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Maze not found")
+
+    with maze_file:
+        if request.row >= maze_file.rows or request.col >= maze_file.cols:
+            raise HTTPException(
+                status_code=400, detail="Viewport is outside of maze bounds"
+            )
+
+        # Clip the window to the maze
+        height = min(request.height, maze_file.rows - request.row)
+        width = min(request.width, maze_file.cols - request.col)
+        window = (request.row, request.col, height, width, request.scale)
+
+        if (
+            -(-height // request.scale) * -(-width // request.scale)
+            > MAX_VIEWPORT_CELLS
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="Viewport too large, increase scale or shrink the window",
+            )
+
+        visited, path = [], []
+        if request.algorithm is not None:
+            if None in (
+                request.start_row,
+                request.start_col,
+                request.end_row,
+                request.end_col,
+            ):
+                raise HTTPException(
+                    status_code=400, detail="Overlays need a start and end position"
+                )
+            visited_cells, path_cells = await run_cancellable(
+                http_request,
+                lambda cancel: _search_overlay(maze_id, maze_file, request, cancel),
+            )
+            visited = clip_overlay(visited_cells, *window).tolist()
+            path = clip_overlay(path_cells, *window).tolist()
+
+        grid = read_viewport(maze_file, *window)
+
+        return MazeViewport(
+            row=request.row,
+            col=request.col,
+            height=height,
+            width=width,
+            scale=request.scale,
+            maze=grid.tolist(),
+            path=[Cell(row=r, col=c) for r, c in path],
+            visited=[Cell(row=r, col=c) for r, c in visited],
+        )
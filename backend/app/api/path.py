@@ -1,20 +1,119 @@
-from fastapi import APIRouter, HTTPException
-from app.models.path import PathFindingRequest, PathResponse
-from app.algorithms.path_finding import astar, bfs, dfs, dijkstra
+from concurrent.futures import wait
+from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from app.models.path import (
+    EditSessionRequest,
+    EditSessionResponse,
+    PathAlgorithm,
+    PathComparisonRequest,
+    PathComparisonResponse,
+    PathFindingRequest,
+    PathResponse,
+    SearchStatsModel,
+    ToggleCellsRequest,
+)
+from app.algorithms.path_finding import astar, bfs, compare, dfs, dijkstra, hpa
+from app.algorithms.path_finding.adjacency import get_adjacency
+from app.algorithms.path_finding.landmarks import get_landmarks
+from app.algorithms.path_finding.lpastar import LPAStar
+from app.algorithms.path_finding.sessions import get_edit_sessions
+from app.algorithms.path_finding.stats import SearchStats
+from app.utils import cost, maze_store
+from app.utils.cache import grid_digest
+from app.utils.cancel import POLL_INTERVAL, CancelToken, run_cancellable
+from app.utils.pool import get_process_pool, worker_count
 
 router = APIRouter()
 
+# Largest maze an editing session may hold; LPA* keeps two values per cell
+MAX_EDIT_CELLS = 1_000_000
+
 
 @router.post("/find", response_model=PathResponse)
-async def find_path(request: PathFindingRequest):
-    """Find a path through the maze using the specified algorithm."""
+async def find_path(request: PathFindingRequest, http_request: Request):
+    """
+    Find a path through the maze using the specified algorithm.
+
+    The search runs off the event loop and stops early if the client goes
+    away, see ``run_cancellable``.
+    """
+
+    # Stored mazes are read through mmap instead of being sent with the request
+    if request.maze_id is not None:
+        try:
+            maze_file = maze_store.open_maze(request.maze_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Maze not found")
+
+        with maze_file:
+            # Stored mazes keep their HPA graphs, so repeated queries are cheap
+            hpa_cached = hpa.is_cached(request.maze_id, request.cluster_size)
+            _check_cost(
+                maze_file,
+                [request.algorithm],
+                request.landmarks,
+                hpa_cached,
+                cost.stored_search_seconds(request.algorithm.value, hpa_cached),
+            )
+            return await run_cancellable(
+                http_request, lambda cancel: _find_path(request, maze_file, cancel)
+            )
+
+    _check_cost(request.maze, [request.algorithm], request.landmarks)
+    return await run_cancellable(
+        http_request, lambda cancel: _find_path(request, request.maze, cancel)
+    )
+
+
+def _check_cost(
+    maze,
+    algorithms: List[Union[PathAlgorithm, str]],
+    landmarks: Optional[int] = None,
+    hpa_cached: bool = False,
+    seconds: Optional[float] = None,
+) -> None:
+    """
+    Reject searches that could exceed the budgets, see ``app.utils.cost``.
+
+    Solvers run side by side over the process pool, so their times are
+    shared between the workers while all results are held at once.
+    ``landmarks`` is the request's ALT landmark count, which astar pays for;
+    ``hpa_cached`` tells whether hpa will reuse a cached abstract graph, and
+    ``seconds`` overrides the time budget.
+    """
+    if not maze:
+        return
 
+    names = [getattr(algorithm, "value", algorithm) for algorithm in algorithms]
+    estimates = [
+        cost.estimate_search(len(maze), len(maze[0]), name, landmarks, hpa_cached)
+        for name in names
+    ]
+    workers = min(worker_count(), len(estimates))
+    try:
+        cost.check(
+            cost.Estimate(
+                sum(e.seconds for e in estimates) / workers,
+                sum(e.bytes for e in estimates),
+            ),
+            f"Searching this {len(maze)}x{len(maze[0])} maze with {', '.join(names)}",
+            seconds,
+        )
+    except cost.OverBudget as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+def _validate(
+    request: Union[PathFindingRequest, PathComparisonRequest, EditSessionRequest],
+    maze,
+) -> None:
     # Validate maze dimensions
-    if not request.maze:
+    if not maze:
         raise HTTPException(status_code=400, detail="Empty maze")
 
-    rows = len(request.maze)
-    cols = len(request.maze[0]) if rows > 0 else 0
+    rows = len(maze)
+    cols = len(maze[0]) if rows > 0 else 0
 
     # Validate start and end positions
     if not (0 <= request.start.row < rows and 0 <= request.start.col < cols):
@@ -27,29 +126,249 @@ async def find_path(request: PathFindingRequest):
             status_code=400, detail="End position is outside of maze bounds"
         )
 
-    if request.maze[request.start.row][request.start.col] == 1:
+    if maze[request.start.row][request.start.col] == 1:
         raise HTTPException(status_code=400, detail="Start position is a wall")
 
-    if request.maze[request.end.row][request.end.col] == 1:
+    if maze[request.end.row][request.end.col] == 1:
         raise HTTPException(status_code=400, detail="End position is a wall")
 
+
+def _find_path(request: PathFindingRequest, maze, cancel: CancelToken) -> PathResponse:
+    _validate(request, maze)
+
+    # Counters are only collected on request, see SearchStats
+    stats = SearchStats() if request.stats else None
+
+    # Stored mazes never change, inline mazes are cached by content
+    cache_key = request.maze_id or grid_digest(maze)
+    if request.algorithm.value != "hpa":
+        adjacency = get_adjacency(maze, cache_key)
+
     # Choose and run pathfinding algorithm
     if request.algorithm.value == "bfs":
-        visited, path = bfs.find_path(request.maze, request.start, request.end)
+        visited, path = bfs.find_path(
+            maze, request.start, request.end, stats, cancel, adjacency
+        )
     elif request.algorithm.value == "dfs":
-        visited, path = dfs.find_path(request.maze, request.start, request.end)
+        visited, path = dfs.find_path(
+            maze, request.start, request.end, stats, cancel, adjacency
+        )
     elif request.algorithm.value == "astar":
-        visited, path = astar.find_path(request.maze, request.start, request.end)
+        heuristic = None
+        if request.landmarks is not None:
+            landmarks = get_landmarks(maze, request.landmarks, cache_key)
+            heuristic = landmarks.heuristic_to(request.end)
+        visited, path = astar.find_path(
+            maze, request.start, request.end, stats, heuristic, cancel, adjacency
+        )
     elif request.algorithm.value == "dijkstra":
-        visited, path = dijkstra.find_path(request.maze, request.start, request.end)
+        visited, path = dijkstra.find_path(
+            maze, request.start, request.end, stats, cancel, adjacency
+        )
+    elif request.algorithm.value == "hpa":
+        visited, path = hpa.find_path(
+            maze, request.start, request.end, request.cluster_size, cache_key
+        )
+        stats = None
     else:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown pathfinding algorithm: {request.algorithm}",
         )
 
+    stats_model = SearchStatsModel(**stats.to_dict()) if stats is not None else None
+
     # If no path found
     if not path:
-        return PathResponse(visited=visited, path=[])
+        return PathResponse(visited=visited, path=[], stats=stats_model)
+
+    return PathResponse(visited=visited, path=path, stats=stats_model)
+
+
+@router.post("/compare", response_model=PathComparisonResponse)
+async def compare_paths(request: PathComparisonRequest, http_request: Request):
+    """
+    Run several algorithms on one maze concurrently over the process pool.
+
+    The maze is validated and packed once; stored mazes are mapped by each
+    worker instead of being copied. Each result carries its own wall time,
+    so the response takes about as long as the slowest solver. Preparing
+    and waiting run off the event loop and stop early if the client goes
+    away, see ``run_cancellable``.
+    """
+    return await run_cancellable(
+        http_request, lambda cancel: _compare_paths(request, cancel)
+    )
+
+
+def _compare_paths(request: PathComparisonRequest, cancel: CancelToken) -> Response:
+    grid, cols, cache_key = None, 0, request.maze_id
+    if request.maze_id is not None:
+        try:
+            maze_file = maze_store.open_maze(request.maze_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Maze not found")
+        with maze_file:
+            _validate(request, maze_file)
+            _check_cost(maze_file, request.algorithms, request.landmarks)
+    else:
+        _validate(request, request.maze)
+        _check_cost(request.maze, request.algorithms, request.landmarks)
+        cols = len(request.maze[0])
+        grid = compare.pack_grid(request.maze)
+        # Per-maze structures (adjacency, HPA graphs, landmark tables) are
+        # cached under the maze contents
+        cache_key = grid_digest(request.maze)
+    cancel.check()
+
+    pool = get_process_pool()
+    futures = [
+        pool.submit(
+            compare.solve_item,
+            algorithm.value,
+            grid,
+            cols,
+            request.maze_id,
+            (request.start.row, request.start.col),
+            (request.end.row, request.end.col),
+            request.cluster_size,
+            cache_key,
+            request.stats,
+            request.landmarks,
+        )
+        for algorithm in request.algorithms
+    ]
+    try:
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=POLL_INTERVAL)
+            cancel.check()
+        results = [future.result() for future in futures]
+    finally:
+        # Solvers not yet started are dropped; running ones cannot be stopped
+        for future in futures:
+            future.cancel()
+
+    # Workers return encoded results, so they are joined without re-encoding
+    return Response(
+        b'{"results":[' + b",".join(results) + b"]}", media_type="application/json"
+    )
+
+
+@router.post("/sessions", response_model=EditSessionResponse)
+async def create_edit_session(request: EditSessionRequest, http_request: Request):
+    """
+    Start an editing session: a private copy of the maze with start and end.
+
+    The session keeps its search state, so after cells are flipped only the
+    affected part of the search is redone, see ``LPAStar``. The first search
+    runs off the event loop, see ``run_cancellable``.
+    """
+    if request.maze_id is not None:
+        try:
+            maze_file = maze_store.open_maze(request.maze_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Maze not found")
+        with maze_file:
+            _check_session(request, maze_file)
+            return await run_cancellable(
+                http_request,
+                lambda cancel: _start_session(request, maze_file.to_list(), cancel),
+            )
+
+    _check_session(request, request.maze)
+    return await run_cancellable(
+        http_request, lambda cancel: _start_session(request, request.maze, cancel)
+    )
+
+
+def _check_session(request: EditSessionRequest, maze) -> None:
+    """Validate a session's maze before it is copied."""
+    _validate(request, maze)
+    rows, cols = len(maze), len(maze[0])
+    if rows * cols > MAX_EDIT_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Editing sessions are limited to {MAX_EDIT_CELLS} cells",
+        )
+    sessions = get_edit_sessions()
+    if sessions.size_of(rows, cols) > sessions.max_bytes:
+        raise HTTPException(
+            status_code=400,
+            detail="This maze is too large for the editing sessions' memory budget",
+        )
+    _check_cost(maze, ["lpastar"])
+    # A session nobody can afford to edit is not worth starting
+    _check_replan(rows, cols)
+
+
+def _check_replan(rows: int, cols: int) -> None:
+    """Reject replanning that could exceed the budgets, see ``app.utils.cost``."""
+    try:
+        cost.check(
+            cost.estimate_replan(rows, cols),
+            f"Replanning in this {rows}x{cols} maze",
+        )
+    except cost.OverBudget as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+def _start_session(
+    request: EditSessionRequest, maze, cancel: CancelToken
+) -> EditSessionResponse:
+    """Run the first search and keep the planner once it has finished."""
+    planner = LPAStar(maze, request.start, request.end)
+    visited, path = planner.find_path(cancel)
+
+    session_id = maze_store.new_maze_id()
+    get_edit_sessions().add(session_id, planner)
+    return EditSessionResponse(session_id=session_id, visited=visited, path=path)
+
+
+@router.post("/sessions/{session_id}/toggle", response_model=EditSessionResponse)
+async def toggle_cells(
+    session_id: str, request: ToggleCellsRequest, http_request: Request
+):
+    """
+    Flip cells between wall and passage and replan incrementally.
+
+    Replanning runs off the event loop, see ``run_cancellable``. If it is
+    cancelled the flips stay applied, and the next toggle finishes the repair.
+    """
+    return await run_cancellable(
+        http_request, lambda cancel: _toggle_cells(session_id, request, cancel)
+    )
+
+
+def _toggle_cells(
+    session_id: str, request: ToggleCellsRequest, cancel: CancelToken
+) -> EditSessionResponse:
+    with get_edit_sessions().session(session_id) as planner:
+        if planner is None:
+            raise HTTPException(status_code=404, detail="Editing session not found")
+
+        endpoints = {planner.start, planner.end}
+        for cell in request.cells:
+            if not (0 <= cell.row < planner.rows and 0 <= cell.col < planner.cols):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Cell ({cell.row}, {cell.col}) is outside of maze bounds",
+                )
+            if cell.row * planner.cols + cell.col in endpoints:
+                raise HTTPException(
+                    status_code=400, detail="Start and end positions cannot be walls"
+                )
+        _check_replan(planner.rows, planner.cols)
+
+        for cell in request.cells:
+            planner.toggle(cell.row, cell.col)
+
+        visited, path = planner.find_path(cancel)
+    return EditSessionResponse(session_id=session_id, visited=visited, path=path)
+
 
-    return PathResponse(visited=visited, path=path)
+@router.delete("/sessions/{session_id}")
+async def delete_edit_session(session_id: str):
+    """End an editing session."""
+    get_edit_sessions().discard(session_id)
+    return {"deleted": session_id}
@@ -0,0 +1,192 @@
+"""
+Compare the cost model in ``app.utils.cost`` with measurements.
+
+Run from the backend directory, for example::
+
+    python -m app.benchmark --size 51 --size 201 --algorithm wilson
+
+Every combination of algorithm, size and output mode is generated through
+the same code as ``/api/maze/generate`` (tiles and maze types aside) and
+timed, including encoding the response body. Peak memory is measured with
+``tracemalloc`` in a second run. Solvers are measured on a perfect maze,
+searching between opposite corners.
+
+The ratios measured / estimated should stay at or below about 1; estimates
+are meant to be upper bounds. Runs estimated above ``--max-seconds`` are
+skipped.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+from app.algorithms.maze_generator import GENERATORS
+from app.algorithms.path_finding import SOLVERS, hpa
+from app.algorithms.path_finding.lpastar import LPAStar
+from app.api.maze import _generate
+from app.models.maze import IMPERFECT, Cell, MazeGenerationRequest
+from app.utils import cost
+from app.utils.frames import NullRecorder
+from app.utils.grid_json import maze_response
+
+MODES = [cost.SNAPSHOTS, cost.FRAMES, cost.NO_STEPS]
+
+
+def _measure(work: Callable[[], object]) -> Tuple[float, int]:
+    """Wall time of ``work()``, then its peak traced memory in a second run."""
+    began = time.perf_counter()
+    work()
+    seconds = time.perf_counter() - began
+
+    tracemalloc.start()
+    try:
+        work()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+async def _body_size(response) -> int:
+    return sum([len(chunk) async for chunk in response.body_iterator])
+
+
+def _generate_and_encode(request: MazeGenerationRequest, output: str) -> int:
+    """Generate like the endpoint does and return the size of the body."""
+    maze, steps = _generate(request, output, None)
+    if output == cost.FRAMES:
+        response = maze_response(maze, [], frames=steps)
+    else:
+        response = maze_response(maze, steps)
+    return asyncio.run(_body_size(response))
+
+
+def _row(name: str, estimate: cost.Estimate, seconds: float, peak: int) -> str:
+    return (
+        f"{name:<34} {estimate.seconds:9.3f} {seconds:9.3f} "
+        f"{seconds / max(estimate.seconds, 1e-9):6.2f} "
+        f"{estimate.bytes / 1e6:9.1f} {peak / 1e6:9.1f} "
+        f"{peak / max(estimate.bytes, 1):6.2f}"
+    )
+
+
+def benchmark_generation(
+    sizes: List[int], algorithms: List[str], maze_type: str, max_seconds: float
+) -> None:
+    for algorithm in algorithms:
+        for size in sizes:
+            for output in MODES:
+                estimate = cost.estimate_generation(
+                    size, size, algorithm, maze_type, output
+                )
+                name = f"{algorithm} {size}x{size} {maze_type} {output}"
+                if maze_type == "perfect" and algorithm in IMPERFECT:
+                    print(f"{name:<34} skipped, not a perfect maze")
+                    continue
+                if estimate.seconds > max_seconds:
+                    print(f"{name:<34} skipped, estimated {estimate.seconds:.1f} s")
+                    continue
+
+                request = MazeGenerationRequest(
+                    rows=size,
+                    cols=size,
+                    algorithm=algorithm,
+                    maze_type=maze_type,
+                    seed=0,
+                )
+                seconds, peak = _measure(lambda: _generate_and_encode(request, output))
+                print(_row(name, estimate, seconds, peak))
+
+
+def benchmark_search(sizes: List[int], solvers: List[str], max_seconds: float):
+    for size in sizes:
+        maze, _ = GENERATORS["backtracking"](size, size, NullRecorder())
+        rows, cols = len(maze), len(maze[0])
+        start, end = Cell(row=1, col=1), Cell(row=rows - 2, col=cols - 2)
+        for solver in solvers:
+            estimate = cost.estimate_search(rows, cols, solver)
+            name = f"{solver} {rows}x{cols}"
+            if estimate.seconds > max_seconds:
+                print(f"{name:<34} skipped, estimated {estimate.seconds:.1f} s")
+                continue
+
+            if solver == "lpastar":
+
+                def work():
+                    return LPAStar(maze, start, end).find_path()
+
+            elif solver == "hpa":
+                # Without a cache key the abstract graph is built every time
+                def work():
+                    return SOLVERS[solver](maze, start, end, 16, None)
+
+            else:
+
+                def work():
+                    return SOLVERS[solver](maze, start, end)
+
+            seconds, peak = _measure(work)
+            print(_row(name, estimate, seconds, peak))
+
+            if solver == "hpa":
+                # Later queries on a stored maze reuse its cached graph
+                SOLVERS[solver](maze, start, end, 16, "benchmark")
+                estimate = cost.estimate_search(rows, cols, solver, hpa_cached=True)
+                seconds, peak = _measure(
+                    lambda: SOLVERS[solver](maze, start, end, 16, "benchmark")
+                )
+                print(_row(f"{name} cached", estimate, seconds, peak))
+                hpa.discard("benchmark")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare cost estimates with measured time and memory"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        action="append",
+        help="Side length of the mazes (repeatable, default 51, 101 and 201)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        action="append",
+        choices=sorted(GENERATORS),
+        help="Generator to measure (repeatable, default all)",
+    )
+    parser.add_argument(
+        "--maze-type", default="perfect", choices=sorted(cost.MAZE_TYPE_SECONDS)
+    )
+    parser.add_argument(
+        "--solver",
+        action="append",
+        choices=sorted(cost.SEARCH_SECONDS),
+        help="Solver to measure (repeatable, default all)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=5.0,
+        help="Skip runs estimated to take longer than this",
+    )
+    args = parser.parse_args(argv)
+    sizes = args.size or [51, 101, 201]
+
+    print(
+        f"{'':<34} {'est s':>9} {'s':>9} {'ratio':>6} "
+        f"{'est MB':>9} {'MB':>9} {'ratio':>6}"
+    )
+    benchmark_generation(
+        sizes, args.algorithm or sorted(GENERATORS), args.maze_type, args.max_seconds
+    )
+    benchmark_search(
+        [size * 2 for size in sizes],
+        args.solver or sorted(cost.SEARCH_SECONDS),
+        args.max_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
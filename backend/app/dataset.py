@@ -0,0 +1,225 @@
+"""
+Export maze/solution datasets as sharded, compressed NPZ files.
+
+Run from the backend directory, for example::
+
+    python -m app.dataset out/ --count 100000 --rows 41 --cols 41 \\
+        --algorithm backtracking --algorithm wilson --solver bfs
+
+Every shard ``shard-NNNNN.npz`` holds:
+
+- ``grids``: ``uint8`` array of shape (mazes, rows, cols), 0 = passage
+- ``path_cells`` / ``path_offsets``: the solutions from the top opening to
+  the bottom opening, concatenated; maze i's path is
+  ``path_cells[path_offsets[i]:path_offsets[i + 1]]`` as (row, col) pairs
+- ``visited``: number of cells the solver expanded, per maze
+- ``seeds``, ``algorithms``, ``maze_types``: what each maze was made from
+
+Maze i is generated from a seed derived from ``--seed`` and i alone, so the
+dataset is reproducible and interrupted exports resume by skipping the
+shards that already exist. The parameters are kept in ``manifest.json``;
+it holds no paths, shards are always found next to it, so an export can be
+moved or mounted elsewhere and still be resumed.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional
+import numpy as np
+from app.algorithms.maze_generator import GENERATORS
+from app.algorithms.maze_generator.batch import generate_array
+from app.algorithms.path_finding import SOLVERS
+from app.models.maze import IMPERFECT, Cell
+from app.utils.pool import worker_count
+
+MANIFEST = "manifest.json"
+
+
+def maze_seed(base_seed: int, index: int) -> int:
+    """Seed of maze ``index``, independent of every other maze."""
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "little") >> 1
+
+
+def shard_path(out_dir: str, shard: int) -> str:
+    return os.path.join(out_dir, f"shard-{shard:05d}.npz")
+
+
+def export_shard(manifest: dict, out_dir: str, shard: int) -> int:
+    """
+    Generate and solve the mazes of one shard and write its file.
+
+    Runs in a worker process. The file is written under a temporary name
+    and renamed when complete, so a shard file is either whole or absent.
+
+    Returns:
+        Number of mazes written
+    """
+    first = shard * manifest["shard_size"]
+    last = min(first + manifest["shard_size"], manifest["count"])
+    algorithms = manifest["algorithms"]
+    solver = SOLVERS[manifest["solver"]]
+
+    grids, paths, visited, seeds, names = [], [], [], [], []
+    for index in range(first, last):
+        algorithm = algorithms[index % len(algorithms)]
+        seed = maze_seed(manifest["seed"], index)
+        grid = generate_array(
+            algorithm, manifest["rows"], manifest["cols"], manifest["maze_type"], seed
+        )
+        rows, cols = grid.shape
+        expanded, path = solver(
+            grid, Cell(row=0, col=1), Cell(row=rows - 1, col=cols - 2)
+        )
+
+        grids.append(grid)
+        paths.append(np.array([(c.row, c.col) for c in path], dtype=np.int32))
+        visited.append(len(expanded))
+        seeds.append(seed)
+        names.append(algorithm)
+
+    lengths = [len(path) for path in paths]
+    path_file = shard_path(out_dir, shard)
+    temp_file = path_file + ".tmp.npz"
+    np.savez_compressed(
+        temp_file,
+        grids=np.stack(grids),
+        path_cells=np.concatenate(paths).reshape(-1, 2),
+        path_offsets=np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+        visited=np.array(visited, dtype=np.int64),
+        seeds=np.array(seeds, dtype=np.uint64),
+        algorithms=np.array(names),
+        maze_types=np.array([manifest["maze_type"]] * len(names)),
+    )
+    os.replace(temp_file, path_file)
+    return last - first
+
+
+def load_manifest(out_dir: str, manifest: dict) -> dict:
+    """
+    Write the manifest of a new export, or check it against an existing one.
+
+    Raises:
+        ValueError: If ``out_dir`` holds an export made with other parameters
+    """
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            existing = json.load(f)
+        # Older manifests recorded the absolute directory they were made in
+        existing.pop("out_dir", None)
+        if existing != manifest:
+            raise ValueError(
+                f"{out_dir} holds an export with different parameters; "
+                "use a new directory or the same options"
+            )
+        return existing
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _progress(done: int, total: int, mazes: int, started: float) -> None:
+    """Draw a one-line progress bar on stderr."""
+    width = 30
+    filled = width * done // total if total else width
+    elapsed = time.monotonic() - started
+    rate = mazes / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(
+        f"\r[{'#' * filled}{'.' * (width - filled)}] "
+        f"{done}/{total} shards, {rate:.0f} mazes/s"
+    )
+    sys.stderr.flush()
+
+
+def export(manifest: dict, out_dir: str, workers: int) -> None:
+    """Export every shard that does not exist yet, over a process pool."""
+    shards = -(-manifest["count"] // manifest["shard_size"])
+    pending = [
+        shard
+        for shard in range(shards)
+        if not os.path.exists(shard_path(out_dir, shard))
+    ]
+    done = shards - len(pending)
+    if done:
+        print(f"Resuming: {done} of {shards} shards already exported", file=sys.stderr)
+
+    started = time.monotonic()
+    mazes = 0
+    _progress(done, shards, mazes, started)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = {
+            pool.submit(export_shard, manifest, out_dir, shard) for shard in pending
+        }
+        while futures:
+            finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                mazes += future.result()
+                done += 1
+            _progress(done, shards, mazes, started)
+    sys.stderr.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.dataset",
+        description="Export maze/solution datasets as sharded NPZ files.",
+    )
+    parser.add_argument("out_dir", help="Directory for the shards and manifest")
+    parser.add_argument("--count", type=int, required=True, help="Number of mazes")
+    parser.add_argument("--rows", type=int, default=21)
+    parser.add_argument("--cols", type=int, default=21)
+    parser.add_argument(
+        "--algorithm",
+        action="append",
+        choices=sorted(GENERATORS),
+        help="Generator to use; repeat to alternate between several",
+    )
+    parser.add_argument(
+        "--maze-type", default="perfect", choices=["perfect", "loop", "braid"]
+    )
+    parser.add_argument("--solver", default="bfs", choices=sorted(SOLVERS))
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the dataset")
+    parser.add_argument("--shard-size", type=int, default=1000)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.count < 1 or args.shard_size < 1:
+        parser.error("--count and --shard-size must be positive")
+    if args.rows < 5 or args.cols < 5:
+        parser.error("--rows and --cols must be at least 5")
+    if args.maze_type == "perfect" and IMPERFECT.intersection(args.algorithm or []):
+        parser.error("cellular automaton mazes are not perfect, use --maze-type")
+
+    manifest = {
+        "count": args.count,
+        "rows": args.rows,
+        "cols": args.cols,
+        "algorithms": args.algorithm or ["backtracking"],
+        "maze_type": args.maze_type,
+        "solver": args.solver,
+        "seed": args.seed,
+        "shard_size": args.shard_size,
+    }
+    try:
+        manifest = load_manifest(args.out_dir, manifest)
+    except ValueError as e:
+        parser.error(str(e))
+
+    export(manifest, args.out_dir, args.workers or worker_count())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import maze, path, linkedlist
+from app.utils.maze_pool import get_maze_pool
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fill the pre-generated maze pools in the background
+    refill = asyncio.create_task(get_maze_pool().run())
+    yield
+    refill.cancel()
+
+
 app = FastAPI(
     title="P+L Visualizer API",
     description="API for generating mazes,finding paths using various algorithms, and visualizing linked lists.",
     docs_url="/docs",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -26,7 +39,7 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["POST", "GET"],
+    allow_methods=["POST", "GET", "DELETE"],
     allow_headers=["*"],
 )
 
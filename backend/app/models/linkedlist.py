@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import Dict, List, Optional, Literal
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Optional, Literal, Union
+
+# Lists are addressed by name; every session starts with list1 and list2
+ListId = Annotated[str, Field(min_length=1, max_length=64)]
 
 
 class LinkedListNode(BaseModel):
@@ -15,19 +18,22 @@ class LinkedListOperationRequest(BaseModel):
     """Base request for linked list operations."""
 
     listType: Literal["singly", "doubly"]
+    # Ask for a LinkedListDelta against the client's copy at baseVersion
+    diff: bool = False
+    baseVersion: Optional[int] = None
 
 
 class AddNodeRequest(LinkedListOperationRequest):
     """Request to add a node to a list."""
 
     value: int
-    listId: Literal["list1", "list2"] = "list1"
+    listId: ListId = "list1"
 
 
 class RemoveNodeRequest(LinkedListOperationRequest):
     """Request to remove a node from a list."""
 
-    listId: Literal["list1", "list2"] = "list1"
+    listId: ListId = "list1"
 
 
 # New request type for removing a node by value
@@ -35,25 +41,40 @@ class RemoveNodeByValueRequest(LinkedListOperationRequest):
     """Request to remove a node with a specific value from a list."""
 
     value: int
-    listId: Literal["list1", "list2"] = "list1"
+    listId: ListId = "list1"
+
+
+class RemoveNodeByIdRequest(LinkedListOperationRequest):
+    """Request to remove a node with a specific ID from a list."""
+
+    nodeId: str
+    listId: ListId = "list1"
 
 
 class ReverseListRequest(LinkedListOperationRequest):
     """Request to reverse a list."""
 
-    listId: Literal["list1", "list2"] = "list1"
+    listId: ListId = "list1"
 
 
 class ConnectListsRequest(LinkedListOperationRequest):
-    """Request to connect or merge two lists."""
+    """Request to connect or merge the source list into the target list."""
 
     sorted: bool = False
+    targetId: ListId = "list1"
+    sourceId: ListId = "list2"
+
+
+class ListRequest(LinkedListOperationRequest):
+    """Request to create or delete a list."""
+
+    listId: ListId
 
 
 class SortListRequest(LinkedListOperationRequest):
     """Request to sort a single list."""
 
-    listId: Literal["list1", "list2"] = "list1"
+    listId: ListId = "list1"
 
 
 class LinkedListVisualizationData(BaseModel):
@@ -61,3 +82,122 @@ class LinkedListVisualizationData(BaseModel):
 
     listType: Literal["singly", "doubly"]
     lists: Dict[str, List[LinkedListNode]]
+    version: int = 0
+
+
+class LinkedListInfo(BaseModel):
+    """A named list and its length."""
+
+    id: str
+    size: int
+    # Bulk-loaded lists are only served a page at a time
+    bulk: bool = False
+
+
+class BulkLoadRequest(BaseModel):
+    """Request to build a large array-backed list from values."""
+
+    listId: ListId
+    values: List[int] = Field(max_length=2_000_000)
+    # Scatter consecutive nodes over memory, as allocated nodes would be
+    shuffle: bool = False
+    seed: Optional[int] = None
+
+
+class LinkedListPage(BaseModel):
+    """A window of a bulk-loaded list, in list order."""
+
+    listType: Literal["singly", "doubly"]
+    listId: str
+    offset: int
+    size: int
+    nodes: List[LinkedListNode]
+
+
+class LinkedListDelta(BaseModel):
+    """
+    Changes made by one operation to the lists at ``baseVersion``.
+
+    Only returned when the client's ``baseVersion`` is current; otherwise the
+    full ``LinkedListVisualizationData`` is sent so the client can resync.
+    """
+
+    listType: Literal["singly", "doubly"]
+    version: int
+    baseVersion: int
+    # New first node of every list whose head changed (None when emptied)
+    heads: Dict[str, Optional[str]]
+    # Added nodes and nodes whose next/prev pointers changed
+    nodes: List[LinkedListNode]
+    removed: List[str]
+
+
+class AddNodeOperation(BaseModel):
+    op: Literal["add-node"]
+    value: int
+    listId: ListId = "list1"
+
+
+class RemoveNodeOperation(BaseModel):
+    op: Literal["remove-node"]
+    listId: ListId = "list1"
+
+
+class RemoveNodeByValueOperation(BaseModel):
+    op: Literal["remove-node-by-value"]
+    value: int
+    listId: ListId = "list1"
+
+
+class RemoveNodeByIdOperation(BaseModel):
+    op: Literal["remove-node-by-id"]
+    nodeId: str
+    listId: ListId = "list1"
+
+
+class ReverseListOperation(BaseModel):
+    op: Literal["reverse"]
+    listId: ListId = "list1"
+
+
+class SortListOperation(BaseModel):
+    op: Literal["sort"]
+    listId: ListId = "list1"
+
+
+class ConnectListsOperation(BaseModel):
+    op: Literal["connect"]
+    sorted: bool = False
+    targetId: ListId = "list1"
+    sourceId: ListId = "list2"
+
+
+# One step of a batch, named like the endpoint that performs it
+LinkedListOperation = Annotated[
+    Union[
+        AddNodeOperation,
+        RemoveNodeOperation,
+        RemoveNodeByValueOperation,
+        RemoveNodeByIdOperation,
+        ReverseListOperation,
+        SortListOperation,
+        ConnectListsOperation,
+    ],
+    Field(discriminator="op"),
+]
+
+
+class LinkedListBatchRequest(BaseModel):
+    """Request to apply several operations in order, all or nothing."""
+
+    listType: Literal["singly", "doubly"]
+    operations: List[LinkedListOperation] = Field(min_length=1, max_length=1000)
+    # Also return the changes made by every single operation
+    diffs: bool = False
+
+
+class LinkedListBatchResponse(BaseModel):
+    """Final state of a batch, optionally with the changes of every step."""
+
+    state: LinkedListVisualizationData
+    steps: Optional[List[Union[LinkedListVisualizationData, LinkedListDelta]]] = None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
 from enum import Enum
 
 
@@ -15,6 +15,32 @@ class MazeAlgorithm(str, Enum):
     KRUSKAL = "kruskal"
     ELLER = "eller"
     WILSON = "wilson"
+    BINARY_TREE = "binary_tree"
+    SIDEWINDER = "sidewinder"
+    CA_MAZE = "ca_maze"  # Cellular automaton, Maze rule
+    CA_MAZECTRIC = "ca_mazectric"  # Cellular automaton, Mazectric rule
+
+
+# Cellular automata do not make perfect mazes: their passages form loops
+# and need not connect every cell (or the start to the end)
+IMPERFECT = {MazeAlgorithm.CA_MAZE, MazeAlgorithm.CA_MAZECTRIC}
+
+
+def check_maze_type(request):
+    """Reject ``perfect`` for algorithms that never make perfect mazes."""
+    if request.maze_type == MazeType.PERFECT and request.algorithm in IMPERFECT:
+        raise ValueError(
+            f"{request.algorithm.value} mazes are not perfect, "
+            "use maze_type loop or braid"
+        )
+    return request
+
+
+def check_tiling(request):
+    """Reject ``tile_size`` for algorithms whose tiles cannot be stitched."""
+    if request.tile_size is not None and request.algorithm in IMPERFECT:
+        raise ValueError(f"{request.algorithm.value} mazes cannot be tiled")
+    return request
 
 
 class Cell(BaseModel):
@@ -27,8 +53,145 @@ class MazeGenerationRequest(BaseModel):
     cols: int = Field(..., gt=4, description="Number of columns in the maze (min 5)")
     algorithm: MazeAlgorithm
     maze_type: MazeType = MazeType.PERFECT
+    seed: Optional[int] = Field(None, description="Seed for reproducible mazes")
+    tile_size: Optional[int] = Field(
+        None,
+        ge=2,
+        description="Generate tiles of about this many cells per side in parallel",
+    )
+    max_frames: Optional[int] = Field(
+        None,
+        ge=2,
+        description="Coalesce animation steps into at most this many delta frames",
+    )
+    keyframe_interval: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Attach a full grid every N frames (defaults to max_frames / 10, at least 8)",
+    )
+    allow_downgrade: bool = Field(
+        True,
+        description="Send delta frames or no steps instead of failing when over budget",
+    )
+    steps: Optional[Literal["snapshots", "frames", "none"]] = Field(
+        None,
+        description="Animation output; frames with max_frames, none for tiled "
+        "mazes and snapshots otherwise by default",
+    )
+
+    _check_maze_type = model_validator(mode="after")(check_maze_type)
+    _check_tiling = model_validator(mode="after")(check_tiling)
+
+
+class MazeFrame(BaseModel):
+    changes: List[List[int]]  # [row, col, value] triples applied in this frame
+    keyframe: Optional[List[List[int]]] = None  # Full grid after this frame
 
 
 class MazeResponse(BaseModel):
     maze: List[List[int]]
     steps: List[List[List[int]]]  # Animation steps
+    frames: Optional[List[MazeFrame]] = None  # Delta frames when max_frames is set
+
+
+class MazeSpec(BaseModel):
+    rows: int = Field(..., gt=4, description="Number of rows in the maze (min 5)")
+    cols: int = Field(..., gt=4, description="Number of columns in the maze (min 5)")
+    algorithm: MazeAlgorithm
+    maze_type: MazeType = MazeType.PERFECT
+    seed: Optional[int] = Field(None, description="Seed for reproducible mazes")
+
+    _check_maze_type = model_validator(mode="after")(check_maze_type)
+
+
+class BatchGenerationRequest(BaseModel):
+    specs: Optional[List[MazeSpec]] = Field(
+        None, min_length=1, max_length=1000, description="Mazes to generate"
+    )
+    count: Optional[int] = Field(
+        None, ge=1, le=1000, description="Generate this many mazes like template"
+    )
+    template: Optional[MazeSpec] = Field(
+        None, description="Spec for count mazes; its seed seeds the whole batch"
+    )
+    stream: bool = Field(
+        False, description="Stream mazes as NDJSON lines in completion order"
+    )
+
+
+class GeneratedMaze(BaseModel):
+    index: int  # Position of the spec in the request
+    rows: int
+    cols: int
+    algorithm: str
+    maze_type: str
+    seed: int
+    maze: List[List[int]]
+
+
+class BatchGenerationResponse(BaseModel):
+    mazes: List[GeneratedMaze]
+
+
+class StoredMazeRequest(BaseModel):
+    rows: int = Field(..., gt=4, description="Number of rows in the maze (min 5)")
+    cols: int = Field(..., gt=4, description="Number of columns in the maze (min 5)")
+    algorithm: MazeAlgorithm
+    maze_type: MazeType = MazeType.PERFECT
+    seed: Optional[int] = Field(
+        None,
+        ge=0,
+        lt=2**63,
+        description="Seed for reproducible mazes (stored in the file header)",
+    )
+    tile_size: Optional[int] = Field(
+        None,
+        ge=2,
+        description="Generate tiles in parallel, writing straight to the maze file",
+    )
+    packed: bool = Field(True, description="Store one bit per cell instead of a byte")
+
+    _check_maze_type = model_validator(mode="after")(check_maze_type)
+    _check_tiling = model_validator(mode="after")(check_tiling)
+
+
+class StoredMazeInfo(BaseModel):
+    id: str
+    rows: int
+    cols: int
+    algorithm: str
+    maze_type: str
+    seed: Optional[int] = None
+    encoding: Literal["bits", "uint8"]
+    size_bytes: int
+
+
+class MazePoolPreset(BaseModel):
+    rows: int
+    cols: int
+    algorithm: str
+    maze_type: str
+    ready: int  # Mazes waiting to be served
+    hits: int
+    misses: int  # Requests that found this pool empty
+
+
+class RefillLag(BaseModel):
+    # Milliseconds from taking a maze until its replacement was ready
+    last: float
+    mean: float
+    max: float
+
+
+class MazePoolStats(BaseModel):
+    ready: int
+    bytes: int  # Size of the ready response bodies
+    max_bytes: int
+    hits: int
+    misses: int
+    unpooled: int  # Unseeded requests for configurations without a pool
+    hit_rate: float  # Share of unseeded requests served from a pool
+    refills: int  # Mazes generated in the background
+    dropped: int  # Generated mazes discarded because of max_bytes
+    refill_lag_ms: RefillLag
+    presets: List[MazePoolPreset]
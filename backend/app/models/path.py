@@ -1,23 +1,136 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import AfterValidator, BaseModel, Field, model_validator
+from typing import Annotated, List, Optional
 from enum import Enum
 from app.models.maze import Cell
 
 
+def check_grid(maze: List[List[int]]) -> List[List[int]]:
+    """Reject ragged grids and cells other than 0 (passage) and 1 (wall)."""
+    if any(len(row) != len(maze[0]) for row in maze):
+        raise ValueError("Maze rows must all have the same length")
+    if not set().union(*map(set, maze)) <= {0, 1}:
+        raise ValueError("Maze cells must be 0 or 1")
+    return maze
+
+
+MazeGrid = Annotated[List[List[int]], AfterValidator(check_grid)]
+
+
+def check_maze_source(request):
+    """Reject requests that send a grid and name a stored maze at once."""
+    if request.maze is not None and request.maze_id is not None:
+        raise ValueError("Send either maze or maze_id, not both")
+    return request
+
+
 class PathAlgorithm(str, Enum):
     BFS = "bfs"
     DFS = "dfs"
     A_STAR = "astar"
     DIJKSTRA = "dijkstra"
+    HPA = "hpa"
 
 
 class PathFindingRequest(BaseModel):
-    maze: List[List[int]]
+    maze: Optional[MazeGrid] = None
+    maze_id: Optional[str] = None  # Use a stored maze instead of sending the grid
     start: Cell
     end: Cell
     algorithm: PathAlgorithm
+    cluster_size: int = Field(
+        16, ge=4, description="Cluster side length for hierarchical (hpa) search"
+    )
+    landmarks: Optional[int] = Field(
+        None,
+        ge=1,
+        le=16,
+        description="Guide astar with ALT bounds from this many landmarks, "
+        "whose distance tables are cached per maze",
+    )
+    stats: bool = Field(
+        False, description="Return search counters (not collected for hpa)"
+    )
+
+    _check_maze_source = model_validator(mode="after")(check_maze_source)
+
+
+class SearchStatsModel(BaseModel):
+    expanded: int  # Nodes taken off the frontier and processed
+    generated: int  # Distinct cells added to the frontier
+    reopened: int  # Cells pushed again after their cost improved
+    peak_frontier: int  # Largest frontier size
+    pushes: int  # Frontier insertions (heap pushes for astar and dijkstra)
+    pops: int  # Frontier removals, including skipped stale entries
+    elapsed_ms: float  # Wall time of the search
 
 
 class PathResponse(BaseModel):
     visited: List[Cell]  # Cells visited during algorithm execution (for animation)
     path: List[Cell]  # Final path from start to end
+    stats: Optional[SearchStatsModel] = None  # Only when requested
+
+
+class PathComparisonRequest(BaseModel):
+    maze: Optional[MazeGrid] = None
+    maze_id: Optional[str] = None  # Use a stored maze instead of sending the grid
+    start: Cell
+    end: Cell
+    algorithms: List[PathAlgorithm] = Field(
+        default_factory=lambda: [
+            PathAlgorithm.BFS,
+            PathAlgorithm.DFS,
+            PathAlgorithm.A_STAR,
+            PathAlgorithm.DIJKSTRA,
+        ],
+        min_length=1,
+        description="Solvers to run on the maze, concurrently",
+    )
+    cluster_size: int = Field(
+        16, ge=4, description="Cluster side length for hierarchical (hpa) search"
+    )
+    landmarks: Optional[int] = Field(
+        None,
+        ge=1,
+        le=16,
+        description="Guide astar with ALT bounds from this many landmarks, "
+        "whose distance tables are cached per maze",
+    )
+    stats: bool = Field(
+        False, description="Return search counters (not collected for hpa)"
+    )
+
+    _check_maze_source = model_validator(mode="after")(check_maze_source)
+
+
+class SolverResult(BaseModel):
+    algorithm: PathAlgorithm
+    visited: List[Cell]
+    path: List[Cell]
+    visited_count: int
+    path_length: int
+    time_ms: float  # Wall time of the search alone
+    stats: Optional[SearchStatsModel] = None  # Only when requested
+
+
+class PathComparisonResponse(BaseModel):
+    results: List[SolverResult]  # In the order the algorithms were requested
+
+
+class EditSessionRequest(BaseModel):
+    maze: Optional[MazeGrid] = None
+    maze_id: Optional[str] = None  # Start from a stored maze (it is not modified)
+    start: Cell
+    end: Cell
+
+    _check_maze_source = model_validator(mode="after")(check_maze_source)
+
+
+class ToggleCellsRequest(BaseModel):
+    cells: List[Cell] = Field(
+        ..., min_length=1, max_length=1000, description="Cells to flip"
+    )
+
+
+class EditSessionResponse(PathResponse):
+    session_id: str
+    # visited holds only the cells this replanning expanded
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.models.maze import Cell
+from app.models.path import PathAlgorithm
+
+
+class ViewportRequest(BaseModel):
+    row: int = Field(0, ge=0, description="Top row of the window")
+    col: int = Field(0, ge=0, description="Left column of the window")
+    height: int = Field(..., gt=0, description="Window height in maze cells")
+    width: int = Field(..., gt=0, description="Window width in maze cells")
+    scale: int = Field(
+        1, ge=1, le=255, description="Downsampling factor (maze cells per output cell)"
+    )
+    algorithm: Optional[PathAlgorithm] = None  # Overlay this solver's search
+    start_row: Optional[int] = None
+    start_col: Optional[int] = None
+    end_row: Optional[int] = None
+    end_col: Optional[int] = None
+
+
+class MazeViewport(BaseModel):
+    row: int
+    col: int
+    height: int  # Window size in maze cells, clipped to the maze
+    width: int
+    scale: int
+    maze: List[List[int]]  # Downsampled window (1 = mostly walls)
+    path: List[Cell]  # Overlays in viewport coordinates
+    visited: List[Cell]
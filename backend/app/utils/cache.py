@@ -0,0 +1,59 @@
+import hashlib
+from array import array
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, List
+
+
+class LRUCache:
+    """A small thread-safe least-recently-used cache for per-maze data."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, building it with ``factory`` if missing."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry whose key matches ``predicate``."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+
+def grid_digest(maze: List[List[int]]) -> str:
+    """Content hash of a grid, used to cache per-maze data for inline mazes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for row in maze:
+        digest.update(len(row).to_bytes(4, "little"))
+        digest.update(array("q", row).tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Callable, TypeVar
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+# How often a running request checks whether its client is still there
+POLL_INTERVAL = 0.02
+
+# nginx's "client closed request"; the client never sees it
+CLIENT_CLOSED_REQUEST = 499
+
+
+class Cancelled(Exception):
+    """Raised at a checkpoint once the work has been cancelled."""
+
+
+class CancelToken:
+    """
+    Lets one thread ask work running in another to stop.
+
+    Generators and solvers take an optional token and call ``check`` in their
+    main loops, behind ``if cancel is not None``. A checkpoint is a single
+    attribute read, so it is cheap enough to run once per step.
+    """
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def check(self) -> None:
+        """
+        Raises:
+            Cancelled: If ``cancel`` has been called
+        """
+        if self.cancelled:
+            raise Cancelled()
+
+
+async def run_cancellable(request: Request, work: Callable[[CancelToken], T]) -> T:
+    """
+    Run ``work(token)`` in the threadpool, cancelling it if the client leaves.
+
+    While the work runs the event loop stays free to poll
+    ``request.is_disconnected()``. On disconnect the token is cancelled and
+    the work stops at its next checkpoint, instead of finishing a result
+    nobody will read.
+
+    Raises:
+        HTTPException: 499 when the client disconnected
+    """
+    token = CancelToken()
+    task = asyncio.ensure_future(run_in_threadpool(work, token))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                token.cancel()
+                try:
+                    await task
+                except Cancelled:
+                    pass
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected"
+                )
+    finally:
+        # Also stops the work when this handler itself is cancelled
+        token.cancel()
@@ -0,0 +1,334 @@
+"""
+Cost model for admission control.
+
+Requests are estimated from their shape alone (size, algorithm, maze type,
+output options) before any work starts. Requests over the budgets are
+downgraded to cheaper output or rejected. The coefficients were fitted on
+one core with ``python -m app.benchmark``, which also prints estimates next
+to measurements; rerun it after changing a generator or solver.
+"""
+
+import os
+from typing import List, Optional, Tuple
+from app.algorithms.maze_generator.cellular import GENERATIONS
+from app.utils.frames import MIN_KEYFRAME_INTERVAL
+from app.utils.pool import worker_count
+
+# Output modes of maze generation, richest first
+SNAPSHOTS = "snapshots"  # A full grid per step
+FRAMES = "frames"  # Delta frames, see FrameBudgetRecorder
+NO_STEPS = "none"  # Only the final maze
+
+# Frame budget used when snapshots are downgraded to frames
+DEFAULT_MAX_FRAMES = 300
+
+# Fixed cost of every generation request: setup and encoding the response
+REQUEST_SECONDS = 0.01
+REQUEST_BYTES = 256 * 1024
+
+# Seconds per grid cell to generate a maze without recording steps
+GENERATE_SECONDS = {
+    "backtracking": 3.0e-6,
+    "prim": 4.5e-6,
+    "kruskal": 5.5e-6,
+    "eller": 4.0e-6,
+    "wilson": 2.5e-6,
+    "binary_tree": 1.5e-7,
+    "sidewinder": 1.5e-7,
+    "ca_maze": 3e-7,
+    "ca_mazectric": 3e-7,
+}
+
+# Bytes per grid cell of a generator's working state (sets, queues, parents)
+GENERATE_BYTES = {
+    "backtracking": 100,
+    "prim": 100,
+    "kruskal": 185,
+    "eller": 70,
+    "wilson": 110,
+    "binary_tree": 16,
+    "sidewinder": 16,
+    "ca_maze": 16,
+    "ca_mazectric": 16,
+}
+
+# Wilson's walks start from a cell picked out of a list of the cells still
+# outside the maze, so its time also grows with the square of the size
+WILSON_SECONDS_PER_CELL_SQUARED = 5e-9
+
+# Seconds per grid cell to turn a perfect maze into another type
+MAZE_TYPE_SECONDS = {"perfect": 0.0, "loop": 3e-7, "braid": 8e-7}
+
+# A snapshot holds a pointer per cell plus row overhead, is copied once when
+# recorded and encoded as about two bytes of JSON per cell
+SNAPSHOT_BYTES_PER_CELL = 9.5
+SNAPSHOT_SECONDS_PER_CELL = 2.5e-7
+
+# A delta frame keeps each changed cell in a dict until the response is built.
+# Carving generators change each cell about once, cellular automata flip
+# cells back and forth over their generations.
+FRAME_BYTES_PER_CHANGE = 160
+FRAME_SECONDS_PER_CHANGE = 2.5e-6
+CHANGES_PER_CELL = {"ca_maze": 3.0, "ca_mazectric": 4.5}
+
+# The maze itself, as nested lists of small ints and encoded as JSON
+GRID_BYTES_PER_CELL = 9.5
+GRID_JSON_BYTES_PER_CELL = 2
+
+# Worst-case seconds per grid cell for a search that reaches every cell.
+# For HPA this includes building the abstract graph, see HPA_CACHED_SECONDS.
+SEARCH_SECONDS = {
+    "bfs": 6e-6,
+    "dfs": 4e-6,
+    "astar": 7e-6,
+    "dijkstra": 8e-6,
+    "hpa": 1e-5,
+    "lpastar": 1e-5,  # First search of an editing session
+}
+
+# Solver state and the visited Cell models, per grid cell
+SEARCH_BYTES_PER_CELL = 400
+
+# HPA only returns abstract nodes as visited, so building its graph takes
+# far less memory than a search that lists every cell
+HPA_BYTES_PER_CELL = 120
+
+# An HPA query on a maze whose abstract graph is cached only searches that
+# graph and refines the path it finds, still about linear in the maze size
+# in the worst case (an abstract node every few clusters' cells is expanded)
+HPA_CACHED_SECONDS = 2e-6
+HPA_CACHED_BYTES_PER_CELL = 100
+
+# Replanning after cells are flipped can cut off every distance LPA* found:
+# each such cell is raised to infinity and settled again, two expansions
+LPASTAR_REPLAN_FACTOR = 2
+
+# An editing session's LPA* planner after its first search: g and rhs per
+# cell plus the queue entries left behind
+EDIT_SESSION_BYTES_PER_CELL = 300
+
+# ALT landmarks for astar: ``landmarks + 1`` breadth-first passes over the
+# whole grid build one int32 distance table per landmark. The tables are
+# cached per maze and count, but a first query pays for all of them.
+LANDMARK_SECONDS_PER_CELL = 1e-6
+LANDMARK_BYTES_PER_CELL = 4
+
+
+class OverBudget(ValueError):
+    """Raised when a request would exceed the budgets even at its cheapest."""
+
+
+class Estimate:
+    """Estimated wall time and peak memory of one request."""
+
+    __slots__ = ("seconds", "bytes")
+
+    def __init__(self, seconds: float, bytes: float):
+        self.seconds = seconds
+        self.bytes = int(bytes)
+
+    def __repr__(self) -> str:
+        return f"Estimate({self.seconds:.3g} s, {self.bytes / 2**20:.3g} MiB)"
+
+    def fits(self, seconds: Optional[float] = None) -> bool:
+        """Whether the estimate is within budget (``seconds`` overrides time)."""
+        return (
+            self.seconds <= (max_seconds() if seconds is None else seconds)
+            and self.bytes <= max_bytes()
+        )
+
+
+def max_seconds() -> float:
+    """Time budget per request (``COST_MAX_SECONDS``, 10 s by default)."""
+    return float(os.environ.get("COST_MAX_SECONDS", 10))
+
+
+def max_stored_seconds() -> float:
+    """
+    Time budget for creating a stored maze (``COST_MAX_STORED_SECONDS``).
+
+    Stored mazes exist for sizes that take minutes, so they get their own,
+    larger budget (300 s by default).
+    """
+    return float(os.environ.get("COST_MAX_STORED_SECONDS", 300))
+
+
+def stored_search_seconds(algorithm: str, hpa_cached: bool) -> float:
+    """
+    Time budget of a search on a stored maze.
+
+    Building the HPA graph of a stored maze is paid once for all later
+    queries on it, like storing the maze, so it gets the stored budget.
+    """
+    if algorithm == "hpa" and not hpa_cached:
+        return max_stored_seconds()
+    return max_seconds()
+
+
+def max_bytes() -> int:
+    """Memory budget per request (``COST_MAX_BYTES``, 512 MB by default)."""
+    return int(os.environ.get("COST_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def check(estimate: Estimate, what: str, seconds: Optional[float] = None) -> Estimate:
+    """
+    Raises:
+        OverBudget: If ``estimate`` does not fit, described as ``what``
+    """
+    if not estimate.fits(seconds):
+        budget = max_seconds() if seconds is None else seconds
+        raise OverBudget(
+            f"{what} is estimated at {estimate.seconds:.1f} s and "
+            f"{estimate.bytes / 2**20:.0f} MiB, over the budget of "
+            f"{budget:g} s and {max_bytes() / 2**20:.0f} MiB"
+        )
+    return estimate
+
+
+def _odd(n: int) -> int:
+    return n + 1 if n % 2 == 0 else n
+
+
+def step_count(algorithm: str, rows: int, cols: int) -> int:
+    """Number of steps a generator records, excluding start and finish."""
+    rows, cols = _odd(rows), _odd(cols)
+    if algorithm in ("binary_tree", "sidewinder"):
+        # One band of cell rows per step
+        return rows // 2
+    if algorithm in ("ca_maze", "ca_mazectric"):
+        return GENERATIONS + 1
+    # One step per cell joined to the maze
+    return (rows // 2) * (cols // 2)
+
+
+def estimate_generation(
+    rows: int,
+    cols: int,
+    algorithm: str,
+    maze_type: str = "perfect",
+    output: str = SNAPSHOTS,
+    tile_size: Optional[int] = None,
+    max_frames: Optional[int] = None,
+    keyframe_interval: Optional[int] = None,
+    in_memory: bool = True,
+) -> Estimate:
+    """
+    Estimate the cost of generating one maze with the given output.
+
+    ``in_memory=False`` is for tiled mazes written straight to a file, whose
+    grid is never held as a whole.
+    """
+    cells = _odd(rows) * _odd(cols)
+    seconds = REQUEST_SECONDS + GENERATE_SECONDS[algorithm] * cells
+    if algorithm == "wilson":
+        # Quadratic in the size of each tile when tiled
+        span = cells if tile_size is None else (2 * tile_size + 1) ** 2
+        seconds += WILSON_SECONDS_PER_CELL_SQUARED * cells * span
+    if tile_size is not None:
+        # Tiles are generated in parallel; only stitching steps are recorded
+        seconds /= worker_count()
+        steps = max(1, rows // (2 * tile_size)) * max(1, cols // (2 * tile_size))
+    else:
+        steps = step_count(algorithm, rows, cols)
+    seconds += MAZE_TYPE_SECONDS[maze_type] * cells
+    if not in_memory:
+        memory = REQUEST_BYTES
+    elif tile_size is not None:
+        # Workers hold one tile at a time, the server only the grid
+        memory = REQUEST_BYTES + GRID_BYTES_PER_CELL * cells
+    else:
+        memory = REQUEST_BYTES + GENERATE_BYTES[algorithm] * cells
+
+    if output == SNAPSHOTS:
+        snapshots = steps + 2
+        seconds += SNAPSHOT_SECONDS_PER_CELL * cells * snapshots
+        memory += SNAPSHOT_BYTES_PER_CELL * cells * snapshots
+    elif output == FRAMES:
+        # Keyframes are full snapshots
+        max_frames = max_frames or DEFAULT_MAX_FRAMES
+        interval = keyframe_interval or max(MIN_KEYFRAME_INTERVAL, max_frames // 10)
+        keyframes = min(steps, max_frames) // interval + 3
+        changes = cells * CHANGES_PER_CELL.get(algorithm, 0.5)
+        seconds += FRAME_SECONDS_PER_CHANGE * changes
+        seconds += SNAPSHOT_SECONDS_PER_CELL * cells * keyframes
+        memory += FRAME_BYTES_PER_CHANGE * changes
+        memory += SNAPSHOT_BYTES_PER_CELL * cells * keyframes
+
+    return Estimate(seconds, memory)
+
+
+def plan_generation(
+    rows: int,
+    cols: int,
+    algorithm: str,
+    maze_type: str = "perfect",
+    output: str = SNAPSHOTS,
+    tile_size: Optional[int] = None,
+    max_frames: Optional[int] = None,
+    keyframe_interval: Optional[int] = None,
+    allow_downgrade: bool = True,
+) -> Tuple[str, Estimate]:
+    """
+    Choose the richest output, no richer than ``output``, within budget.
+
+    Snapshots fall back to delta frames and frames to no steps at all.
+
+    Returns:
+        The output mode to use and its estimate
+
+    Raises:
+        OverBudget: If even the cheapest allowed output is over budget
+    """
+    modes: List[str] = [SNAPSHOTS, FRAMES, NO_STEPS]
+    modes = modes[modes.index(output) :]
+    if not allow_downgrade:
+        modes = modes[:1]
+
+    for mode in modes:
+        estimate = estimate_generation(
+            rows,
+            cols,
+            algorithm,
+            maze_type,
+            mode,
+            tile_size,
+            max_frames,
+            keyframe_interval,
+        )
+        if estimate.fits() or mode == modes[-1]:
+            break
+
+    return mode, check(estimate, f"Generating this {rows}x{cols} maze")
+
+
+def estimate_search(
+    rows: int,
+    cols: int,
+    algorithm: str,
+    landmarks: Optional[int] = None,
+    hpa_cached: bool = False,
+) -> Estimate:
+    """
+    Estimate the worst case of one search, when it visits every cell.
+
+    ``landmarks`` adds building the ALT tables an astar search is guided by;
+    ``hpa_cached`` prices an hpa search whose abstract graph is already built.
+    """
+    cells = rows * cols
+    if algorithm == "hpa" and hpa_cached:
+        return Estimate(HPA_CACHED_SECONDS * cells, HPA_CACHED_BYTES_PER_CELL * cells)
+    seconds = SEARCH_SECONDS[algorithm] * cells
+    if algorithm == "hpa":
+        memory = HPA_BYTES_PER_CELL * cells
+    else:
+        memory = SEARCH_BYTES_PER_CELL * cells
+    if algorithm == "astar" and landmarks is not None:
+        seconds += LANDMARK_SECONDS_PER_CELL * cells * (landmarks + 1)
+        memory += LANDMARK_BYTES_PER_CELL * cells * landmarks
+    return Estimate(seconds, memory)
+
+
+def estimate_replan(rows: int, cols: int) -> Estimate:
+    """Estimate the worst case of replanning an editing session, see LPAStar."""
+    estimate = estimate_search(rows, cols, "lpastar")
+    return Estimate(estimate.seconds * LPASTAR_REPLAN_FACTOR, estimate.bytes)
@@ -0,0 +1,157 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+# Fewest frames between default keyframes, so that small frame budgets still
+# send mostly deltas instead of a full grid per frame
+MIN_KEYFRAME_INTERVAL = 8
+
+Grid = List[List[int]]
+
+
+class SnapshotRecorder:
+    """
+    Record a full copy of the grid for every generation step.
+
+    This is the default animation format: ``steps`` is a list of complete
+    grids that the frontend can play back frame by frame.
+    """
+
+    def __init__(self):
+        self.steps: List[Grid] = []
+
+    def start(self, maze: Grid) -> None:
+        """Record the initial state of the maze."""
+        self.steps.append([row[:] for row in maze])
+
+    def step(self, maze: Grid, *cells: Tuple[int, int]) -> None:
+        """Record the maze after the given cells have been changed."""
+        self.steps.append([row[:] for row in maze])
+
+    def finish(self, maze: Grid) -> None:
+        """Record the final state of the maze."""
+        self.steps.append([row[:] for row in maze])
+
+    def result(self) -> List[Grid]:
+        return self.steps
+
+
+class NullRecorder:
+    """Discard all steps (used when only the final maze is needed)."""
+
+    def start(self, maze: Grid) -> None:
+        pass
+
+    def step(self, maze: Grid, *cells: Tuple[int, int]) -> None:
+        pass
+
+    def finish(self, maze: Grid) -> None:
+        pass
+
+    def result(self) -> List[Grid]:
+        return []
+
+
+class FrameBudgetRecorder:
+    """
+    Coalesce generation steps into at most ``max_frames`` delta frames.
+
+    Instead of copying the grid on every step, only the changed cells are
+    kept. Steps are grouped ``stride`` at a time into a frame; whenever the
+    number of frames would exceed the budget, adjacent frames are merged
+    pairwise and the stride doubles. Memory therefore stays proportional to
+    the number of changed cells, never to ``steps * rows * cols``.
+
+    Every ``keyframe_interval`` frames a full copy of the grid is attached so
+    that the client can seek without replaying from the beginning. The first
+    frame is always a keyframe holding the initial state.
+    """
+
+    def __init__(self, max_frames: int, keyframe_interval: Optional[int] = None):
+        if max_frames < 2:
+            raise ValueError("max_frames must be at least 2")
+
+        self.max_frames = max_frames
+        self.keyframe_interval = keyframe_interval or max(
+            MIN_KEYFRAME_INTERVAL, max_frames // 10
+        )
+
+        self._base: Grid = []
+        self._shadow: Grid = []  # Grid state as seen through recorded changes
+        self._frames: List[Dict[Tuple[int, int], int]] = []
+        self._pending: Dict[Tuple[int, int], int] = {}
+        self._pending_steps = 0
+        self._stride = 1
+
+    def start(self, maze: Grid) -> None:
+        """Record the initial state of the maze (frame 0)."""
+        self._base = [row[:] for row in maze]
+        self._shadow = [row[:] for row in maze]
+
+    def step(self, maze: Grid, *cells: Tuple[int, int]) -> None:
+        """Record the new values of the given cells as part of the current frame."""
+        for r, c in cells:
+            value = maze[r][c]
+            self._shadow[r][c] = value
+            self._pending[(r, c)] = value
+
+        self._pending_steps += 1
+        if self._pending_steps >= self._stride:
+            self._flush()
+
+    def finish(self, maze: Grid) -> None:
+        """Record any changes made outside of ``step`` (e.g. start/end openings)."""
+        for r, row in enumerate(maze):
+            shadow_row = self._shadow[r]
+            if row == shadow_row:
+                continue
+            for c, value in enumerate(row):
+                if shadow_row[c] != value:
+                    shadow_row[c] = value
+                    self._pending[(r, c)] = value
+
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._frames.append(self._pending)
+        self._pending = {}
+        self._pending_steps = 0
+
+        # Frame 0 is the initial keyframe, so deltas get max_frames - 1 slots
+        if len(self._frames) > self.max_frames - 1:
+            merged = []
+            for i in range(0, len(self._frames) - 1, 2):
+                frame = self._frames[i]
+                frame.update(self._frames[i + 1])
+                merged.append(frame)
+            if len(self._frames) % 2:
+                merged.append(self._frames[-1])
+            self._frames = merged
+            self._stride *= 2
+
+    def result(self) -> List[dict]:
+        """
+        Build the frames, replaying the deltas once to produce keyframes.
+
+        Returns:
+            List of frames, each with ``changes`` as ``[row, col, value]``
+            triples and an optional full ``keyframe`` grid
+        """
+        state = [row[:] for row in self._base]
+        frames = [{"changes": [], "keyframe": [row[:] for row in state]}]
+
+        for index, delta in enumerate(self._frames, start=1):
+            changes = []
+            for (r, c), value in delta.items():
+                state[r][c] = value
+                changes.append([r, c, value])
+
+            keyframe = None
+            if index % self.keyframe_interval == 0:
+                keyframe = [row[:] for row in state]
+
+            frames.append({"changes": changes, "keyframe": keyframe})
+
+        return frames
+
+
+StepRecorder = Union[SnapshotRecorder, NullRecorder, FrameBudgetRecorder]
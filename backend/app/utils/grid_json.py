@@ -0,0 +1,158 @@
+import json
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from fastapi.responses import StreamingResponse
+
+Grid = List[List[int]]
+
+# Bytes 0-9 -> their ASCII digits
+_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+# Encoded output is flushed to the client in chunks of about this size
+CHUNK_SIZE = 64 * 1024
+
+
+def _cell_bytes(row) -> bytes:
+    """
+    One byte per cell of a row, for the digit fast paths.
+
+    Numpy arrays are only taken as raw bytes when they hold one byte per
+    cell; ``bytes()`` of any other dtype would return its machine bytes.
+
+    Raises:
+        TypeError, ValueError: If a cell is not an int in 0..255
+    """
+    if isinstance(row, np.ndarray):
+        if row.dtype == np.uint8 or row.dtype == np.bool_:
+            return row.tobytes()
+        row = row.tolist()
+    return bytes(row)
+
+
+def _plain(grid):
+    """Numpy arrays (or rows) as lists, for ``json.dumps``."""
+    if isinstance(grid, np.ndarray):
+        return grid.tolist()
+    return [row.tolist() if isinstance(row, np.ndarray) else row for row in grid]
+
+
+def encode_row(row: List[int]) -> bytes:
+    """
+    Encode one grid row as a compact JSON array, e.g. ``[0,1,1]``.
+
+    Rows of single-digit cells (every maze row) are translated to digits in
+    one C-level pass instead of formatting integers one at a time; anything
+    else falls back to ``json.dumps``.
+    """
+    try:
+        cells = _cell_bytes(row)
+    except (TypeError, ValueError):
+        cells = b""
+    if not cells or max(cells) > 9:
+        if isinstance(row, np.ndarray):
+            row = row.tolist()
+        return json.dumps(row, separators=(",", ":")).encode()
+
+    # "[d,d,...,d]": digits at the odd positions, commas in between
+    out = bytearray(b",") * (2 * len(cells) + 1)
+    out[0] = ord("[")
+    out[-1] = ord("]")
+    out[1:-1:2] = cells.translate(_DIGITS)
+    return bytes(out)
+
+
+def encode_grid(grid: Grid) -> bytes:
+    """
+    Encode a grid as a JSON array of rows.
+
+    Rectangular grids of single-digit cells are laid out in one pass: every
+    row becomes ``[d,...,d],`` with the brackets and commas at even offsets
+    and the digits (followed by the row separator) at odd offsets.
+    """
+    rows = len(grid)
+    if rows == 0:
+        return b"[]"
+
+    try:
+        row_bytes = list(map(_cell_bytes, grid))
+    except (TypeError, ValueError):
+        return json.dumps(_plain(grid), separators=(",", ":")).encode()
+
+    cols = len(row_bytes[0])
+    flat = b"".join(row_bytes)
+    if (
+        cols == 0
+        or len(flat) != rows * cols
+        or len(set(map(len, row_bytes))) != 1
+        or max(flat) > 9
+    ):
+        return b"[" + b",".join(map(encode_row, grid)) + b"]"
+
+    out = bytearray(rows * (2 * cols + 2))
+    out[0::2] = (b"[" + b"," * (cols - 1) + b"]") * rows
+    out[1::2] = b",".join(row_bytes).translate(_DIGITS) + b","
+    # Drop the separator after the last row
+    return b"[" + bytes(out[:-1]) + b"]"
+
+
+def _chunked(parts: Iterable[bytes]) -> Iterator[bytes]:
+    """Join small byte strings into chunks of at least ``CHUNK_SIZE``."""
+    buffer = bytearray()
+    for part in parts:
+        buffer += part
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _maze_response_parts(
+    maze: Grid, steps: List[Grid], frames: Optional[List[dict]]
+) -> Iterator[bytes]:
+    yield b'{"maze":' + encode_grid(maze) + b',"steps":['
+    for i, step in enumerate(steps):
+        yield encode_grid(step) if i == 0 else b"," + encode_grid(step)
+
+    if frames is None:
+        yield b'],"frames":null}'
+        return
+
+    yield b'],"frames":['
+    for i, frame in enumerate(frames):
+        keyframe = frame.get("keyframe")
+        yield (
+            (b'{"changes":' if i == 0 else b',{"changes":')
+            + json.dumps(frame["changes"], separators=(",", ":")).encode()
+            + b',"keyframe":'
+            + (encode_grid(keyframe) if keyframe is not None else b"null")
+            + b"}"
+        )
+    yield b"]}"
+
+
+def encode_maze_response(
+    maze: Grid, steps: List[Grid], frames: Optional[List[dict]] = None
+) -> bytes:
+    """Encode a whole ``MazeResponse`` body at once, e.g. to keep it around."""
+    return b"".join(_maze_response_parts(maze, steps, frames))
+
+
+def maze_response(
+    maze: Grid,
+    steps: List[Grid],
+    frames: Optional[List[dict]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Stream a ``MazeResponse`` body, encoded straight from the grids.
+
+    This skips validating and re-serializing every cell through pydantic.
+    Endpoints keep ``response_model=MazeResponse`` so the OpenAPI schema
+    stays the same; FastAPI passes returned responses through unchanged.
+    """
+    return StreamingResponse(
+        _chunked(_maze_response_parts(maze, steps, frames)),
+        media_type="application/json",
+        headers=headers,
+    )
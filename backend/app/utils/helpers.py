@@ -1,18 +1,24 @@
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from collections import deque
 
 
-def add_loops(maze: List[List[int]]) -> List[List[int]]:
+def add_loops(
+    maze: List[List[int]], rng: Optional[random.Random] = None
+) -> List[List[int]]:
     """
     Modify a perfect maze to add some loops by removing some walls randomly.
 
     Args:
         maze: 2D grid representing a perfect maze (0 = passage, 1 = wall)
+        rng: Random number generator (the global ``random`` module by default)
 
     Returns:
         Modified maze with some loops
     """
+    if rng is None:
+        rng = random
+
     rows, cols = len(maze), len(maze[0])
 
     modified_maze = [row[:] for row in maze]
@@ -22,8 +28,8 @@ def add_loops(maze: List[List[int]]) -> List[List[int]]:
 
     for _ in range(walls_to_remove):
         # Choose a random wall (not on the border)
-        row = random.randint(1, rows - 2)
-        col = random.randint(1, cols - 2)
+        row = rng.randint(1, rows - 2)
+        col = rng.randint(1, cols - 2)
 
         # Skip if not a wall
         if modified_maze[row][col] == 0:
@@ -46,16 +52,22 @@ def add_loops(maze: List[List[int]]) -> List[List[int]]:
     return modified_maze
 
 
-def add_braids(maze: List[List[int]]) -> List[List[int]]:
+def add_braids(
+    maze: List[List[int]], rng: Optional[random.Random] = None
+) -> List[List[int]]:
     """
     Modify a maze to create a "braid" maze with no dead ends.
 
     Args:
         maze: 2D grid representing a maze (0 = passage, 1 = wall)
+        rng: Random number generator (the global ``random`` module by default)
 
     Returns:
         Modified maze with no dead ends
     """
+    if rng is None:
+        rng = random
+
     rows, cols = len(maze), len(maze[0])
 
     modified_maze = [row[:] for row in maze]
@@ -83,7 +95,7 @@ def add_braids(maze: List[List[int]]) -> List[List[int]]:
             # If dead end (3 adjacent walls), remove one wall
             if adjacent_walls == 3 and wall_directions:
                 # Randomly choose a wall to remove
-                direction = random.choice(wall_directions)
+                direction = rng.choice(wall_directions)
                 dr, dc = [(0, 1), (1, 0), (0, -1), (-1, 0)][direction]
 
                 # Remove the wall
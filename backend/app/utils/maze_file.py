@@ -0,0 +1,262 @@
+import mmap
+import struct
+from typing import List, Optional
+
+import numpy as np
+
+MAGIC = b"LPMZ"
+VERSION = 1
+
+# Cell encodings
+UINT8 = 0  # One byte per cell
+BITS = 1  # One bit per cell, each row padded to a whole byte
+
+_FLAG_HAS_SEED = 1
+
+# magic, version, encoding, flags, rows, cols, algorithm, maze_type, seed
+_HEADER = struct.Struct("<4sHBBII16s8sQ16x")
+HEADER_SIZE = _HEADER.size  # 64 bytes, keeps the cell data aligned
+
+# Bits of every byte value, least significant bit first
+_BYTE_BITS = [[(value >> bit) & 1 for bit in range(8)] for value in range(256)]
+
+
+class MazeFile:
+    """
+    A maze grid stored on disk and accessed through ``mmap``.
+
+    The file is a 64-byte header recording the dimensions, encoding,
+    generation algorithm, maze type and seed, followed by the cells in
+    row-major order, either one byte per cell or bit-packed. Only the pages
+    that are actually touched are loaded, so mazes can be much larger than
+    the available memory.
+
+    The object behaves like the nested lists used everywhere else:
+    ``len(maze)``, ``len(maze[0])``, ``maze[row][col]`` and
+    ``maze[row][col] = value`` all work, so generators and solvers can use it
+    without changes.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        """Open an existing maze file."""
+        self.path = path
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        self._mmap = mmap.mmap(
+            self._file.fileno(),
+            0,
+            access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+        )
+
+        (
+            magic,
+            version,
+            self.encoding,
+            flags,
+            self.rows,
+            self.cols,
+            algorithm,
+            maze_type,
+            seed,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a maze file")
+
+        self.algorithm = algorithm.rstrip(b"\0").decode()
+        self.maze_type = maze_type.rstrip(b"\0").decode()
+        self.seed: Optional[int] = seed if flags & _FLAG_HAS_SEED else None
+        self.row_bytes = (self.cols + 7) // 8 if self.encoding == BITS else self.cols
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        rows: int,
+        cols: int,
+        algorithm: str = "",
+        maze_type: str = "perfect",
+        seed: Optional[int] = None,
+        packed: bool = True,
+        fill: int = 1,
+    ) -> "MazeFile":
+        """
+        Create a new maze file with every cell set to ``fill``.
+
+        Args:
+            path: File to create (overwritten if it exists)
+            rows: Number of rows in the maze
+            cols: Number of columns in the maze
+            algorithm: Name of the generation algorithm
+            maze_type: Maze type (perfect, loop or braid)
+            seed: Seed used to generate the maze
+            packed: Store one bit per cell instead of one byte
+            fill: Initial value of every cell (walls by default)
+
+        Returns:
+            The new maze file, opened for writing
+        """
+        encoding = BITS if packed else UINT8
+        row_bytes = (cols + 7) // 8 if packed else cols
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            encoding,
+            _FLAG_HAS_SEED if seed is not None else 0,
+            rows,
+            cols,
+            algorithm.encode()[:16],
+            maze_type.encode()[:8],
+            seed or 0,
+        )
+        fill_byte = (b"\xff" if packed else b"\x01") if fill else b"\0"
+
+        with open(path, "wb") as f:
+            f.write(header)
+            chunk = fill_byte * row_bytes
+            for _ in range(rows):
+                f.write(chunk)
+
+        return cls(path, writable=True)
+
+    def __enter__(self) -> "MazeFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Flush pending writes and release the mapping."""
+        if not self._mmap.closed:
+            if self.writable:
+                self._mmap.flush()
+            self._mmap.close()
+        self._file.close()
+
+    @property
+    def size_bytes(self) -> int:
+        return HEADER_SIZE + self.rows * self.row_bytes
+
+    def get(self, row: int, col: int) -> int:
+        """Return the value of a single cell."""
+        offset = HEADER_SIZE + row * self.row_bytes
+        if self.encoding == BITS:
+            return (self._mmap[offset + (col >> 3)] >> (col & 7)) & 1
+        return self._mmap[offset + col]
+
+    def set(self, row: int, col: int, value: int) -> None:
+        """Set the value of a single cell."""
+        offset = HEADER_SIZE + row * self.row_bytes
+        if self.encoding == BITS:
+            index = offset + (col >> 3)
+            if value:
+                self._mmap[index] |= 1 << (col & 7)
+            else:
+                self._mmap[index] &= ~(1 << (col & 7)) & 0xFF
+        else:
+            self._mmap[offset + col] = value
+
+    def read_row(
+        self, row: int, start: int = 0, stop: Optional[int] = None
+    ) -> List[int]:
+        """Return the cells of ``row`` from ``start`` up to ``stop`` as a list."""
+        if stop is None or stop > self.cols:
+            stop = self.cols
+        offset = HEADER_SIZE + row * self.row_bytes
+        if self.encoding == BITS:
+            data = self._mmap[offset + (start >> 3) : offset + ((stop + 7) >> 3)]
+            values = [bit for byte in data for bit in _BYTE_BITS[byte]]
+            first = start & ~7
+            return values[start - first : stop - first]
+        return list(self._mmap[offset + start : offset + stop])
+
+    def write_row(self, row: int, values: List[int], start: int = 0) -> None:
+        """Write ``values`` into ``row`` beginning at column ``start``."""
+        offset = HEADER_SIZE + row * self.row_bytes
+        if self.encoding == BITS:
+            # Patch the affected bytes in memory and write them back at once
+            first = offset + (start >> 3)
+            last = offset + ((start + len(values) + 7) >> 3)
+            data = bytearray(self._mmap[first:last])
+            for col, value in enumerate(values, start & 7):
+                if value:
+                    data[col >> 3] |= 1 << (col & 7)
+                else:
+                    data[col >> 3] &= ~(1 << (col & 7)) & 0xFF
+            self._mmap[first:last] = bytes(data)
+        else:
+            self._mmap[offset + start : offset + start + len(values)] = bytes(values)
+
+    def write_rows(self, row: int, cells: np.ndarray) -> None:
+        """Write whole rows from ``row`` on, from a ``uint8`` array of cells."""
+        if self.encoding == BITS:
+            cells = np.packbits(cells, axis=1, bitorder="little")
+        offset = HEADER_SIZE + row * self.row_bytes
+        self._mmap[offset : offset + cells.size] = np.ascontiguousarray(
+            cells, dtype=np.uint8
+        ).tobytes()
+
+    def read_region(self, row: int, col: int, height: int, width: int) -> np.ndarray:
+        """
+        Return a rectangular block of cells as a ``uint8`` array.
+
+        The block is read through a zero-copy view of the mapping, so only
+        the rows it spans are paged in.
+        """
+        data = np.frombuffer(
+            self._mmap, np.uint8, count=self.rows * self.row_bytes, offset=HEADER_SIZE
+        ).reshape(self.rows, self.row_bytes)
+
+        if self.encoding == BITS:
+            first = col >> 3
+            packed = data[row : row + height, first : (col + width + 7) >> 3]
+            cells = np.unpackbits(packed, axis=1, bitorder="little")
+            start = col - (first << 3)
+            return cells[:, start : start + width]
+
+        return data[row : row + height, col : col + width].copy()
+
+    def to_list(self) -> List[List[int]]:
+        """Load the whole maze into memory as nested lists."""
+        return [self.read_row(row) for row in range(self.rows)]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> "_RowView":
+        if not 0 <= row < self.rows:
+            raise IndexError("maze row out of range")
+        return _RowView(self, row)
+
+
+class _RowView:
+    """A single row of a ``MazeFile`` that supports list-style indexing."""
+
+    __slots__ = ("_maze", "_row")
+
+    def __init__(self, maze: MazeFile, row: int):
+        self._maze = maze
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._maze.cols
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            start, stop, step = col.indices(self._maze.cols)
+            values = self._maze.read_row(self._row, start, stop)
+            return values if step == 1 else values[::step]
+        if not 0 <= col < self._maze.cols:
+            raise IndexError("maze column out of range")
+        return self._maze.get(self._row, col)
+
+    def __setitem__(self, col, value) -> None:
+        if isinstance(col, slice):
+            start, _, _ = col.indices(self._maze.cols)
+            self._maze.write_row(self._row, list(value), start)
+        else:
+            self._maze.set(self._row, col, value)
+
+    def __iter__(self):
+        return iter(self._maze.read_row(self._row))
@@ -0,0 +1,250 @@
+"""
+Pools of pre-generated mazes for the most requested configurations.
+
+Unseeded ``/api/maze/generate`` requests for a configured size, algorithm
+and maze type are answered with a maze generated ahead of time, so they skip
+generation entirely. A background task tops the pools back up over the
+process pool, one maze at a time, while the stored bodies stay under a
+memory cap.
+
+Configured with environment variables:
+
+- ``MAZE_POOL_PRESETS``: comma-separated ``ROWSxCOLS:algorithm:maze_type``
+  entries; the algorithm and maze type may be ``*`` for all of them. The
+  default, ``30x30:*:*``, matches the frontend.
+- ``MAZE_POOL_SIZE``: ready mazes kept per preset (2 by default, 0 disables
+  the pools)
+- ``MAZE_POOL_MAX_BYTES``: cap on the bodies kept in all pools (64 MiB)
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from app.algorithms.maze_generator import GENERATORS
+from app.algorithms.maze_generator.batch import generate_response
+from app.models.maze import IMPERFECT, MazeType
+from app.utils import cost
+from app.utils.pool import get_process_pool
+
+# Seconds to wait before refilling again after a generation failed
+RETRY_DELAY = 1.0
+
+# (rows, cols, algorithm, maze_type)
+PoolKey = Tuple[int, int, str, str]
+
+
+class _Preset:
+    """Ready bodies and counters of one configuration."""
+
+    __slots__ = ("ready", "taken", "hits", "misses", "body_size")
+
+    def __init__(self):
+        self.ready: Deque[bytes] = deque()
+        # Size of the last body generated, the room its next one needs
+        self.body_size = 0
+        # When each not yet replaced maze was taken, for the refill lag
+        self.taken: Deque[float] = deque()
+        self.hits = 0
+        self.misses = 0
+
+
+class MazePool:
+    """
+    Ready maze responses per preset, refilled by ``run``.
+
+    All methods are called from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, presets: List[PoolKey], size: int, max_bytes: int):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._presets: Dict[PoolKey, _Preset] = {key: _Preset() for key in presets}
+        self._wake = asyncio.Event()
+
+        # Requests that could have used a pool if their configuration had one
+        self.unpooled = 0
+        # Mazes generated, and dropped because the cap was reached
+        self.refills = 0
+        self.dropped = 0
+        # Seconds from taking a maze until its replacement was ready
+        self.lag_count = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+
+    @classmethod
+    def from_env(cls) -> "MazePool":
+        size = int(os.environ.get("MAZE_POOL_SIZE", 2))
+        max_bytes = int(os.environ.get("MAZE_POOL_MAX_BYTES", 64 * 1024 * 1024))
+        presets = parse_presets(os.environ.get("MAZE_POOL_PRESETS", "30x30:*:*"))
+        return cls(presets if size > 0 else [], size, max_bytes)
+
+    def take(self, key: PoolKey) -> Optional[bytes]:
+        """Return a ready body for ``key`` and schedule its replacement."""
+        preset = self._presets.get(key)
+        if preset is None:
+            self.unpooled += 1
+            return None
+        if not preset.ready:
+            preset.misses += 1
+            return None
+
+        preset.hits += 1
+        body = preset.ready.popleft()
+        self.bytes -= len(body)
+        preset.taken.append(time.monotonic())
+        self._wake.set()
+        return body
+
+    def _next_key(self) -> Optional[PoolKey]:
+        """
+        The emptiest preset below its target whose next body has room.
+
+        Room is judged by the preset's last body, so once a body was dropped
+        at the cap its preset waits for a maze to be taken instead of being
+        generated, and dropped, over and over.
+        """
+        key, preset = min(
+            (
+                (key, preset)
+                for key, preset in self._presets.items()
+                if len(preset.ready) < self.size
+                and self.bytes + preset.body_size <= self.max_bytes
+            ),
+            key=lambda item: len(item[1].ready),
+            default=(None, None),
+        )
+        return key
+
+    def _add(self, key: PoolKey, body: bytes) -> None:
+        preset = self._presets[key]
+        preset.body_size = len(body)
+        self.refills += 1
+        if self.bytes + len(body) > self.max_bytes:
+            self.dropped += 1
+            return
+
+        preset.ready.append(body)
+        self.bytes += len(body)
+        if preset.taken:
+            lag = time.monotonic() - preset.taken.popleft()
+            self.lag_count += 1
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            self.lag_last = lag
+
+    async def run(self) -> None:
+        """Keep the pools full; runs until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            key = self._next_key()
+            if key is None:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            rows, cols, algorithm, maze_type = key
+            try:
+                body = await loop.run_in_executor(
+                    get_process_pool(),
+                    generate_response,
+                    algorithm,
+                    rows,
+                    cols,
+                    maze_type,
+                    random.getrandbits(63),
+                )
+            except Exception:
+                # Requests are still served without the pool; retry later
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            self._add(key, body)
+
+    def stats(self) -> dict:
+        """Counters for ``GET /api/maze/pool``, see ``MazePoolStats``."""
+        hits = sum(preset.hits for preset in self._presets.values())
+        misses = sum(preset.misses for preset in self._presets.values())
+        requests = hits + misses + self.unpooled
+        return {
+            "ready": sum(len(preset.ready) for preset in self._presets.values()),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "unpooled": self.unpooled,
+            "hit_rate": hits / requests if requests else 0.0,
+            "refills": self.refills,
+            "dropped": self.dropped,
+            "refill_lag_ms": {
+                "last": self.lag_last * 1000,
+                "mean": (
+                    self.lag_total / self.lag_count * 1000 if self.lag_count else 0.0
+                ),
+                "max": self.lag_max * 1000,
+            },
+            "presets": [
+                {
+                    "rows": rows,
+                    "cols": cols,
+                    "algorithm": algorithm,
+                    "maze_type": maze_type,
+                    "ready": len(preset.ready),
+                    "hits": preset.hits,
+                    "misses": preset.misses,
+                }
+                for (rows, cols, algorithm, maze_type), preset in self._presets.items()
+            ],
+        }
+
+
+def parse_presets(spec: str) -> List[PoolKey]:
+    """
+    Parse ``MAZE_POOL_PRESETS``, expanding ``*`` wildcards.
+
+    Presets whose snapshots are over the cost budget are left out, since
+    requests for them are downgraded and could not be served from a pool,
+    and so are combinations requests reject (perfect cellular automata).
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown algorithm
+    """
+    presets: List[PoolKey] = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            size, algorithm, maze_type = entry.split(":")
+            rows, cols = map(int, size.lower().split("x"))
+        except ValueError:
+            raise ValueError(f"Invalid maze pool preset: {entry!r}")
+
+        algorithms = sorted(GENERATORS) if algorithm == "*" else [algorithm]
+        maze_types = [t.value for t in MazeType] if maze_type == "*" else [maze_type]
+        for algorithm in algorithms:
+            if algorithm not in GENERATORS:
+                raise ValueError(f"Unknown algorithm in maze pool preset: {entry!r}")
+            for maze_type in maze_types:
+                if maze_type not in cost.MAZE_TYPE_SECONDS:
+                    raise ValueError(
+                        f"Unknown maze type in maze pool preset: {entry!r}"
+                    )
+                if maze_type == "perfect" and algorithm in IMPERFECT:
+                    continue
+                key = (rows, cols, algorithm, maze_type)
+                estimate = cost.estimate_generation(rows, cols, algorithm, maze_type)
+                if estimate.fits() and key not in presets:
+                    presets.append(key)
+    return presets
+
+
+_maze_pool: Optional[MazePool] = None
+
+
+def get_maze_pool() -> MazePool:
+    """Return the process-wide maze pool, configured from the environment."""
+    global _maze_pool
+    if _maze_pool is None:
+        _maze_pool = MazePool.from_env()
+    return _maze_pool
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from app.utils.maze_file import MazeFile
+
+# Directory holding stored mazes, shared by all workers on the host
+STORE_DIR = os.environ.get(
+    "MAZE_STORE_DIR", os.path.join(tempfile.gettempdir(), "lp-visualizer-mazes")
+)
+
+_SUFFIX = ".lpmz"
+
+
+def _path(maze_id: str) -> str:
+    # Ids are generated by new_maze_id, anything else cannot name a file
+    if not maze_id.isalnum():
+        raise KeyError(maze_id)
+    return os.path.join(STORE_DIR, maze_id + _SUFFIX)
+
+
+def new_maze_id() -> str:
+    """Generate a unique ID for a stored maze."""
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def create_maze(maze_id: str, rows: int, cols: int, **header) -> Iterator[MazeFile]:
+    """
+    Create an all-wall maze file for ``maze_id`` and yield it for writing.
+
+    The file is written under a temporary name and only moved to its final
+    one when the block completes, so a maze that is still being generated
+    is never listed or opened; on an error it is removed instead.
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = _path(maze_id)
+    partial = path + ".part"
+    maze_file = MazeFile.create(partial, rows, cols, **header)
+    try:
+        with maze_file:
+            yield maze_file
+    except BaseException:
+        os.remove(partial)
+        raise
+    os.replace(partial, path)
+
+
+def open_maze(maze_id: str, writable: bool = False) -> MazeFile:
+    """
+    Open a stored maze.
+
+    Raises:
+        KeyError: If no maze is stored under ``maze_id``
+    """
+    path = _path(maze_id)
+    if not os.path.exists(path):
+        raise KeyError(maze_id)
+    return MazeFile(path, writable=writable)
+
+
+def delete_maze(maze_id: str) -> None:
+    """Delete a stored maze (a no-op if it does not exist)."""
+    try:
+        os.remove(_path(maze_id))
+    except FileNotFoundError:
+        pass
+
+
+def list_mazes() -> List[str]:
+    """Return the IDs of all stored mazes."""
+    if not os.path.isdir(STORE_DIR):
+        return []
+    return sorted(
+        name[: -len(_SUFFIX)]
+        for name in os.listdir(STORE_DIR)
+        if name.endswith(_SUFFIX)
+    )
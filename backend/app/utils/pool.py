@@ -0,0 +1,27 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def worker_count() -> int:
+    """Number of worker processes (``WORKER_PROCESSES`` or the CPU count)."""
+    return int(os.environ.get("WORKER_PROCESSES", 0)) or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by all CPU-bound endpoints.
+
+    The pool is created on first use with the "spawn" start method, so
+    worker processes never inherit the server's threads or event loop.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
@@ -0,0 +1,82 @@
+import numpy as np
+
+from app.utils.maze_file import MazeFile
+
+# Input cells reduced per chunk while downsampling, bounds temporary memory
+_CHUNK_CELLS = 1 << 22
+
+
+def read_viewport(
+    maze: MazeFile, row: int, col: int, height: int, width: int, scale: int
+) -> np.ndarray:
+    """
+    Read a window of a stored maze, downsampled by ``scale``.
+
+    Each output cell covers a ``scale`` x ``scale`` block of maze cells and is
+    a wall when at least half of the block is walls. The window is processed
+    in horizontal bands so memory stays bounded however large it is.
+
+    Args:
+        maze: Stored maze to read from
+        row: Top row of the window
+        col: Left column of the window
+        height: Window height in maze cells (already clipped to the maze)
+        width: Window width in maze cells (already clipped to the maze)
+        scale: Downsampling factor
+
+    Returns:
+        ``uint8`` array of shape (ceil(height / scale), ceil(width / scale))
+    """
+    if scale == 1:
+        return maze.read_region(row, col, height, width)
+
+    out_height = -(-height // scale)
+    out_width = -(-width // scale)
+    result = np.empty((out_height, out_width), dtype=np.uint8)
+    band = max(1, _CHUNK_CELLS // (width * scale))  # Output rows per band
+
+    for out_row in range(0, out_height, band):
+        top = row + out_row * scale
+        rows = min(band * scale, row + height - top)
+        block_rows = -(-rows // scale)
+
+        # Pad partial blocks; counts keep the majority vote fair at the edges
+        walls = np.zeros((block_rows * scale, out_width * scale), dtype=np.uint8)
+        valid = np.zeros_like(walls)
+        walls[:rows, :width] = maze.read_region(top, col, rows, width)
+        valid[:rows, :width] = 1
+
+        shape = (block_rows, scale, out_width, scale)
+        wall_count = walls.reshape(shape).sum(axis=(1, 3), dtype=np.uint32)
+        cell_count = valid.reshape(shape).sum(axis=(1, 3), dtype=np.uint32)
+        result[out_row : out_row + block_rows] = wall_count * 2 >= cell_count
+
+    return result
+
+
+def clip_overlay(
+    cells: np.ndarray, row: int, col: int, height: int, width: int, scale: int
+) -> np.ndarray:
+    """
+    Keep the overlay cells inside a window and map them to viewport coordinates.
+
+    Args:
+        cells: (n, 2) array of (row, col) maze cells, in animation order
+        row, col, height, width: The window in maze cells
+        scale: Downsampling factor of the viewport
+
+    Returns:
+        (m, 2) array of distinct viewport cells, in first-seen order
+    """
+    inside = (
+        (cells[:, 0] >= row)
+        & (cells[:, 0] < row + height)
+        & (cells[:, 1] >= col)
+        & (cells[:, 1] < col + width)
+    )
+    clipped = (cells[inside] - (row, col)) // scale
+    if scale == 1 or len(clipped) == 0:
+        return clipped
+
+    _, first = np.unique(clipped, axis=0, return_index=True)
+    return clipped[np.sort(first)]
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from app import dataset
+
+MANIFEST = {
+    "count": 10,
+    "rows": 11,
+    "cols": 11,
+    "algorithms": ["backtracking", "sidewinder"],
+    "maze_type": "perfect",
+    "solver": "bfs",
+    "seed": 3,
+    "shard_size": 4,
+}
+
+
+def read_shard(out_dir, shard):
+    with np.load(dataset.shard_path(out_dir, shard)) as data:
+        return {name: data[name] for name in data.files}
+
+
+def test_export_writes_every_maze_with_its_solution(tmp_path):
+    out_dir = str(tmp_path)
+    dataset.export(dataset.load_manifest(out_dir, MANIFEST), out_dir, workers=1)
+
+    shards = [read_shard(out_dir, shard) for shard in range(3)]
+    assert [len(shard["grids"]) for shard in shards] == [4, 4, 2]
+    for shard in shards:
+        offsets = shard["path_offsets"]
+        assert len(offsets) == len(shard["grids"]) + 1
+        for grid, first, last in zip(shard["grids"], offsets, offsets[1:]):
+            path = shard["path_cells"][first:last]
+            assert grid[tuple(path.T)].max() == 0
+            assert tuple(path[0]) == (0, 1)
+            assert tuple(path[-1]) == (grid.shape[0] - 1, grid.shape[1] - 2)
+
+
+def test_resume_only_exports_missing_shards(tmp_path):
+    out_dir = str(tmp_path)
+    dataset.export(dataset.load_manifest(out_dir, MANIFEST), out_dir, workers=1)
+    expected = read_shard(out_dir, 1)
+    kept = os.stat(dataset.shard_path(out_dir, 0)).st_mtime_ns
+
+    os.remove(dataset.shard_path(out_dir, 1))
+    dataset.export(dataset.load_manifest(out_dir, MANIFEST), out_dir, workers=1)
+
+    assert os.stat(dataset.shard_path(out_dir, 0)).st_mtime_ns == kept
+    resumed = read_shard(out_dir, 1)
+    for name, values in expected.items():
+        assert (resumed[name] == values).all(), name
+
+
+def test_manifest_holds_no_paths(tmp_path):
+    first = str(tmp_path / "first")
+    dataset.load_manifest(first, MANIFEST)
+    with open(os.path.join(first, dataset.MANIFEST)) as f:
+        assert json.load(f) == MANIFEST
+
+    # A moved export is still recognized as the same one
+    moved = str(tmp_path / "moved")
+    shutil.move(first, moved)
+    assert dataset.load_manifest(moved, MANIFEST) == MANIFEST
+
+
+def test_manifest_with_a_recorded_directory_is_accepted(tmp_path):
+    with open(tmp_path / dataset.MANIFEST, "w") as f:
+        json.dump({**MANIFEST, "out_dir": "/elsewhere"}, f)
+
+    assert dataset.load_manifest(str(tmp_path), MANIFEST) == MANIFEST
+
+
+def test_manifest_with_other_parameters_is_refused(tmp_path):
+    dataset.load_manifest(str(tmp_path), MANIFEST)
+    with pytest.raises(ValueError):
+        dataset.load_manifest(str(tmp_path), {**MANIFEST, "seed": 4})
+
+
+def test_perfect_cellular_automata_are_refused(tmp_path):
+    with pytest.raises(SystemExit):
+        dataset.main([str(tmp_path), "--count", "1", "--algorithm", "ca_maze"])
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from app.algorithms.maze_generator import GENERATORS
+from app.utils.frames import MIN_KEYFRAME_INTERVAL, FrameBudgetRecorder
+
+
+def replay(frames):
+    """Decode frames the way the client does, checking every keyframe."""
+    state = [row[:] for row in frames[0]["keyframe"]]
+    for frame in frames[1:]:
+        for r, c, value in frame["changes"]:
+            state[r][c] = value
+        if frame["keyframe"] is not None:
+            assert frame["keyframe"] == state
+    return state
+
+
+@pytest.mark.parametrize("algorithm", ["backtracking", "kruskal", "ca_maze"])
+@pytest.mark.parametrize("max_frames", [2, 10, 300])
+def test_frames_replay_to_the_final_maze(algorithm, max_frames):
+    recorder = FrameBudgetRecorder(max_frames)
+    maze, frames = GENERATORS[algorithm](21, 21, recorder, random.Random(1))
+
+    assert len(frames) <= max_frames + 1
+    assert replay(frames) == maze
+
+
+def test_small_budgets_keep_keyframes_apart():
+    recorder = FrameBudgetRecorder(10)
+    _, frames = GENERATORS["kruskal"](41, 41, recorder, random.Random(1))
+
+    keyframes = [i for i, frame in enumerate(frames) if frame["keyframe"]]
+    assert recorder.keyframe_interval == MIN_KEYFRAME_INTERVAL
+    assert keyframes[0] == 0
+    assert all(i % MIN_KEYFRAME_INTERVAL == 0 for i in keyframes)
+
+
+def test_explicit_keyframe_interval_is_kept():
+    recorder = FrameBudgetRecorder(10, keyframe_interval=1)
+    _, frames = GENERATORS["kruskal"](41, 41, recorder, random.Random(1))
+
+    assert all(frame["keyframe"] is not None for frame in frames)
+
+
+def test_max_frames_must_allow_a_delta():
+    with pytest.raises(ValueError):
+        FrameBudgetRecorder(1)
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.algorithms.linkedlist_manager.linkedlist import LinkedListManager
+from app.models.linkedlist import LinkedListOperation
+
+operations = TypeAdapter(list[LinkedListOperation])
+
+
+def make_manager(*lists):
+    manager = LinkedListManager()
+    manager.lists, manager.nodes, manager.values = {}, {}, {}
+    for list_id, values in enumerate(lists, start=1):
+        manager.create_list("doubly", f"list{list_id}")
+        for value in values:
+            manager.add_node("doubly", value, f"list{list_id}")
+    return manager
+
+
+def values_of(manager, list_id):
+    return [node.value for node in manager.lists[list_id]]
+
+
+def check_index(manager):
+    """The value index must list every node of a value in list order."""
+    for list_id, nodes in manager.lists.items():
+        expected = {}
+        for node in nodes:
+            expected.setdefault(node.value, []).append(node.id)
+        actual = {
+            value: list(same_value)
+            for value, same_value in manager.values.get(list_id, {}).items()
+        }
+        assert actual == expected, list_id
+    assert set(manager.nodes) == {
+        node.id for nodes in manager.lists.values() for node in nodes
+    }
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_connect_splices_value_indexes(seed):
+    rng = random.Random(seed)
+    first = [rng.randrange(6) for _ in range(rng.randrange(12))]
+    second = [rng.randrange(6) for _ in range(rng.randrange(12))]
+    manager = make_manager(first, second)
+
+    manager.connect_lists("doubly", sorted=False)
+
+    check_index(manager)
+    if first and second:
+        assert values_of(manager, "list1") == first + second
+        assert values_of(manager, "list2") == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sorted_connect_merges_and_reindexes(seed):
+    rng = random.Random(seed)
+    first = [rng.randrange(6) for _ in range(1 + rng.randrange(12))]
+    second = [rng.randrange(6) for _ in range(1 + rng.randrange(12))]
+    manager = make_manager(first, second)
+
+    manager.connect_lists("doubly", sorted=True)
+
+    assert values_of(manager, "list1") == sorted(first + second)
+    check_index(manager)
+
+
+def test_sort_and_reverse_reindex_values():
+    manager = make_manager([3, 1, 3, 2, 1])
+
+    manager.sort_list("doubly", "list1")
+    assert values_of(manager, "list1") == [1, 1, 2, 3, 3]
+    check_index(manager)
+
+    manager.reverse_list("doubly", "list1")
+    assert values_of(manager, "list1") == [3, 3, 2, 1, 1]
+    check_index(manager)
+
+
+def test_remove_by_value_takes_the_first_after_splice():
+    manager = make_manager([1, 2], [2, 1])
+    first_two = manager.lists["list1"].head.next.id
+
+    manager.connect_lists("doubly", sorted=False)
+    manager.remove_node_by_value("doubly", 2, "list1")
+
+    assert first_two not in manager.nodes
+    assert values_of(manager, "list1") == [1, 2, 1]
+    check_index(manager)
+
+
+def test_failed_batch_restores_the_lists():
+    manager = make_manager([1, 2, 3], [4, 5])
+    before = manager.to_dict()
+
+    batch = operations.validate_python(
+        [
+            {"op": "add-node", "value": 9, "listId": "list1"},
+            {"op": "connect", "targetId": "list1", "sourceId": "list2"},
+            {"op": "reverse", "listId": "missing"},
+        ]
+    )
+    with pytest.raises(KeyError):
+        manager.apply_batch("doubly", batch)
+
+    assert manager.to_dict() == before
+    check_index(manager)
+
+
+def test_batch_applies_every_operation():
+    manager = make_manager([3, 1], [2])
+
+    batch = operations.validate_python(
+        [
+            {"op": "connect", "targetId": "list1", "sourceId": "list2"},
+            {"op": "sort", "listId": "list1"},
+            {"op": "remove-node", "listId": "list1"},
+        ]
+    )
+    response = manager.apply_batch("doubly", batch, diffs=True)
+
+    assert values_of(manager, "list1") == [1, 2]
+    assert len(response.steps) == 3
+    check_index(manager)
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.utils import maze_store
+from app.utils.maze_file import BITS, HEADER_SIZE, UINT8, MazeFile
+
+
+@pytest.fixture
+def grid():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 2, size=(13, 21), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_round_trip(tmp_path, grid, packed):
+    path = str(tmp_path / "maze.lpmz")
+    with MazeFile.create(
+        path, *grid.shape, algorithm="prim", maze_type="braid", seed=7, packed=packed
+    ) as maze:
+        maze.write_rows(0, grid)
+
+    with MazeFile(path) as maze:
+        assert maze.encoding == (BITS if packed else UINT8)
+        assert (maze.rows, maze.cols) == grid.shape
+        assert (maze.algorithm, maze.maze_type, maze.seed) == ("prim", "braid", 7)
+        assert maze.size_bytes == os.path.getsize(path)
+        assert maze.to_list() == grid.tolist()
+        assert maze[4][3:17] == grid[4, 3:17].tolist()
+        assert (maze.read_region(2, 5, 6, 11) == grid[2:8, 5:16]).all()
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_cell_and_row_writes(tmp_path, grid, packed):
+    path = str(tmp_path / "maze.lpmz")
+    with MazeFile.create(path, *grid.shape, packed=packed) as maze:
+        assert maze.seed is None
+        for row in range(grid.shape[0]):
+            maze[row][:] = grid[row].tolist()
+        maze[3][9] = 1 - grid[3, 9]
+        maze.write_row(5, [0, 1, 1], start=6)
+
+    grid[3, 9] = 1 - grid[3, 9]
+    grid[5, 6:9] = [0, 1, 1]
+    with MazeFile(path) as maze:
+        assert maze.to_list() == grid.tolist()
+
+
+def test_bits_are_packed_per_row(tmp_path):
+    path = str(tmp_path / "maze.lpmz")
+    with MazeFile.create(path, 3, 10, fill=0) as maze:
+        maze[1][9] = 1
+        assert maze.row_bytes == 2
+
+    with open(path, "rb") as f:
+        data = f.read()
+    assert len(data) == HEADER_SIZE + 3 * 2
+    assert data[HEADER_SIZE + 3] == 0b10
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "maze.lpmz"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        MazeFile(str(path))
+
+
+def test_stored_mazes_appear_only_when_complete(tmp_path, monkeypatch, grid):
+    monkeypatch.setattr(maze_store, "STORE_DIR", str(tmp_path))
+
+    with maze_store.create_maze("done", *grid.shape) as maze:
+        maze.write_rows(0, grid)
+        assert maze_store.list_mazes() == []
+    with pytest.raises(RuntimeError):
+        with maze_store.create_maze("failed", *grid.shape):
+            raise RuntimeError()
+
+    assert maze_store.list_mazes() == ["done"]
+    assert os.listdir(tmp_path) == ["done.lpmz"]
+    with maze_store.open_maze("done") as maze:
+        assert maze.to_list() == grid.tolist()
+    with pytest.raises(KeyError):
+        maze_store.open_maze("../done")
@@ -0,0 +1,57 @@
+import pytest
+
+from app.utils.maze_pool import MazePool, parse_presets
+
+SMALL = (10, 10, "backtracking", "perfect")
+LARGE = (20, 20, "backtracking", "perfect")
+
+
+def test_presets_fill_while_there_is_room():
+    pool = MazePool([SMALL, LARGE], size=2, max_bytes=100)
+
+    pool._add(SMALL, b"s" * 10)
+    assert pool._next_key() == LARGE
+    pool._add(LARGE, b"l" * 60)
+    assert pool._next_key() == SMALL
+    pool._add(SMALL, b"s" * 10)
+
+    assert pool.bytes == 80
+    assert pool._next_key() is None  # The large preset's next body has no room
+
+
+def test_dropped_presets_wait_for_a_take():
+    pool = MazePool([LARGE], size=2, max_bytes=100)
+    pool._add(LARGE, b"l" * 60)
+    pool._add(LARGE, b"l" * 60)
+
+    assert pool.dropped == 1
+    assert pool._next_key() is None
+
+    assert pool.take(LARGE) == b"l" * 60
+    assert pool.bytes == 0
+    assert pool._next_key() == LARGE
+
+
+def test_take_counts_hits_and_misses():
+    pool = MazePool([SMALL], size=1, max_bytes=100)
+
+    assert pool.take(SMALL) is None
+    assert pool.take(LARGE) is None
+    pool._add(SMALL, b"s")
+    assert pool.take(SMALL) == b"s"
+
+    preset = pool._presets[SMALL]
+    assert (preset.hits, preset.misses, pool.unpooled) == (1, 1, 1)
+
+
+def test_wildcards_skip_perfect_cellular_automata():
+    presets = parse_presets("30x30:*:*")
+
+    assert (30, 30, "ca_maze", "loop") in presets
+    assert (30, 30, "ca_maze", "perfect") not in presets
+    assert (30, 30, "backtracking", "perfect") in presets
+
+
+def test_malformed_presets_are_refused():
+    with pytest.raises(ValueError):
+        parse_presets("30x30:nope:perfect")
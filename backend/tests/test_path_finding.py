@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from app.algorithms.maze_generator import GENERATORS
+from app.algorithms.path_finding import astar, bfs
+from app.algorithms.path_finding.lpastar import LPAStar
+from app.algorithms.path_finding.stats import SearchStats
+from app.models.maze import Cell
+from app.utils.frames import NullRecorder
+from app.utils.helpers import add_loops
+
+
+def make_maze(size, seed):
+    rng = random.Random(seed)
+    maze, _ = GENERATORS["backtracking"](size, size, NullRecorder(), rng)
+    return add_loops(maze, rng)
+
+
+def corners(maze):
+    return Cell(row=1, col=1), Cell(row=len(maze) - 2, col=len(maze[0]) - 2)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_astar_counts_the_goal_as_expanded(seed):
+    maze = make_maze(21, seed)
+    start, end = corners(maze)
+    stats = SearchStats()
+
+    visited, path = astar.find_path(maze, start, end, stats)
+
+    assert visited[-1] == end
+    assert stats.expanded == len(visited)
+    assert len(path) == len(bfs.find_path(maze, start, end)[1])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_lpastar_replans_like_a_fresh_search(seed):
+    maze = make_maze(21, seed)
+    start, end = corners(maze)
+    planner = LPAStar(maze, start, end)
+    planner.find_path()
+
+    rng = random.Random(seed)
+    for _ in range(15):
+        cells = [
+            (rng.randrange(1, len(maze) - 1), rng.randrange(1, len(maze[0]) - 1))
+            for _ in range(rng.randrange(1, 4))
+        ]
+        for row, col in cells:
+            if (row, col) in ((start.row, start.col), (end.row, end.col)):
+                continue
+            maze[row][col] ^= 1
+            planner.toggle(row, col)
+
+        _, path = planner.find_path()
+        _, expected = bfs.find_path(maze, start, end)
+        assert len(path) == len(expected)
+        if path:
+            assert path[0] == start and path[-1] == end
+            assert all(maze[cell.row][cell.col] == 0 for cell in path)
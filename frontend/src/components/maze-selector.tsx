@@ -18,6 +18,9 @@ interface MazeSelectorProps {
   disabled: boolean
 }
 
+// Cellular automata never make perfect mazes, the backend rejects them
+const IMPERFECT = [MazeAlgorithm.CA_MAZE, MazeAlgorithm.CA_MAZECTRIC]
+
 const MazeSelector: React.FC<MazeSelectorProps> = ({
   mazeAlgorithm,
   setMazeAlgorithm,
@@ -26,13 +29,22 @@ const MazeSelector: React.FC<MazeSelectorProps> = ({
   onGenerateMaze,
   disabled,
 }) => {
+  const imperfect = IMPERFECT.includes(mazeAlgorithm)
+
+  const selectAlgorithm = (algorithm: MazeAlgorithm) => {
+    setMazeAlgorithm(algorithm)
+    if (IMPERFECT.includes(algorithm) && mazeType === MazeType.PERFECT) {
+      setMazeType(MazeType.LOOP)
+    }
+  }
+
   return (
     <div className="flex items-end space-x-4 flex-wrap gap-4">
       <div>
         <label className="block mb-2 text-white text-sm">Maze Algorithm:</label>
         <Select
           value={mazeAlgorithm}
-          onValueChange={(value) => setMazeAlgorithm(value as MazeAlgorithm)}
+          onValueChange={(value) => selectAlgorithm(value as MazeAlgorithm)}
           disabled={disabled}
         >
           <SelectTrigger className="w-[200px] bg-gray-800 text-white border-gray-700">
@@ -52,6 +64,16 @@ const MazeSelector: React.FC<MazeSelectorProps> = ({
             <SelectItem value={MazeAlgorithm.WILSON}>
               Wilson's Algorithm
             </SelectItem>
+            <SelectItem value={MazeAlgorithm.BINARY_TREE}>
+              Binary Tree
+            </SelectItem>
+            <SelectItem value={MazeAlgorithm.SIDEWINDER}>Sidewinder</SelectItem>
+            <SelectItem value={MazeAlgorithm.CA_MAZE}>
+              Cellular Automaton (Maze)
+            </SelectItem>
+            <SelectItem value={MazeAlgorithm.CA_MAZECTRIC}>
+              Cellular Automaton (Mazectric)
+            </SelectItem>
           </SelectContent>
         </Select>
       </div>
@@ -67,7 +89,9 @@ const MazeSelector: React.FC<MazeSelectorProps> = ({
             <SelectValue placeholder="Select type" />
           </SelectTrigger>
           <SelectContent className="bg-gray-800 text-white border-gray-700">
-            <SelectItem value={MazeType.PERFECT}>Perfect</SelectItem>
+            <SelectItem value={MazeType.PERFECT} disabled={imperfect}>
+              Perfect
+            </SelectItem>
             <SelectItem value={MazeType.LOOP}>Loop</SelectItem>
             <SelectItem value={MazeType.BRAID}>Braid</SelectItem>
           </SelectContent>
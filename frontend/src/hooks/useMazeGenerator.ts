@@ -30,11 +30,14 @@ export const useMazeGeneration = (
         maze_type: mazeType,
       })
 
-      // Animate maze generation
-      await animateMazeGeneration(response.steps, setMaze, speed)
+      // Animate maze generation; large mazes may come back without steps
+      if (response.steps.length > 0) {
+        await animateMazeGeneration(response.steps, setMaze, speed)
+      }
 
       // Get the final maze state
-      const finalMaze = response.steps[response.steps.length - 1]
+      const finalMaze = response.maze
+      setMaze(finalMaze)
 
       // Ensure start and end positions are valid
       ensureValidPositions(finalMaze)
@@ -1,5 +1,13 @@
 import { MazeGenerationRequest, MazeResponse } from './maze'
-import { PathFindingRequest, PathResponse } from './pathfinding'
+import {
+  EditSessionRequest,
+  EditSessionResponse,
+  PathComparisonRequest,
+  PathComparisonResponse,
+  PathFindingRequest,
+  PathResponse,
+  ToggleCellsRequest,
+} from './pathfinding'
 import {
   LinkedListVisualizationData,
   LinkedListOperationRequest,
@@ -9,12 +17,21 @@ import {
   ConnectListsRequest,
   SortListRequest,
   RemoveNodeByValueRequest,
+  RemoveNodeByIdRequest,
+  LinkedListBatchRequest,
+  LinkedListBatchResponse,
+  LinkedListInfo,
+  ListRequest,
+  BulkLoadRequest,
+  LinkedListPage,
 } from './linkedlist'
 
 // API endpoints
 export const API_ENDPOINTS = {
   GENERATE_MAZE: '/api/maze/generate',
   FIND_PATH: '/api/path/find',
+  COMPARE_PATHS: '/api/path/compare',
+  EDIT_SESSIONS: '/api/path/sessions',
   RESET_LINKEDLIST: '/api/linkedlist/reset',
   ADD_NODE: '/api/linkedlist/add-node',
   REMOVE_NODE: '/api/linkedlist/remove-node',
@@ -22,6 +39,13 @@ export const API_ENDPOINTS = {
   CONNECT_LISTS: '/api/linkedlist/connect',
   SORT_LIST: '/api/linkedlist/sort',
   REMOVE_NODE_BY_VALUE: '/api/linkedlist/remove-node-by-value',
+  REMOVE_NODE_BY_ID: '/api/linkedlist/remove-node-by-id',
+  LINKEDLIST_BATCH: '/api/linkedlist/batch',
+  GET_LISTS: '/api/linkedlist/lists',
+  CREATE_LIST: '/api/linkedlist/create-list',
+  DELETE_LIST: '/api/linkedlist/delete-list',
+  BULK_LOAD: '/api/linkedlist/bulk-load',
+  BULK_PAGE: '/api/linkedlist/bulk',
 }
 
 // Request/Response types for LinkedList
@@ -34,7 +58,21 @@ export type ParseLinkedListCodeResponse = LinkedListVisualizationData
 
 export interface ApiClient {
   generateMaze: (request: MazeGenerationRequest) => Promise<MazeResponse>
+  getSeededMaze: (
+    request: MazeGenerationRequest & { seed: number },
+  ) => Promise<MazeResponse>
   findPath: (request: PathFindingRequest) => Promise<PathResponse>
+  comparePaths: (
+    request: PathComparisonRequest,
+  ) => Promise<PathComparisonResponse>
+  createEditSession: (
+    request: EditSessionRequest,
+  ) => Promise<EditSessionResponse>
+  toggleCells: (
+    sessionId: string,
+    request: ToggleCellsRequest,
+  ) => Promise<EditSessionResponse>
+  deleteEditSession: (sessionId: string) => Promise<void>
 
   // New linked list operations
   resetLinkedList: (
@@ -58,4 +96,19 @@ export interface ApiClient {
   removeNodeByValue: (
     request: RemoveNodeByValueRequest,
   ) => Promise<LinkedListVisualizationData>
+  removeNodeById: (
+    request: RemoveNodeByIdRequest,
+  ) => Promise<LinkedListVisualizationData>
+  applyBatch: (
+    request: LinkedListBatchRequest,
+  ) => Promise<LinkedListBatchResponse>
+  getLists: () => Promise<LinkedListInfo[]>
+  createList: (request: ListRequest) => Promise<LinkedListVisualizationData>
+  deleteList: (request: ListRequest) => Promise<LinkedListVisualizationData>
+  bulkLoad: (request: BulkLoadRequest) => Promise<LinkedListInfo>
+  getBulkPage: (
+    listId: string,
+    offset: number,
+    limit: number,
+  ) => Promise<LinkedListPage>
 }
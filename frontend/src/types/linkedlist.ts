@@ -8,39 +8,104 @@ export interface LinkedListNode {
 
 export interface LinkedListVisualizationData {
   listType: 'singly' | 'doubly'
-  lists: {
-    list1: LinkedListNode[]
-    list2: LinkedListNode[]
-  }
+  // Named lists; every session starts with list1 and list2
+  lists: Record<string, LinkedListNode[]>
+  version?: number
+}
+
+// Changes made by one operation, returned when a diff was requested
+export interface LinkedListDelta {
+  listType: 'singly' | 'doubly'
+  version: number
+  baseVersion: number
+  heads: Record<string, string | null>
+  nodes: LinkedListNode[]
+  removed: string[]
 }
 
 // Operation request types
 export interface LinkedListOperationRequest {
   listType: 'singly' | 'doubly'
+  diff?: boolean
+  baseVersion?: number
 }
 
 export interface AddNodeRequest extends LinkedListOperationRequest {
   value: number
-  listId?: 'list1' | 'list2'
+  listId?: string
 }
 
 export interface RemoveNodeRequest extends LinkedListOperationRequest {
-  listId?: 'list1' | 'list2'
+  listId?: string
 }
 
 export interface ReverseListRequest extends LinkedListOperationRequest {
-  listId?: 'list1' | 'list2'
+  listId?: string
 }
 
 export interface ConnectListsRequest extends LinkedListOperationRequest {
   sorted?: boolean
+  targetId?: string
+  sourceId?: string
+}
+
+export interface ListRequest extends LinkedListOperationRequest {
+  listId: string
+}
+
+export interface LinkedListInfo {
+  id: string
+  size: number
+  bulk?: boolean
+}
+
+export interface BulkLoadRequest {
+  listId: string
+  values: number[]
+  shuffle?: boolean
+  seed?: number
+}
+
+// A window of a bulk-loaded list, in list order
+export interface LinkedListPage {
+  listType: 'singly' | 'doubly'
+  listId: string
+  offset: number
+  size: number
+  nodes: LinkedListNode[]
 }
 
 export interface SortListRequest extends LinkedListOperationRequest {
-  listId: 'list1' | 'list2'
+  listId: string
 }
 
 export interface RemoveNodeByValueRequest extends LinkedListOperationRequest {
   value: number
-  listId?: 'list1' | 'list2'
+  listId?: string
+}
+
+export interface RemoveNodeByIdRequest extends LinkedListOperationRequest {
+  nodeId: string
+  listId?: string
+}
+
+// Batch operations, named like the endpoint that performs them
+export type LinkedListOperation =
+  | { op: 'add-node'; value: number; listId?: string }
+  | { op: 'remove-node'; listId?: string }
+  | { op: 'remove-node-by-value'; value: number; listId?: string }
+  | { op: 'remove-node-by-id'; nodeId: string; listId?: string }
+  | { op: 'reverse'; listId?: string }
+  | { op: 'sort'; listId?: string }
+  | { op: 'connect'; sorted?: boolean; targetId?: string; sourceId?: string }
+
+export interface LinkedListBatchRequest {
+  listType: 'singly' | 'doubly'
+  operations: LinkedListOperation[]
+  diffs?: boolean
+}
+
+export interface LinkedListBatchResponse {
+  state: LinkedListVisualizationData
+  steps?: (LinkedListVisualizationData | LinkedListDelta)[] | null
 }
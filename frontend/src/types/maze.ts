@@ -18,6 +18,10 @@ export enum MazeAlgorithm {
   KRUSKAL = 'kruskal',
   ELLER = 'eller',
   WILSON = 'wilson',
+  BINARY_TREE = 'binary_tree',
+  SIDEWINDER = 'sidewinder',
+  CA_MAZE = 'ca_maze',
+  CA_MAZECTRIC = 'ca_mazectric',
 }
 
 // Maze data structure
@@ -26,10 +30,17 @@ export type Maze = number[][]
 // Animation steps for maze generation
 export type MazeSteps = number[][][]
 
+// Delta frame produced when a frame budget is requested
+export interface MazeFrame {
+  changes: [number, number, number][] // [row, col, value]
+  keyframe: Maze | null
+}
+
 // Response from maze generation API
 export interface MazeResponse {
   maze: Maze
   steps: MazeSteps
+  frames?: MazeFrame[] | null
 }
 
 // Request to generate a maze
@@ -38,4 +49,41 @@ export interface MazeGenerationRequest {
   cols: number
   algorithm: MazeAlgorithm
   maze_type: MazeType
+  seed?: number
+  tile_size?: number
+  max_frames?: number
+  keyframe_interval?: number
+  allow_downgrade?: boolean
+  steps?: 'snapshots' | 'frames' | 'none'
+}
+
+// One maze of a batch generation request
+export interface MazeSpec {
+  rows: number
+  cols: number
+  algorithm: MazeAlgorithm
+  maze_type?: MazeType
+  seed?: number
+}
+
+// Either specs, or count with a template
+export interface BatchGenerationRequest {
+  specs?: MazeSpec[]
+  count?: number
+  template?: MazeSpec
+  stream?: boolean
+}
+
+export interface GeneratedMaze {
+  index: number
+  rows: number
+  cols: number
+  algorithm: string
+  maze_type: string
+  seed: number
+  maze: Maze
+}
+
+export interface BatchGenerationResponse {
+  mazes: GeneratedMaze[]
 }
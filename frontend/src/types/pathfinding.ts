@@ -6,18 +6,78 @@ export enum PathAlgorithm {
   DFS = 'dfs',
   A_STAR = 'astar',
   DIJKSTRA = 'dijkstra',
+  HPA = 'hpa',
 }
 
 // Request to find a path
 export interface PathFindingRequest {
-  maze: Maze
+  maze?: Maze
+  maze_id?: string // Stored maze to search instead of `maze` (never both)
   start: Cell
   end: Cell
   algorithm: PathAlgorithm
+  cluster_size?: number // Cluster side length for HPA
+  stats?: boolean // Return search counters (not collected for HPA)
+  landmarks?: number // Guide A* with ALT bounds from this many landmarks
+}
+
+// Search counters, returned when requested
+export interface SearchStats {
+  expanded: number // Nodes taken off the frontier and processed
+  generated: number // Distinct cells added to the frontier
+  reopened: number // Cells pushed again after their cost improved
+  peak_frontier: number
+  pushes: number
+  pops: number
+  elapsed_ms: number
 }
 
 // Response from pathfinding API
 export interface PathResponse {
   visited: Cell[] // Cells visited during search (for animation)
   path: Cell[] // Final path from start to end
+  stats?: SearchStats | null
+}
+
+// Request to run several algorithms on the same maze
+export interface PathComparisonRequest {
+  maze?: Maze
+  maze_id?: string
+  start: Cell
+  end: Cell
+  algorithms?: PathAlgorithm[] // Defaults to BFS, DFS, A* and Dijkstra
+  cluster_size?: number
+  stats?: boolean
+  landmarks?: number
+}
+
+export interface SolverResult {
+  algorithm: PathAlgorithm
+  visited: Cell[]
+  path: Cell[]
+  visited_count: number
+  path_length: number
+  time_ms: number // Wall time of the search alone
+  stats?: SearchStats | null
+}
+
+export interface PathComparisonResponse {
+  results: SolverResult[] // In the order the algorithms were requested
+}
+
+// Editing session: a server-side copy of the maze that is replanned
+// incrementally after cells are flipped
+export interface EditSessionRequest {
+  maze?: Maze
+  maze_id?: string // Start from a stored maze (it is not modified)
+  start: Cell
+  end: Cell
+}
+
+export interface ToggleCellsRequest {
+  cells: Cell[]
+}
+
+export interface EditSessionResponse extends PathResponse {
+  session_id: string // visited holds only the cells this replanning expanded
 }
@@ -1,7 +1,15 @@
 import axios from 'axios'
 import { ApiClient, API_ENDPOINTS } from '../../types/api'
 import { MazeGenerationRequest, MazeResponse } from '../../types/maze'
-import { PathFindingRequest, PathResponse } from '../../types/pathfinding'
+import {
+  EditSessionRequest,
+  EditSessionResponse,
+  PathComparisonRequest,
+  PathComparisonResponse,
+  PathFindingRequest,
+  PathResponse,
+  ToggleCellsRequest,
+} from '../../types/pathfinding'
 import {
   LinkedListOperationRequest,
   LinkedListVisualizationData,
@@ -11,14 +19,32 @@ import {
   ConnectListsRequest,
   SortListRequest,
   RemoveNodeByValueRequest,
+  RemoveNodeByIdRequest,
+  LinkedListBatchRequest,
+  LinkedListBatchResponse,
+  LinkedListInfo,
+  ListRequest,
+  BulkLoadRequest,
+  LinkedListPage,
 } from '../../types/linkedlist'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL
 
+// Linked-list state is kept per session on the server, one session per tab
+const getSessionId = (): string => {
+  let sessionId = sessionStorage.getItem('sessionId')
+  if (!sessionId) {
+    sessionId = crypto.randomUUID()
+    sessionStorage.setItem('sessionId', sessionId)
+  }
+  return sessionId
+}
+
 const axiosInstance = axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
+    'X-Session-Id': getSessionId(),
   },
 })
 
@@ -40,6 +66,21 @@ export const apiClient: ApiClient = {
     }
   },
 
+  // Generate a seeded maze with GET, so browsers and proxies can cache it
+  getSeededMaze: async (
+    request: MazeGenerationRequest & { seed: number },
+  ): Promise<MazeResponse> => {
+    try {
+      const response = await axiosInstance.get(API_ENDPOINTS.GENERATE_MAZE, {
+        params: request,
+      })
+      return response.data
+    } catch (error) {
+      console.error('Error generating maze:', error)
+      throw error
+    }
+  },
+
   // Find path using the backend API
   findPath: async (request: PathFindingRequest): Promise<PathResponse> => {
     try {
@@ -54,6 +95,63 @@ export const apiClient: ApiClient = {
     }
   },
 
+  // Run several pathfinding algorithms on one maze in a single request
+  comparePaths: async (
+    request: PathComparisonRequest,
+  ): Promise<PathComparisonResponse> => {
+    try {
+      const response = await axiosInstance.post(
+        API_ENDPOINTS.COMPARE_PATHS,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error comparing paths:', error)
+      throw error
+    }
+  },
+
+  // Editing sessions replan incrementally after cells are flipped
+  createEditSession: async (
+    request: EditSessionRequest,
+  ): Promise<EditSessionResponse> => {
+    try {
+      const response = await axiosInstance.post(
+        API_ENDPOINTS.EDIT_SESSIONS,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error creating edit session:', error)
+      throw error
+    }
+  },
+  toggleCells: async (
+    sessionId: string,
+    request: ToggleCellsRequest,
+  ): Promise<EditSessionResponse> => {
+    try {
+      const response = await axiosInstance.post(
+        `${API_ENDPOINTS.EDIT_SESSIONS}/${encodeURIComponent(sessionId)}/toggle`,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error toggling cells:', error)
+      throw error
+    }
+  },
+  deleteEditSession: async (sessionId: string): Promise<void> => {
+    try {
+      await axiosInstance.delete(
+        `${API_ENDPOINTS.EDIT_SESSIONS}/${encodeURIComponent(sessionId)}`,
+      )
+    } catch (error) {
+      console.error('Error deleting edit session:', error)
+      throw error
+    }
+  },
+
   // Reset linked list
   resetLinkedList: async (
     request: LinkedListOperationRequest,
@@ -159,4 +257,94 @@ export const apiClient: ApiClient = {
       throw error
     }
   },
+  removeNodeById: async (
+    request: RemoveNodeByIdRequest,
+  ): Promise<LinkedListVisualizationData> => {
+    try {
+      const response = await axiosInstance.post(
+        API_ENDPOINTS.REMOVE_NODE_BY_ID,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error removing node by id:', error)
+      throw error
+    }
+  },
+  applyBatch: async (
+    request: LinkedListBatchRequest,
+  ): Promise<LinkedListBatchResponse> => {
+    try {
+      const response = await axiosInstance.post(
+        API_ENDPOINTS.LINKEDLIST_BATCH,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error applying linked list batch:', error)
+      throw error
+    }
+  },
+  getLists: async (): Promise<LinkedListInfo[]> => {
+    try {
+      const response = await axiosInstance.get(API_ENDPOINTS.GET_LISTS)
+      return response.data
+    } catch (error) {
+      console.error('Error getting lists:', error)
+      throw error
+    }
+  },
+  createList: async (
+    request: ListRequest,
+  ): Promise<LinkedListVisualizationData> => {
+    try {
+      const response = await axiosInstance.post(
+        API_ENDPOINTS.CREATE_LIST,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error creating list:', error)
+      throw error
+    }
+  },
+  deleteList: async (
+    request: ListRequest,
+  ): Promise<LinkedListVisualizationData> => {
+    try {
+      const response = await axiosInstance.post(
+        API_ENDPOINTS.DELETE_LIST,
+        request,
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error deleting list:', error)
+      throw error
+    }
+  },
+  bulkLoad: async (request: BulkLoadRequest): Promise<LinkedListInfo> => {
+    try {
+      const response = await axiosInstance.post(API_ENDPOINTS.BULK_LOAD, request)
+      return response.data
+    } catch (error) {
+      console.error('Error bulk-loading list:', error)
+      throw error
+    }
+  },
+  getBulkPage: async (
+    listId: string,
+    offset: number,
+    limit: number,
+  ): Promise<LinkedListPage> => {
+    try {
+      const response = await axiosInstance.get(
+        `${API_ENDPOINTS.BULK_PAGE}/${encodeURIComponent(listId)}`,
+        { params: { offset, limit } },
+      )
+      return response.data
+    } catch (error) {
+      console.error('Error getting list page:', error)
+      throw error
+    }
+  },
 }